@@ -5,7 +5,9 @@ This module provides endpoints for training debate agents through interactive se
 It handles conversation management, debate rounds, and logical analysis of arguments.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Form, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from ..models.schemas import (
     AgentTrainingStartRequest,
     AgentTrainingRoundRequest,
@@ -13,12 +15,21 @@ from ..models.schemas import (
     AgentTrainingHistoryResponse,
     Side
 )
+from ..models.records import ConversationRound, LogicChainRecord
+from ..config import settings
 from ..services.stt import stt_service
 from ..services.llm import llm_service
-from ..services.tts import tts_service
+from ..services.tts import follow_partial_audio, partial_audio_path, tts_service
 from ..services.logic_chain import logic_chain_service
+from ..services.pipeline import StageGraph
+from ..services.sequencer import round_sequencer
+from ..storage import conversation_store
+from .conditional import is_not_modified, not_modified, version_headers
+from .pagination import EXCLUDE, LIMIT, SINCE_ROUND, fetch_limit, parse_exclude, project, split_page
 from pathlib import Path
-import os
+import asyncio
+import json
+import time
 from typing import Dict, List, Optional
 import uuid
 from datetime import datetime
@@ -72,9 +83,6 @@ DEBATE_TOPICS = [
     }
 ]
 
-# In-memory storage for active conversations (replace with database in production)
-conversations: Dict[str, dict] = {}
-
 @router.post("/start")
 async def start_conversation(request: AgentTrainingStartRequest) -> Dict:
     """
@@ -100,13 +108,12 @@ async def start_conversation(request: AgentTrainingStartRequest) -> Dict:
             raise HTTPException(status_code=400, detail="Invalid topic ID")
         
         # Initialize conversation data
-        conversations[conversation_id] = {
+        await conversation_store.create_conversation(conversation_id, {
             "topic": request.topic_id,
             "topic_info": topic,
             "user_side": request.user_side,
-            "start_time": datetime.utcnow(),
-            "rounds": []
-        }
+            "start_time": datetime.utcnow()
+        })
         
         return {
             "conversation_id": conversation_id,
@@ -114,6 +121,8 @@ async def start_conversation(request: AgentTrainingStartRequest) -> Dict:
             "user_side": request.user_side
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -136,126 +145,313 @@ async def process_debate_round(
             - ai_response: AI's response and analysis
             - round_id: Unique identifier for this round
     """
+    turn = round_sequencer.take(conversation_id)
     try:
-        if conversation_id not in conversations:
+        conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
+        if conversation is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        conversation = conversations[conversation_id]
-        
         if not request.user_utterance:
             raise HTTPException(status_code=400, detail="No user text provided")
 
-        # Analyze user's argument
-        user_analysis = await logic_chain_service.analyze_logic(request.user_utterance)
-
-        # Generate AI's response
-        agent_response = await llm_service.generate_debate_response(
-            topic=conversation["topic"],
-            user_side=conversation["user_side"],
-            user_utterance=request.user_utterance
+        # Run the round as a dependency graph: the user analysis and the AI's
+        # rebuttal are independent, while TTS and the rebuttal analysis only
+        # need the rebuttal text
+        graph = StageGraph()
+        graph.add_stage(
+            "analyze_user",
+            lambda: logic_chain_service.analyze_logic(request.user_utterance)
         )
+        graph.add_stage(
+            "generate_rebuttal",
+            lambda: llm_service.generate_debate_response(
+                topic=conversation["topic"],
+                user_side=conversation["user_side"],
+                user_utterance=request.user_utterance
+            )
+        )
+        graph.add_stage("text_to_speech", tts_service.text_to_speech, depends_on=["generate_rebuttal"])
+        graph.add_stage("analyze_rebuttal", logic_chain_service.analyze_logic, depends_on=["generate_rebuttal"])
+        results = await graph.run()
 
-        # Generate audio for AI's response
-        audio_url = await tts_service.text_to_speech(agent_response)
-
-        # Analyze AI's response
-        agent_analysis = await logic_chain_service.analyze_logic(agent_response)
+        user_analysis = results["analyze_user"]
+        agent_response = results["generate_rebuttal"]
+        audio_url = results["text_to_speech"]
+        agent_analysis = results["analyze_rebuttal"]
 
-        # Store the round in conversation history
+        # Store the round once; the response is a view of the stored record
         round_id = str(uuid.uuid4())
-        round_data = {
-            "round_index": len(conversation["rounds"]),
-            "user": {
-                "text": request.user_utterance,
-                "logic_chain": {
-                    "logic_expression": user_analysis.logic_expression,
-                    "converted_logical_expression": user_analysis.converted_logical_expression,
-                    "performance": {
-                        "valid": user_analysis.performance.valid,
-                        "valid_explanation": user_analysis.performance.valid_explanation,
-                        "sound": user_analysis.performance.sound,
-                        "sound_explanation": user_analysis.performance.sound_explanation
-                    }
-                }
-            },
-            "ai": {
-                "text": agent_response,
-                "audio_url": audio_url,
-                "logic_chain": {
-                    "logic_expression": agent_analysis.logic_expression,
-                    "converted_logical_expression": agent_analysis.converted_logical_expression,
-                    "performance": {
-                        "valid": agent_analysis.performance.valid,
-                        "valid_explanation": agent_analysis.performance.valid_explanation,
-                        "sound": agent_analysis.performance.sound,
-                        "sound_explanation": agent_analysis.performance.sound_explanation
-                    }
-                }
-            },
-            "timestamp": datetime.utcnow()
-        }
-        conversation["rounds"].append(round_data)
+        record = ConversationRound(
+            user_text=request.user_utterance,
+            user_chain=LogicChainRecord.from_logic_chain(user_analysis),
+            ai_text=agent_response,
+            audio_url=audio_url,
+            ai_chain=LogicChainRecord.from_logic_chain(agent_analysis),
+            timings={
+                "stages": graph.timings,
+                "total_ms": graph.total_ms
+            }
+        )
+        # Rounds run concurrently, but are stored in the order they were submitted
+        await turn.wait()
+        await conversation_store.add_round(conversation_id, record)
 
         return AgentTrainingResponse(
-            user_response={
-                "text": request.user_utterance,
-                "logic_chain": {
-                    "logic_expression": user_analysis.logic_expression,
-                    "converted_logical_expression": user_analysis.converted_logical_expression,
-                    "performance": {
-                        "valid": user_analysis.performance.valid,
-                        "valid_explanation": user_analysis.performance.valid_explanation,
-                        "sound": user_analysis.performance.sound,
-                        "sound_explanation": user_analysis.performance.sound_explanation
-                    }
-                }
-            },
-            ai_response={
-                "text": agent_response,
-                "audio_url": audio_url,
-                "logic_chain": {
-                    "logic_expression": agent_analysis.logic_expression,
-                    "converted_logical_expression": agent_analysis.converted_logical_expression,
-                    "performance": {
-                        "valid": agent_analysis.performance.valid,
-                        "valid_explanation": agent_analysis.performance.valid_explanation,
-                        "sound": agent_analysis.performance.sound,
-                        "sound_explanation": agent_analysis.performance.sound_explanation
-                    }
-                }
-            },
+            user_response=record.user_response(),
+            ai_response=record.ai_response(),
             round_id=round_id
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        turn.finish()
+
+def _sse_event(event: str, data: Dict) -> str:
+    """Format a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@router.post("/round/{conversation_id}/stream")
+async def stream_debate_round(
+    conversation_id: str,
+    request: AgentTrainingRoundRequest,
+    incremental_audio: bool = False
+) -> StreamingResponse:
+    """
+    Process a debate round and stream the results as server-sent events.
+    
+    The AI's rebuttal is forwarded token by token as soon as the model produces
+    it, so clients can render text long before the analyses and audio finish.
+    
+    Args:
+        conversation_id: ID of the active conversation
+        request: AgentTrainingRoundRequest containing:
+            - user_utterance: The user's argument text
+        incremental_audio: Synthesise the rebuttal sentence by sentence while
+            it is generated and announce a progressive audio stream up front
+            
+    Returns:
+        A text/event-stream response emitting, in order:
+            - start: round_id, sent immediately
+            - audio_stream: stream_url of the progressive mp3 (incremental_audio only)
+            - token: each rebuttal text fragment
+            - rebuttal: the complete rebuttal text
+            - user_analysis / ai_analysis / audio: as each finishes
+            - done: round_id and round_index once the round is stored
+            - error: detail, if any stage fails
+    """
+    conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    if not request.user_utterance:
+        raise HTTPException(status_code=400, detail="No user text provided")
+    # Ordered by the request's arrival, not by when its response starts
+    turn = round_sequencer.take(conversation_id)
+
+    async def event_stream():
+        origin = time.perf_counter()
+        timings: Dict[str, Dict[str, float]] = {}
+        round_id = str(uuid.uuid4())
+        tasks: Dict[str, asyncio.Task] = {}
+        speech = None
+
+        def elapsed_ms(since: float) -> float:
+            return round((time.perf_counter() - since) * 1000, 2)
+
+        async def timed(name: str, awaitable):
+            started = time.perf_counter()
+            try:
+                return await awaitable
+            finally:
+                timings[name] = {
+                    "start_ms": round((started - origin) * 1000, 2),
+                    "duration_ms": elapsed_ms(started)
+                }
+
+        try:
+            yield _sse_event("start", {"round_id": round_id})
+
+            if incremental_audio:
+                # Playback can begin as soon as the first sentence is synthesised
+                speech = tts_service.start_incremental()
+                yield _sse_event("audio_stream", {"stream_url": f"/agent-training/speech/{speech.stream_id}"})
+
+            # The user analysis does not depend on the rebuttal
+            tasks["user_analysis"] = asyncio.create_task(
+                timed("analyze_user", logic_chain_service.analyze_logic(request.user_utterance))
+            )
+
+            # Forward rebuttal tokens as they arrive
+            fragments: List[str] = []
+            rebuttal_started = time.perf_counter()
+            first_token_ms = None
+            async for token in llm_service.stream_debate_response(
+                topic=conversation["topic"],
+                user_side=conversation["user_side"],
+                user_utterance=request.user_utterance
+            ):
+                if first_token_ms is None:
+                    first_token_ms = elapsed_ms(origin)
+                fragments.append(token)
+                if speech is not None:
+                    speech.feed(token)
+                yield _sse_event("token", {"text": token})
+            agent_response = "".join(fragments)
+            timings["generate_rebuttal"] = {
+                "start_ms": round((rebuttal_started - origin) * 1000, 2),
+                "duration_ms": elapsed_ms(rebuttal_started)
+            }
+            yield _sse_event("rebuttal", {"text": agent_response})
+
+            # TTS and the rebuttal analysis only need the rebuttal text
+            tasks["ai_analysis"] = asyncio.create_task(
+                timed("analyze_rebuttal", logic_chain_service.analyze_logic(agent_response))
+            )
+            if speech is not None:
+                speech.finish()
+                audio = speech.wait_closed()
+            else:
+                audio = tts_service.text_to_speech(agent_response)
+            tasks["audio"] = asyncio.create_task(timed("text_to_speech", audio))
+
+            # Emit each remaining result as soon as it is ready
+            names = {task: name for name, task in tasks.items()}
+            pending = set(tasks.values())
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = names[task]
+                    result = task.result()
+                    if name == "audio":
+                        yield _sse_event("audio", {"audio_url": result})
+                    else:
+                        yield _sse_event(name, {"logic_chain": result.model_dump()})
+
+            user_analysis = tasks["user_analysis"].result()
+            agent_analysis = tasks["ai_analysis"].result()
+            record = ConversationRound(
+                user_text=request.user_utterance,
+                user_chain=LogicChainRecord.from_logic_chain(user_analysis),
+                ai_text=agent_response,
+                audio_url=tasks["audio"].result(),
+                ai_chain=LogicChainRecord.from_logic_chain(agent_analysis),
+                timings={
+                    "stages": timings,
+                    "first_token_ms": first_token_ms,
+                    "total_ms": elapsed_ms(origin)
+                }
+            )
+            await turn.wait()
+            round_index = await conversation_store.add_round(conversation_id, record)
+
+            yield _sse_event("done", {"round_id": round_id, "round_index": round_index})
+
+        except Exception as e:
+            logger.error(f"Error streaming debate round: {str(e)}")
+            yield _sse_event("error", {"detail": str(e)})
+        finally:
+            # Stop outstanding work if the client disconnected or a stage failed
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+            if speech is not None and not speech.finished:
+                speech.cancel()
+            turn.finish()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also leaves the line if the stream never started
+        background=BackgroundTask(turn.finish)
+    )
+
+@router.get("/speech/{stream_id}")
+async def stream_speech(stream_id: str):
+    """
+    Serve rebuttal audio produced by incremental synthesis.
+    
+    While synthesis is still running the mp3 is sent as a chunked response
+    that follows the synthesiser, so playback can start before the rebuttal
+    is fully generated. Another worker than the one synthesising follows the
+    partial file instead. Finished streams are served from the saved file.
+    
+    Args:
+        stream_id: The identifier announced in the audio_stream event
+        
+    Returns:
+        An audio/mpeg response
+    """
+    try:
+        uuid.UUID(stream_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Audio stream not found")
+
+    speech = tts_service.incremental_streams.get(stream_id)
+    if speech is not None:
+        return StreamingResponse(speech.iter_audio(), media_type="audio/mpeg")
+
+    audio_path = Path(settings.AUDIO_STORAGE_PATH) / f"{stream_id}.mp3"
+    if audio_path.exists():
+        return FileResponse(audio_path, media_type="audio/mpeg")
+    if partial_audio_path(audio_path).exists():
+        # Being synthesised by another worker
+        return StreamingResponse(follow_partial_audio(audio_path), media_type="audio/mpeg")
+    raise HTTPException(status_code=404, detail="Audio stream not found")
 
 @router.get("/history/{conversation_id}")
-async def get_conversation_history(conversation_id: str) -> AgentTrainingHistoryResponse:
+async def get_conversation_history(
+    conversation_id: str,
+    request: Request,
+    response: Response,
+    since_round: Optional[int] = SINCE_ROUND,
+    limit: Optional[int] = LIMIT,
+    exclude: Optional[str] = EXCLUDE
+) -> AgentTrainingHistoryResponse:
     """
-    Retrieve the full history of a debate conversation.
+    Retrieve the history of a debate conversation, one page at a time.
+    
+    The response carries an ETag and Last-Modified; a conditional request
+    for an unchanged conversation gets 304 Not Modified.
     
     Args:
         conversation_id: The unique identifier of the conversation
+        since_round: Only return rounds after this round_index
+        limit: Maximum number of rounds to return (default: all)
+        exclude: Comma-separated fields to omit from each round
+            ("explanations" omits both performance explanations)
         
     Returns:
         AgentTrainingHistoryResponse containing:
             - conversation_id: The requested conversation ID
             - topic_id: The debate topic ID
-            - rounds: List of all debate rounds
+            - rounds: List of debate rounds
+            - next_cursor: since_round for the next page, or None on the last page
     """
     try:
-        if conversation_id not in conversations:
+        version = await conversation_store.get_version(conversation_id)
+        if version is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
-            
-        conversation = conversations[conversation_id]
+        if is_not_modified(request, version):
+            return not_modified(version)
+
+        conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
+        records = await conversation_store.get_rounds(conversation_id, since_round, fetch_limit(limit))
+        records, next_cursor = split_page(records, limit, lambda record: record.round_index)
+        excluded = parse_exclude(exclude)
+        response.headers.update(version_headers(version))
         
         return AgentTrainingHistoryResponse(
             conversation_id=conversation_id,
             topic_id=conversation["topic"],
-            rounds=conversation["rounds"]
+            rounds=[project(record.to_dict(), excluded) for record in records],
+            next_cursor=next_cursor
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -292,19 +488,18 @@ async def submit_audio(conversation_id: str, file: UploadFile = File(...), speak
         HTTPException: If there are errors in audio processing or analysis
         
     Note:
-        The audio file is temporarily stored during processing and then
-        automatically cleaned up.
+        The audio is transcribed from memory; only uploads of at least
+        STT_TEMP_FILE_MIN_BYTES, when set, are written to a temporary file.
     """
     try:
         logger.info(f"Processing audio submission for conversation {conversation_id}")
         
         # Validate conversation exists
-        if conversation_id not in conversations:
+        conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
+        if conversation is None:
             logger.error(f"Conversation {conversation_id} not found")
             raise HTTPException(status_code=404, detail="Conversation not found")
 
-        # Get conversation data
-        conversation = conversations[conversation_id]
         logger.info(f"Found conversation with topic: {conversation['topic']}")
 
         # Validate file content type
@@ -313,31 +508,17 @@ async def submit_audio(conversation_id: str, file: UploadFile = File(...), speak
             logger.error(f"Invalid file type: {file.content_type}")
             raise HTTPException(status_code=400, detail="Invalid file type. Must be audio file.")
 
-        # Create audio_storage directory if it doesn't exist
-        audio_dir = Path("audio_storage")
-        audio_dir.mkdir(exist_ok=True)
-        logger.info(f"Audio directory ensured: {audio_dir}")
-        
-        # Save audio file with unique name in audio_storage directory
-        temp_audio_path = audio_dir / f"temp_{uuid.uuid4()}.wav"
         try:
-            # Save uploaded file
-            logger.info(f"Saving uploaded file to {temp_audio_path}")
-            content = await file.read()
-            logger.info(f"Read file content, size: {len(content)} bytes")
-            
-            if len(content) == 0:
+            # The upload goes to the recogniser from memory; see STT_TEMP_FILE_MIN_BYTES
+            logger.info(f"Received upload, size: {file.size} bytes")
+            if file.size == 0:
                 logger.error("Uploaded file is empty")
                 raise HTTPException(status_code=400, detail="Uploaded file is empty")
-            
-            with open(temp_audio_path, "wb") as buffer:
-                buffer.write(content)
-            logger.info(f"Successfully saved audio file")
 
             # Convert speech to text
             logger.info("Starting speech-to-text conversion")
             try:
-                debate_text = await stt_service.transcribe_audio(temp_audio_path)
+                debate_text = await stt_service.transcribe_upload(file)
                 logger.info(f"Successfully transcribed audio to text: {debate_text}")
             except FileNotFoundError as fnf:
                 logger.error(f"Audio file not found: {str(fnf)}")
@@ -384,14 +565,6 @@ async def submit_audio(conversation_id: str, file: UploadFile = File(...), speak
         except Exception as e:
             logger.error(f"Error processing audio: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
-        finally:
-            # Clean up temporary file
-            if temp_audio_path.exists():
-                try:
-                    os.remove(temp_audio_path)
-                    logger.info(f"Cleaned up temporary file: {temp_audio_path}")
-                except Exception as cleanup_error:
-                    logger.error(f"Failed to clean up temporary file: {str(cleanup_error)}")
 
     except HTTPException as he:
         logger.error(f"HTTP Exception in submit_audio: {he.detail}")
@@ -400,61 +573,169 @@ async def submit_audio(conversation_id: str, file: UploadFile = File(...), speak
         logger.error(f"Unexpected error in submit_audio: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/audio/{conversation_id}/stream")
+async def submit_audio_stream(conversation_id: str, request: Request) -> Dict:
+    """
+    Transcribe a spoken argument while it is uploaded, then process the round.
+    
+    The request body is the raw LINEAR16 audio (e.g. a WAV file), sent with
+    chunked transfer encoding or at once. Chunks reach the recogniser as
+    they are received, so the transcript is ready shortly after the upload
+    ends instead of a full recognition later.
+    
+    Args:
+        conversation_id: The identifier of the training conversation
+        request: The request whose body is streamed to the recogniser
+            
+    Returns:
+        The same body as POST /audio/{conversation_id}
+            
+    Raises:
+        HTTPException: 404 for an unknown conversation, 400 for invalid
+            audio or if no speech was recognised, 500 for recognition or
+            round failures
+    """
+    try:
+        conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
+        if conversation is None:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+
+        utterances: List[str] = []
+        try:
+            async for transcript in stt_service.stream_transcribe(request.stream()):
+                if transcript.is_final:
+                    utterances.append(transcript.text)
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=f"Invalid audio content: {str(ve)}")
+        debate_text = " ".join(utterances).strip()
+        if not debate_text:
+            raise HTTPException(status_code=400, detail="No speech content detected in the audio")
+        logger.info(f"Transcribed streamed audio to text: {debate_text}")
+
+        result = await process_debate_round(conversation_id, AgentTrainingRoundRequest(user_utterance=debate_text))
+        return {
+            "user_response": result.user_response,
+            "ai_response": result.ai_response,
+            "round_id": result.round_id
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing streamed audio: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/logic-chain/{conversation_id}")
-async def get_logic_chain(conversation_id: str) -> Dict:
+async def get_logic_chain(
+    conversation_id: str,
+    request: Request,
+    response: Response,
+    since_round: Optional[int] = SINCE_ROUND,
+    limit: Optional[int] = LIMIT,
+    exclude: Optional[str] = EXCLUDE
+) -> Dict:
     """
-    Retrieve the logical chain analysis for a conversation.
+    Retrieve the logical chain analysis for a conversation, one page at a time.
+    
+    The response carries an ETag and Last-Modified; a conditional request
+    for an unchanged conversation gets 304 Not Modified.
     
     Args:
         conversation_id: The unique identifier of the conversation
+        since_round: Only return rounds after this round_index
+        limit: Maximum number of rounds to return (default: all)
+        exclude: Comma-separated fields to omit from each entry
+            ("explanations" omits both performance explanations)
         
     Returns:
         Dict containing:
             - topic: The debate topic
-            - logic_chains: List of all logical analyses in chronological order:
+            - logic_chains: List of logical analyses in chronological order:
                 - round_index: Index of the debate round
                 - user_chain: User's logical analysis
                 - ai_chain: AI's logical analysis
                 - timestamp: When the analysis occurred
+            - next_cursor: since_round for the next page, or None on the last page
     """
     try:
-        if conversation_id not in conversations:
+        version = await conversation_store.get_version(conversation_id)
+        if version is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
-            
-        conversation = conversations[conversation_id]
-        
-        logic_chains = []
-        for round_data in conversation["rounds"]:
-            logic_chains.append({
-                "round_index": round_data["round_index"],
-                "user_chain": {
-                    "text": round_data["user"]["text"],
-                    "logic_expression": round_data["user"]["logic_chain"]["logic_expression"],
-                    "converted_logical_expression": round_data["user"]["logic_chain"]["converted_logical_expression"],
-                    "performance": round_data["user"]["logic_chain"]["performance"]
-                },
-                "ai_chain": {
-                    "text": round_data["ai"]["text"],
-                    "logic_expression": round_data["ai"]["logic_chain"]["logic_expression"],
-                    "converted_logical_expression": round_data["ai"]["logic_chain"]["converted_logical_expression"],
-                    "performance": round_data["ai"]["logic_chain"]["performance"]
-                },
-                "timestamp": round_data["timestamp"]
-            })
+        if is_not_modified(request, version):
+            return not_modified(version)
+
+        conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
+        records = await conversation_store.get_rounds(conversation_id, since_round, fetch_limit(limit))
+        records, next_cursor = split_page(records, limit, lambda record: record.round_index)
+        excluded = parse_exclude(exclude)
+        response.headers.update(version_headers(version))
         
         return {
             "topic": conversation["topic_info"],
-            "logic_chains": logic_chains
+            "logic_chains": [project(record.chain_view(), excluded) for record in records],
+            "next_cursor": next_cursor
         }
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/logic-chain/{conversation_id}/delta")
+async def get_logic_chain_delta(
+    conversation_id: str,
+    request: Request,
+    response: Response,
+    version: int = Query(..., ge=0, description="The version the client already has"),
+    exclude: Optional[str] = EXCLUDE
+) -> Dict:
+    """
+    Retrieve only the logical analyses added after a known version.
+    
+    A conversation's version is its number of rounds, so polling clients
+    send the version of their last response and receive just what is new.
+    
+    Args:
+        conversation_id: The unique identifier of the conversation
+        version: The version the client already has
+        exclude: Comma-separated fields to omit from each entry
+        
+    Returns:
+        Dict containing:
+            - version: The version after applying these entries
+            - logic_chains: The analyses of rounds added after the given version
+    """
+    try:
+        current = await conversation_store.get_version(conversation_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        if is_not_modified(request, current):
+            return not_modified(current)
+
+        records = []
+        if version < current.version:
+            records = await conversation_store.get_rounds(conversation_id, since_round=version - 1)
+        excluded = parse_exclude(exclude)
+        response.headers.update(version_headers(current))
+
+        return {
+            "version": records[-1].round_index + 1 if records else current.version,
+            "logic_chains": [project(record.chain_view(), excluded) for record in records]
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/logic-chain/{conversation_id}/current")
-async def get_current_logic_chain(conversation_id: str) -> Dict:
+async def get_current_logic_chain(conversation_id: str, request: Request, response: Response) -> Dict:
     """
     Retrieve the logical chain analysis for the current round.
     
+    The response carries an ETag and Last-Modified; a conditional request
+    for an unchanged conversation gets 304 Not Modified.
+    
     Args:
         conversation_id: The unique identifier of the conversation
         
@@ -462,36 +743,25 @@ async def get_current_logic_chain(conversation_id: str) -> Dict:
         Dict containing the latest round's logical analysis
     """
     try:
-        if conversation_id not in conversations:
+        version = await conversation_store.get_version(conversation_id)
+        if version is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
-            
-        conversation = conversations[conversation_id]
-        
-        if not conversation["rounds"]:
+        if version.version == 0:
             raise HTTPException(status_code=404, detail="No rounds found in conversation")
-            
+        if is_not_modified(request, version):
+            return not_modified(version)
+
+        conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
         # Get the latest round
-        current_round = conversation["rounds"][-1]
+        current_round = await conversation_store.get_last_round(conversation_id)
+        response.headers.update(version_headers(version))
         
         return {
             "topic": conversation["topic_info"],
-            "current_chain": {
-                "round_index": current_round["round_index"],
-                "user_chain": {
-                    "text": current_round["user"]["text"],
-                    "logic_expression": current_round["user"]["logic_chain"]["logic_expression"],
-                    "converted_logical_expression": current_round["user"]["logic_chain"]["converted_logical_expression"],
-                    "performance": current_round["user"]["logic_chain"]["performance"]
-                },
-                "ai_chain": {
-                    "text": current_round["ai"]["text"],
-                    "logic_expression": current_round["ai"]["logic_chain"]["logic_expression"],
-                    "converted_logical_expression": current_round["ai"]["logic_chain"]["converted_logical_expression"],
-                    "performance": current_round["ai"]["logic_chain"]["performance"]
-                },
-                "timestamp": current_round["timestamp"]
-            }
+            "current_chain": current_round.chain_view()
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
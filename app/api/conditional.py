@@ -0,0 +1,53 @@
+"""
+Conditional GET support for the polling endpoints.
+
+A debate's or conversation's RoundVersion becomes a weak ETag and a
+Last-Modified date. A request whose If-None-Match (or, without one,
+If-Modified-Since) still matches is answered with 304 before any round is
+read or serialised.
+"""
+
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict
+from fastapi import Request
+from fastapi.responses import Response
+from ..storage import RoundVersion
+
+
+def etag(version: RoundVersion) -> str:
+    return f'W/"{version.version}"'
+
+
+def version_headers(version: RoundVersion) -> Dict[str, str]:
+    """Validators for a response, plus no-cache so clients always revalidate."""
+    return {
+        "ETag": etag(version),
+        "Last-Modified": format_datetime(version.updated_at.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "no-cache"
+    }
+
+
+def is_not_modified(request: Request, version: RoundVersion) -> bool:
+    """Whether the client's cached copy is still current."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        current = etag(version).removeprefix("W/")
+        return any(
+            tag.strip() == "*" or tag.strip().removeprefix("W/") == current
+            for tag in if_none_match.split(",")
+        )
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        updated_at = version.updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+        return since.tzinfo is not None and updated_at <= since
+    return False
+
+
+def not_modified(version: RoundVersion) -> Response:
+    return Response(status_code=304, headers=version_headers(version))
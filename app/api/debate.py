@@ -6,40 +6,23 @@ including both text and audio inputs. It handles logical analysis of arguments
 and speech-to-text conversion for audio submissions.
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Body
+from fastapi import APIRouter, HTTPException, UploadFile, File, Body, Query, Request, Response
 from ..models.schemas import DebateRound, DebateResponse, Side
 from ..services.stt import stt_service
 from ..services.logic_chain import logic_chain_service
 from ..services.llm import llm_service
 from ..services.tts import tts_service
+from ..services.sequencer import round_sequencer
+from ..storage import debate_store
+from .conditional import is_not_modified, not_modified, version_headers
+from .pagination import EXCLUDE, LIMIT, SINCE_ROUND, fetch_limit, parse_exclude, project, split_page
 from datetime import datetime
-from pathlib import Path
-import os
 import uuid
-import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pydantic import BaseModel
 
 router = APIRouter()
 
-# File path for debate data persistence
-DEBATE_DATA_FILE = "debate_data.json"
-
-# Load existing debate data from file
-def load_debates() -> Dict[str, dict]:
-    if os.path.exists(DEBATE_DATA_FILE):
-        with open(DEBATE_DATA_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-# Save debate data to file
-def save_debates(debates: Dict[str, dict]):
-    with open(DEBATE_DATA_FILE, "w") as f:
-        json.dump(debates, f, default=str)
-
-# Initialize debates from file
-debates: Dict[str, dict] = load_debates()
-
 class DebateStartRequest(BaseModel):
     topic: str
     supporting_speaker_id: str
@@ -49,6 +32,10 @@ class DebateRoundRequest(BaseModel):
     debate_text: str
     speaker_id: str
 
+class BatchAnalysisRequest(BaseModel):
+    sentences: List[str]
+    context_expressions: Optional[List[str]] = None
+
 @router.post("/start")
 async def start_conversation(request: DebateStartRequest) -> Dict:
     """
@@ -73,7 +60,7 @@ async def start_conversation(request: DebateStartRequest) -> Dict:
         debate_id = str(uuid.uuid4())
         
         # Initialize debate data
-        debates[debate_id] = {
+        debate = {
             "topic": request.topic,
             "start_time": datetime.utcnow(),
             "rounds": [],
@@ -89,15 +76,16 @@ async def start_conversation(request: DebateStartRequest) -> Dict:
             }
         }
         
-        # Save updated debate data
-        save_debates(debates)
+        await debate_store.create_debate(debate_id, debate)
         
         return {
             "debate_id": debate_id,
             "topic": request.topic,
-            "participants": debates[debate_id]["participants"]
+            "participants": debate["participants"]
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -129,11 +117,11 @@ async def submit_debate_round(
                 - performance: Analysis of validity and soundness
             - round_id: Unique identifier for this round
     """
+    turn = round_sequencer.take(debate_id)
     try:
-        if debate_id not in debates:
+        debate = await debate_store.get_debate(debate_id, include_rounds=False)
+        if debate is None:
             raise HTTPException(status_code=404, detail="Debate session not found")
-            
-        debate = debates[debate_id]
         
         if request.speaker_id not in debate["participants"]:
             raise HTTPException(status_code=403, detail="Speaker is not a participant in this debate")
@@ -147,7 +135,6 @@ async def submit_debate_round(
         # Store the round in debate history
         round_id = str(uuid.uuid4())
         round_data = {
-            "round_index": len(debate["rounds"]),
             "text": request.debate_text,
             "speaker_id": request.speaker_id,
             "side": debate["participants"][request.speaker_id]["side"],
@@ -159,14 +146,14 @@ async def submit_debate_round(
                     "valid_explanation": analysis.performance.valid_explanation,
                     "sound": analysis.performance.sound,
                     "sound_explanation": analysis.performance.sound_explanation
-                }
+                },
+                "source": analysis.source
             },
             "timestamp": datetime.utcnow()
         }
-        debate["rounds"].append(round_data)
-        
-        # Save updated debate data
-        save_debates(debates)
+        # Analyses overlap, but rounds are stored in the order they were submitted
+        await turn.wait()
+        await debate_store.add_round(debate_id, round_data)
         
         return {
             "argument": {
@@ -180,13 +167,18 @@ async def submit_debate_round(
                     "valid_explanation": analysis.performance.valid_explanation,
                     "sound": analysis.performance.sound,
                     "sound_explanation": analysis.performance.sound_explanation
-                }
+                },
+                "source": analysis.source
             },
             "round_id": round_id
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        turn.finish()
 
 @router.post("/audio/{debate_id}")
 async def submit_audio(debate_id: str, file: UploadFile = File(...), speaker_id: str = None) -> Dict:
@@ -209,68 +201,178 @@ async def submit_audio(debate_id: str, file: UploadFile = File(...), speaker_id:
         HTTPException: If there are errors in audio processing or analysis
     """
     try:
-        if debate_id not in debates:
+        if await debate_store.get_debate(debate_id, include_rounds=False) is None:
             raise HTTPException(status_code=404, detail="Debate session not found")
 
-        # Save audio file with unique name
-        temp_audio_path = Path(f"temp_{uuid.uuid4()}.wav")
-        with open(temp_audio_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
+        # Convert speech to text straight from the upload
         try:
-            # Convert speech to text
-            debate_text = await stt_service.transcribe_audio(temp_audio_path)
-        finally:
-            # Clean up temporary file
-            if temp_audio_path.exists():
-                os.remove(temp_audio_path)
+            debate_text = await stt_service.transcribe_upload(file)
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=f"Invalid audio content: {str(ve)}")
 
         # Process text through debate round analysis
         return await submit_debate_round(debate_id, DebateRoundRequest(debate_text=debate_text, speaker_id=speaker_id))
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/history/{debate_id}")
-async def get_debate_history(debate_id: str) -> Dict:
+async def get_debate_history(
+    debate_id: str,
+    request: Request,
+    response: Response,
+    since_round: Optional[int] = SINCE_ROUND,
+    limit: Optional[int] = LIMIT,
+    exclude: Optional[str] = EXCLUDE
+) -> Dict:
     """
-    Retrieve the full history of a debate conversation.
+    Retrieve the history of a debate conversation, one page at a time.
     
-    This endpoint returns all rounds of debate for a given session,
-    including all participants' arguments and logical analyses.
+    This endpoint returns the rounds of debate for a given session,
+    including all participants' arguments and logical analyses. Without
+    paging parameters every round is returned. The response carries an ETag
+    and Last-Modified; a conditional request for an unchanged debate gets
+    304 Not Modified.
     
     Args:
         debate_id: The unique identifier of the debate session
+        since_round: Only return rounds after this round_index
+        limit: Maximum number of rounds to return
+        exclude: Comma-separated fields to omit from each round
+            ("explanations" omits both performance explanations)
         
     Returns:
         Dict containing:
             - debate_id: The requested debate ID
             - topic: The debate topic
             - participants: Dict of participants and their sides
-            - rounds: List of all debate rounds, each containing:
+            - rounds: List of debate rounds, each containing:
                 - round_index: Index of the round
                 - text: The argument text
                 - speaker_id: Identifier of the speaker
                 - side: The speaker's side
                 - logic_chain: Analysis of the argument
                 - timestamp: When the round occurred
+            - next_cursor: since_round for the next page, or None on the last page
             
     Raises:
         HTTPException: If the debate session is not found
     """
     try:
-        if debate_id not in debates:
+        version = await debate_store.get_version(debate_id)
+        if version is None:
             raise HTTPException(status_code=404, detail="Debate session not found")
-            
-        debate = debates[debate_id]
+        if is_not_modified(request, version):
+            return not_modified(version)
+
+        debate = await debate_store.get_debate(debate_id, include_rounds=False)
+        rounds = await debate_store.get_rounds(debate_id, since_round, fetch_limit(limit))
+        rounds, next_cursor = split_page(rounds, limit, lambda round_data: round_data["round_index"])
+        response.headers.update(version_headers(version))
         
         return {
             "debate_id": debate_id,
             "topic": debate["topic"],
             "participants": debate["participants"],
-            "rounds": debate["rounds"]
+            "rounds": project(rounds, parse_exclude(exclude)),
+            "next_cursor": next_cursor
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+@router.get("/history/{debate_id}/delta")
+async def get_debate_history_delta(
+    debate_id: str,
+    request: Request,
+    response: Response,
+    version: int = Query(..., ge=0, description="The version the client already has"),
+    exclude: Optional[str] = EXCLUDE
+) -> Dict:
+    """
+    Retrieve only the rounds added to a debate after a known version.
+    
+    A debate's version is its number of rounds, so polling clients send the
+    version of their last response and receive just what is new.
+    
+    Args:
+        debate_id: The unique identifier of the debate session
+        version: The version the client already has
+        exclude: Comma-separated fields to omit from each round
+        
+    Returns:
+        Dict containing:
+            - debate_id: The requested debate ID
+            - version: The version after applying these rounds
+            - rounds: The rounds added after the given version
+            
+    Raises:
+        HTTPException: If the debate session is not found
+    """
+    try:
+        current = await debate_store.get_version(debate_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Debate session not found")
+        if is_not_modified(request, current):
+            return not_modified(current)
+
+        rounds = []
+        if version < current.version:
+            rounds = await debate_store.get_rounds(debate_id, since_round=version - 1)
+        response.headers.update(version_headers(current))
+
+        return {
+            "debate_id": debate_id,
+            "version": rounds[-1]["round_index"] + 1 if rounds else current.version,
+            "rounds": project(rounds, parse_exclude(exclude))
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/analyze-batch")
+async def analyze_batch(request: BatchAnalysisRequest) -> Dict:
+    """
+    Analyze the logical structure of many sentences at once.
+    
+    This endpoint is intended for after-the-fact analysis of whole transcripts.
+    Sentences are packed into size-bounded LLM requests that run concurrently,
+    and each sentence succeeds or fails independently.
+    
+    Args:
+        request: BatchAnalysisRequest containing:
+            - sentences: The sentences to analyze
+            - context_expressions: Optional logical expressions used as shared context
+            
+    Returns:
+        Dict containing:
+            - results: One entry per sentence, in order, each with:
+                - index: Position of the sentence in the request
+                - sentence: The sentence text
+                - logic_chain: The analysis, or null if it failed
+                - error: The failure reason, or null if it succeeded
+            - succeeded: Number of sentences analyzed
+            - failed: Number of sentences that failed
+    """
+    if not request.sentences:
+        raise HTTPException(status_code=400, detail="No sentences provided")
+
+    try:
+        results = await logic_chain_service.analyze_batch(request.sentences, request.context_expressions)
+        failed = sum(1 for item in results if item.error is not None)
+        return {
+            "results": [item.model_dump() for item in results],
+            "succeeded": len(results) - failed,
+            "failed": failed
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
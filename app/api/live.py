@@ -0,0 +1,243 @@
+"""
+Live debate sessions over a WebSocket.
+
+The client streams microphone audio and the server answers on the same
+socket as the argument is spoken: partial transcripts while the speaker
+talks, the analysis of every sentence as soon as it is finalised, and the
+AI's rebuttal the moment the speaker's turn ends. By then the user's
+argument is already transcribed and mostly analysed, so the rebuttal
+starts within the time to its first token instead of after an upload,
+a full recognition and the analyses.
+"""
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from ..models.records import ConversationRound, LogicChainRecord
+from ..services.stt import stt_service
+from ..services.llm import llm_service
+from ..services.tts import SentenceSplitter, tts_service
+from ..services.logic_chain import combine_logic_chains, logic_chain_service
+from ..services.sequencer import round_sequencer
+from ..storage import conversation_store
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import uuid
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Inbox items besides audio frames
+END_OF_TURN = object()
+CLOSED = object()
+
+
+@router.websocket("/live/{conversation_id}")
+async def live_session(websocket: WebSocket, conversation_id: str):
+    """
+    Run a live training session for an existing conversation.
+
+    Client messages:
+        - binary frames: mono LINEAR16 audio at STT_SAMPLE_RATE, e.g. 100 ms
+          microphone buffers, sent as they are captured
+        - {"type": "end"}: the speaker finished their turn
+
+    Server messages (JSON), per turn:
+        - interim: text of the utterance recognised so far, revised by later messages
+        - sentence: index and text of each finalised sentence
+        - user_analysis: index and logic_chain of a sentence, as each finishes
+        - token: each rebuttal text fragment, once the turn has ended
+        - rebuttal: the complete rebuttal text
+        - ai_analysis / audio: as each finishes
+        - done: round_id and round_index once the round is stored
+        - error: detail, if the turn fails; the session continues
+
+    A session may hold any number of turns. Unknown conversations are
+    closed with code 4404.
+    """
+    conversation = await conversation_store.get_conversation(conversation_id, include_rounds=False)
+    await websocket.accept()
+    if conversation is None:
+        await websocket.close(code=4404, reason="Conversation not found")
+        return
+
+    inbox: asyncio.Queue = asyncio.Queue()
+    outbox: asyncio.Queue = asyncio.Queue()
+
+    async def receive():
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes") is not None:
+                    inbox.put_nowait(message["bytes"])
+                elif _control_type(message.get("text")) == "end":
+                    inbox.put_nowait(END_OF_TURN)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            inbox.put_nowait(CLOSED)
+
+    async def send():
+        # One writer, so messages from concurrent analyses never interleave
+        try:
+            while True:
+                message = await outbox.get()
+                await websocket.send_text(json.dumps(message, default=str))
+        except (WebSocketDisconnect, RuntimeError):
+            logger.info(f"Live session {conversation_id} closed by the client")
+
+    receiver = asyncio.create_task(receive())
+    sender = asyncio.create_task(send())
+    try:
+        closed = False
+        while not closed:
+            # Wait for the first frame of the next turn
+            first = await inbox.get()
+            if first is CLOSED:
+                break
+            if first is END_OF_TURN:
+                continue
+
+            async def turn_audio() -> AsyncIterator[bytes]:
+                nonlocal closed
+                item = first
+                while True:
+                    if item is CLOSED:
+                        closed = True
+                        return
+                    if item is END_OF_TURN:
+                        return
+                    yield item
+                    item = await inbox.get()
+
+            try:
+                await _run_turn(conversation, conversation_id, turn_audio(), outbox.put_nowait, lambda: closed)
+            except Exception as e:
+                logger.error(f"Error in live turn: {str(e)}")
+                outbox.put_nowait({"type": "error", "detail": str(e)})
+    finally:
+        receiver.cancel()
+        sender.cancel()
+        if not closed:
+            try:
+                await websocket.close()
+            except RuntimeError:
+                pass
+
+
+def _control_type(text: Optional[str]) -> Optional[str]:
+    try:
+        return json.loads(text or "{}").get("type")
+    except (ValueError, AttributeError):
+        return None
+
+
+async def _run_turn(
+    conversation: Dict[str, Any],
+    conversation_id: str,
+    audio: AsyncIterator[bytes],
+    emit: Callable[[Dict[str, Any]], None],
+    closed: Callable[[], bool]
+):
+    """
+    Transcribe one spoken turn, analyse its sentences while it is spoken,
+    then rebut it and store the round. A turn cut short by the client
+    leaving is dropped.
+    """
+    origin = time.perf_counter()
+    round_id = str(uuid.uuid4())
+    timings: Dict[str, Any] = {}
+    splitter = SentenceSplitter(min_chars=1)
+    sentences: List[str] = []
+    analyses: List[asyncio.Task] = []
+    tasks: List[asyncio.Task] = []
+    turn = round_sequencer.take(conversation_id)
+    end_of_speech = None
+
+    def elapsed_ms(since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 2)
+
+    async def spoken_audio() -> AsyncIterator[bytes]:
+        nonlocal end_of_speech
+        async for chunk in audio:
+            yield chunk
+        end_of_speech = time.perf_counter()
+
+    async def analyze_sentence(index: int, sentence: str):
+        analysis = await logic_chain_service.analyze_logic(sentence)
+        emit({"type": "user_analysis", "index": index, "logic_chain": analysis.model_dump()})
+        return analysis
+
+    def start_sentences(finished: List[str]):
+        for sentence in finished:
+            index = len(sentences)
+            sentences.append(sentence)
+            emit({"type": "sentence", "index": index, "text": sentence})
+            analyses.append(asyncio.create_task(analyze_sentence(index, sentence)))
+
+    try:
+        async for transcript in stt_service.stream_transcribe(spoken_audio()):
+            if transcript.is_final:
+                start_sentences(splitter.feed(transcript.text + " "))
+            else:
+                emit({"type": "interim", "text": transcript.text})
+        if closed():
+            return
+        start_sentences(splitter.flush())
+        # Measured from the end of the turn, which is what the speaker waits on
+        timings["transcribed_after_speech_ms"] = elapsed_ms(end_of_speech)
+
+        if not sentences:
+            raise ValueError("No speech content detected in the audio")
+        user_text = " ".join(sentences)
+
+        # The rebuttal only needs the text, not the analyses still running
+        fragments: List[str] = []
+        async for token in llm_service.stream_debate_response(
+            topic=conversation["topic"],
+            user_side=conversation["user_side"],
+            user_utterance=user_text
+        ):
+            if not fragments:
+                timings["first_token_after_speech_ms"] = elapsed_ms(end_of_speech)
+            fragments.append(token)
+            emit({"type": "token", "text": token})
+        agent_response = "".join(fragments)
+        emit({"type": "rebuttal", "text": agent_response})
+
+        async def analyze_rebuttal():
+            analysis = await logic_chain_service.analyze_logic(agent_response)
+            emit({"type": "ai_analysis", "logic_chain": analysis.model_dump()})
+            return analysis
+
+        async def synthesize():
+            audio_url = await tts_service.text_to_speech(agent_response)
+            emit({"type": "audio", "audio_url": audio_url})
+            return audio_url
+
+        tasks = [asyncio.create_task(analyze_rebuttal()), asyncio.create_task(synthesize())]
+        agent_analysis, audio_url = await asyncio.gather(*tasks)
+        user_analysis = combine_logic_chains(list(await asyncio.gather(*analyses)))
+        timings["total_ms"] = elapsed_ms(origin)
+
+        record = ConversationRound(
+            user_text=user_text,
+            user_chain=LogicChainRecord.from_logic_chain(user_analysis),
+            ai_text=agent_response,
+            audio_url=audio_url,
+            ai_chain=LogicChainRecord.from_logic_chain(agent_analysis),
+            timings=timings
+        )
+        await turn.wait()
+        round_index = await conversation_store.add_round(conversation_id, record)
+        emit({"type": "done", "round_id": round_id, "round_index": round_index})
+    finally:
+        # Stop outstanding work if the turn failed or the client left
+        for task in analyses + tasks:
+            if not task.done():
+                task.cancel()
+        turn.finish()
@@ -0,0 +1,74 @@
+"""
+Metrics API endpoints for service instrumentation.
+
+This module exposes runtime counters (cache hit rates and similar) so the
+effect of performance features can be observed on a running server.
+"""
+
+from fastapi import APIRouter
+from typing import Dict
+from ..config import settings
+from ..services.logic_chain import logic_chain_service
+from ..storage import conversation_store
+
+router = APIRouter()
+
+@router.get("/logic-cache")
+async def get_logic_cache_stats() -> Dict:
+    """
+    Retrieve hit/miss counters for the logic analysis result cache.
+
+    Returns:
+        Dict containing:
+            - enabled: Whether the cache is enabled
+            - stats: Occupancy, hits, disk hits, misses, evictions and hit rate
+    """
+    cache = logic_chain_service.cache
+    return {
+        "enabled": cache is not None,
+        "stats": cache.stats() if cache is not None else {}
+    }
+
+@router.get("/logic-usage")
+async def get_logic_usage_stats() -> Dict:
+    """
+    Retrieve token accounting for logic analysis LLM calls.
+
+    Returns:
+        Dict containing call count, prompt/completion/cached token totals,
+        and per-call averages of prompt tokens, cached tokens and latency
+    """
+    return logic_chain_service.usage.stats()
+
+@router.get("/logic-fast-path")
+async def get_logic_fast_path_stats() -> Dict:
+    """
+    Retrieve hit-rate counters for the rule-based logic fast path.
+
+    Returns:
+        Dict containing:
+            - enabled: Whether the fast path is enabled
+            - stats: Attempts, hits, hit rate and hits per argument form
+    """
+    fast_path = logic_chain_service.fast_path
+    return {
+        "enabled": fast_path is not None,
+        "stats": fast_path.stats() if fast_path is not None else {}
+    }
+
+@router.get("/conversations")
+async def get_conversation_store_stats() -> Dict:
+    """
+    Retrieve occupancy and eviction counters for agent-training conversations.
+
+    Returns:
+        Dict containing:
+            - backend: The storage backend in use
+            - stats: Conversations and bytes held, the configured bounds, and
+              hit, eviction, expiry, spill and rehydration counters (empty for
+              backends that keep conversations on disk)
+    """
+    return {
+        "backend": settings.STORAGE_BACKEND,
+        "stats": conversation_store.stats()
+    }
@@ -0,0 +1,75 @@
+"""
+Round pagination and field projection shared by the history endpoints.
+
+Rounds are paged by round_index: a page holds the rounds after since_round,
+at most limit of them, and next_cursor is the since_round of the next page
+(None on the last one). Stores only read the requested range.
+"""
+
+from typing import Any, FrozenSet, List, Optional, Tuple
+from fastapi import Query
+
+MAX_PAGE_SIZE = 1000
+
+# Shorthands accepted by the exclude parameter
+FIELD_GROUPS = {
+    "explanations": ("valid_explanation", "sound_explanation"),
+}
+
+SINCE_ROUND = Query(None, ge=0, description="Return only rounds with a greater round_index (the previous next_cursor)")
+LIMIT = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of rounds to return (default: all)")
+EXCLUDE = Query(
+    None,
+    description="Comma-separated fields to omit from each round, e.g. explanations,timings,converted_logical_expression"
+)
+
+
+def fetch_limit(limit: Optional[int]) -> Optional[int]:
+    """Rounds to read from the store: one more than the page, to detect a next page."""
+    return None if limit is None else limit + 1
+
+
+def split_page(rounds: List[Any], limit: Optional[int], round_index) -> Tuple[List[Any], Optional[int]]:
+    """
+    Cut rounds read with fetch_limit down to one page.
+
+    Args:
+        rounds: Rounds in round_index order
+        limit: The requested page size, or None for all
+        round_index: Function returning a round's round_index
+
+    Returns:
+        (page, next_cursor)
+    """
+    if limit is None or len(rounds) <= limit:
+        return rounds, None
+    page = rounds[:limit]
+    return page, round_index(page[-1])
+
+
+def parse_exclude(exclude: Optional[str]) -> FrozenSet[str]:
+    """Expand the exclude parameter into the set of keys to drop."""
+    fields = set()
+    for name in (exclude or "").split(","):
+        name = name.strip()
+        if name:
+            fields.update(FIELD_GROUPS.get(name, (name,)))
+    # round_index is what the cursor is built from
+    fields.discard("round_index")
+    return frozenset(fields)
+
+
+def project(value: Any, excluded: FrozenSet[str]) -> Any:
+    """
+    Copy a round view without the excluded keys, at any depth.
+
+    Stored rounds are never modified; with nothing excluded the value is
+    returned as is.
+    """
+    if not excluded:
+        return value
+    if isinstance(value, dict):
+        return {key: project(item, excluded) for key, item in value.items() if key not in excluded}
+    if isinstance(value, list):
+        return [project(item, excluded) for item in value]
+    return value
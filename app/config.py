@@ -10,7 +10,49 @@ class Settings(BaseSettings):
 
     # OpenAI Configuration
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY: float = 30.0
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_READ_TIMEOUT: float = 60.0
+    OPENAI_MAX_RETRIES: int = 2
     
+    # Logic Analysis Cache Configuration
+    LOGIC_CACHE_ENABLED: bool = True
+    LOGIC_CACHE_MAX_ENTRIES: int = 1024
+    LOGIC_CACHE_TTL_SECONDS: float = 86400.0
+    LOGIC_CACHE_PATH: Optional[str] = None
+
+    # Storage Configuration ("json" or "sqlite")
+    STORAGE_BACKEND: str = "json"
+    STORAGE_SQLITE_PATH: str = "debate_ai.db"
+
+    # Debate Persistence Configuration (snapshot plus append-only journal)
+    DEBATE_DATA_PATH: str = "debate_data.json"
+    DEBATE_JOURNAL_PATH: Optional[str] = None  # Defaults to DEBATE_DATA_PATH + ".journal"
+    DEBATE_JOURNAL_COMPACT_MIN_BYTES: int = 4 * 1024 * 1024
+    DEBATE_JOURNAL_COMPACT_RATIO: float = 1.0
+    DEBATE_DURABILITY: str = "batch"  # always, batch or fsync; see app/storage/writer.py
+    DEBATE_FLUSH_INTERVAL_MS: float = 50.0
+    DEBATE_FLUSH_MAX_EVENTS: int = 256
+    STORAGE_FLUSH_TIMEOUT_SECONDS: float = 5.0
+    DEBATE_CACHE_MAX_DEBATES: int = 256  # Debates kept loaded in memory
+
+    # Agent-training conversations (json backend; 0 disables a bound)
+    CONVERSATION_TTL_SECONDS: float = 7200.0  # Idle time before a conversation is dropped
+    CONVERSATION_MAX_ENTRIES: int = 1000
+    CONVERSATION_MAX_BYTES: int = 64 * 1024 * 1024
+    CONVERSATION_SPILL_PATH: Optional[str] = None  # Evicted conversations are dropped when unset
+
+    # Rule-based fast path for simple argument shapes
+    LOGIC_FAST_PATH_ENABLED: bool = True
+
+    # Batch Logic Analysis Configuration
+    LOGIC_BATCH_MAX_SENTENCES: int = 10
+    LOGIC_BATCH_MAX_CHARS: int = 4000
+    LOGIC_BATCH_CONCURRENCY: int = 4
+
     # ElevenLabs Configuration
     ELEVENLABS_API_KEY: str
     
@@ -21,6 +63,29 @@ class Settings(BaseSettings):
     # Google Cloud Configuration
     GOOGLE_APPLICATION_CREDENTIALS: str
     
+    # Provider Backends ("fake" selects the offline stand-ins in services/fakes.py)
+    LLM_BACKEND: str = "openai"
+    LOGIC_BACKEND: str = "openai"
+    STT_BACKEND: str = "google"
+    TTS_BACKEND: str = "elevenlabs"
+
+    # Fake Provider Configuration (latency in milliseconds, error rate in [0, 1])
+    FAKE_LATENCY_DISTRIBUTION: str = "lognormal"
+    FAKE_LATENCY_SCALE: float = 1.0
+    FAKE_SEED: Optional[int] = None
+    FAKE_LLM_LATENCY_MS: float = 1200.0
+    FAKE_LLM_LATENCY_JITTER_MS: float = 400.0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LOGIC_LATENCY_MS: float = 2500.0
+    FAKE_LOGIC_LATENCY_JITTER_MS: float = 800.0
+    FAKE_LOGIC_ERROR_RATE: float = 0.0
+    FAKE_STT_LATENCY_MS: float = 900.0
+    FAKE_STT_LATENCY_JITTER_MS: float = 300.0
+    FAKE_STT_ERROR_RATE: float = 0.0
+    FAKE_TTS_LATENCY_MS: float = 700.0
+    FAKE_TTS_LATENCY_JITTER_MS: float = 200.0
+    FAKE_TTS_ERROR_RATE: float = 0.0
+
     # Logging Configuration
     LOG_LEVEL: str
     LOG_FILE: str
@@ -28,10 +93,24 @@ class Settings(BaseSettings):
     # STT Configuration
     STT_LANGUAGE: str
     STT_SAMPLE_RATE: int
+    # Uploads at least this large are transcribed from a temporary file (0: always in memory)
+    STT_TEMP_FILE_MIN_BYTES: int = 0
+    # WAV uploads are downmixed and downsampled to at most this rate (0: keep the recorded rate)
+    STT_TARGET_SAMPLE_RATE: int = 16000
+    # Silence is cut from uploads before recognition; clips with no frame above the threshold are rejected
+    STT_VAD_ENABLED: bool = True
+    STT_VAD_THRESHOLD_DB: float = -45.0
+    STT_VAD_PADDING_MS: int = 200
+    STT_VAD_MAX_PAUSE_MS: int = 600
+    # Longer audio uses long-running recognition; streamed audio is sent in chunks of at most this size
+    STT_LONG_RUNNING_MIN_SECONDS: float = 60.0
+    STT_LONG_RUNNING_TIMEOUT_SECONDS: float = 600.0
+    STT_STREAM_CHUNK_BYTES: int = 16000
 
     # TTS Configuration
     TTS_VOICE_ID: str
     TTS_MODEL_ID: str
+    TTS_MIN_SENTENCE_CHARS: int = 20
     
     class Config:
         env_file = ".env"
@@ -1,13 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from dotenv import load_dotenv
+import logging
 import os
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Debate AI Platform")
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Not at import, which the reloader's parent process also runs
+    debate_store.open()
+    yield
+    # Release pooled OpenAI connections
+    await close_openai_client()
+    # Flush and close persistent storage
+    if not await debate_store.flush(timeout=settings.STORAGE_FLUSH_TIMEOUT_SECONDS):
+        logger.warning("Timed out flushing debate storage; unwritten rounds are lost")
+    debate_store.close()
+    conversation_store.close()
+
+app = FastAPI(title="Debate AI Platform", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -16,17 +33,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the validators the polling endpoints send
+    expose_headers=["ETag", "Last-Modified"],
 )
 
 # Import routers
 from app.api.agent_training import router as agent_training_router
 from app.api.debate import router as debate_router
+from app.api.live import router as live_router
 from app.api.tutorial import router as tutorial_router
+from app.api.metrics import router as metrics_router
+from app.config import settings
+from app.storage import conversation_store, debate_store
+from app.services.openai_client import close_openai_client
 
 # Include routers
 app.include_router(agent_training_router, prefix="/agent-training", tags=["agent-training"])
+app.include_router(live_router, prefix="/agent-training", tags=["agent-training"])
 app.include_router(debate_router, prefix="/debate", tags=["debate"])
 app.include_router(tutorial_router, prefix="/tutorial", tags=["tutorial"])
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,175 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from .schemas import LogicChain
+
+
+class LogicChainRecord:
+    """
+    Stored form of a LogicChain.
+
+    Holds references to the analysis's own strings in fixed slots, which
+    costs a fraction of a LogicChain instance or of a nested dict copy.
+    """
+
+    __slots__ = (
+        "logic_expression",
+        "converted_logical_expression",
+        "valid",
+        "valid_explanation",
+        "sound",
+        "sound_explanation",
+        "source"
+    )
+
+    def __init__(
+        self,
+        logic_expression: str,
+        converted_logical_expression: Tuple[str, ...],
+        valid: bool,
+        valid_explanation: Optional[str],
+        sound: bool,
+        sound_explanation: Optional[str],
+        source: str = "llm"
+    ):
+        self.logic_expression = logic_expression
+        self.converted_logical_expression = converted_logical_expression
+        self.valid = valid
+        self.valid_explanation = valid_explanation
+        self.sound = sound
+        self.sound_explanation = sound_explanation
+        self.source = source
+
+    @classmethod
+    def from_logic_chain(cls, chain: LogicChain) -> "LogicChainRecord":
+        performance = chain.performance
+        return cls(
+            chain.logic_expression,
+            tuple(chain.converted_logical_expression),
+            performance.valid,
+            performance.valid_explanation,
+            performance.sound,
+            performance.sound_explanation,
+            chain.source
+        )
+
+    @classmethod
+    def from_dict(cls, chain: Dict[str, Any]) -> "LogicChainRecord":
+        performance = chain["performance"]
+        return cls(
+            chain["logic_expression"],
+            tuple(chain["converted_logical_expression"]),
+            performance["valid"],
+            performance["valid_explanation"],
+            performance["sound"],
+            performance["sound_explanation"],
+            chain.get("source", "llm")
+        )
+
+    def performance(self) -> Dict[str, Any]:
+        return {
+            "valid": self.valid,
+            "valid_explanation": self.valid_explanation,
+            "sound": self.sound,
+            "sound_explanation": self.sound_explanation
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The logic_chain dict of API responses."""
+        return {
+            "logic_expression": self.logic_expression,
+            "converted_logical_expression": list(self.converted_logical_expression),
+            "performance": self.performance(),
+            "source": self.source
+        }
+
+
+class ConversationRound:
+    """
+    One agent-training round: the user's argument, the AI's rebuttal and
+    their analyses, stored once.
+
+    Every API shape of a round (response, history entry, logic-chain entry)
+    is built from the record when it is requested, not kept alongside it.
+    round_index is assigned by the store.
+    """
+
+    __slots__ = (
+        "round_index",
+        "user_text",
+        "user_chain",
+        "ai_text",
+        "audio_url",
+        "ai_chain",
+        "timings",
+        "timestamp"
+    )
+
+    def __init__(
+        self,
+        user_text: str,
+        user_chain: LogicChainRecord,
+        ai_text: str,
+        audio_url: Optional[str],
+        ai_chain: LogicChainRecord,
+        timings: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[datetime] = None,
+        round_index: int = -1
+    ):
+        self.round_index = round_index
+        self.user_text = user_text
+        self.user_chain = user_chain
+        self.ai_text = ai_text
+        self.audio_url = audio_url
+        self.ai_chain = ai_chain
+        self.timings = timings
+        self.timestamp = timestamp or datetime.utcnow()
+
+    @classmethod
+    def from_dict(cls, round_data: Dict[str, Any]) -> "ConversationRound":
+        """Rebuild a record from its to_dict form, e.g. after a JSON round trip."""
+        timestamp = round_data["timestamp"]
+        return cls(
+            round_data["user"]["text"],
+            LogicChainRecord.from_dict(round_data["user"]["logic_chain"]),
+            round_data["ai"]["text"],
+            round_data["ai"]["audio_url"],
+            LogicChainRecord.from_dict(round_data["ai"]["logic_chain"]),
+            round_data.get("timings"),
+            datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp,
+            round_data.get("round_index", -1)
+        )
+
+    def user_response(self) -> Dict[str, Any]:
+        return {"text": self.user_text, "logic_chain": self.user_chain.to_dict()}
+
+    def ai_response(self) -> Dict[str, Any]:
+        return {"text": self.ai_text, "audio_url": self.audio_url, "logic_chain": self.ai_chain.to_dict()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The history entry of a round."""
+        return {
+            "round_index": self.round_index,
+            "user": self.user_response(),
+            "ai": self.ai_response(),
+            "timings": self.timings,
+            "timestamp": self.timestamp
+        }
+
+    def chain_view(self) -> Dict[str, Any]:
+        """The logic-chain entry of a round."""
+        return {
+            "round_index": self.round_index,
+            "user_chain": {
+                "text": self.user_text,
+                "logic_expression": self.user_chain.logic_expression,
+                "converted_logical_expression": list(self.user_chain.converted_logical_expression),
+                "performance": self.user_chain.performance()
+            },
+            "ai_chain": {
+                "text": self.ai_text,
+                "logic_expression": self.ai_chain.logic_expression,
+                "converted_logical_expression": list(self.ai_chain.converted_logical_expression),
+                "performance": self.ai_chain.performance()
+            },
+            "timestamp": self.timestamp
+        }
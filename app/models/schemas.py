@@ -17,6 +17,13 @@ class LogicChain(BaseModel):
     logic_expression: str = Field(description="The logical expression of the argument")
     converted_logical_expression: List[str] = Field(description="The converted logical expression tokens")
     performance: LogicalPerformance = Field(description="Analysis of logical validity and soundness")
+    source: Literal["llm", "cache", "fast_path"] = Field(default="llm", description="Which path produced the analysis")
+
+class BatchAnalysisItem(BaseModel):
+    index: int = Field(description="Position of the sentence in the request")
+    sentence: str = Field(description="The analyzed sentence")
+    logic_chain: Optional[LogicChain] = Field(default=None, description="The analysis, if it succeeded")
+    error: Optional[str] = Field(default=None, description="Why the analysis failed, if it did")
 
 # Tutorial Models
 class TutorialQuestion(BaseModel):
@@ -48,7 +55,7 @@ class DebateResponse(BaseModel):
 
 # Agent Training Models
 class AgentTrainingStartRequest(BaseModel):
-    topic_id: str
+    topic_id: int
     user_side: Side
 
 class AgentTrainingRoundRequest(BaseModel):
@@ -61,8 +68,9 @@ class AgentTrainingResponse(BaseModel):
 
 class AgentTrainingHistoryResponse(BaseModel):
     conversation_id: str
-    topic_id: str
+    topic_id: int
     rounds: List[Dict]
+    next_cursor: Optional[int] = Field(default=None, description="since_round for the next page, if there is one")
 
 # Topic Models
 class DebateTopic(BaseModel):
@@ -0,0 +1,298 @@
+"""
+WAV parsing and preparation of uploads for speech recognition.
+
+Uploads arrive at whatever rate, channel count and sample width the
+recorder chose. The header is read in place with memoryview slicing, and
+the samples are converted with NumPy to what the recogniser does best
+with: mono LINEAR16 at no more than STT_TARGET_SAMPLE_RATE. Downmixing and
+downsampling also shrink the request, often several times over.
+"""
+
+import struct
+from functools import lru_cache
+from math import gcd
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple, Union
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Writers that stream a WAV leave the data size unset
+_UNKNOWN_SIZES = (0, 0xFFFFFFFF)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class WavInfo(NamedTuple):
+    """The format of a WAV file and a view of its sample data."""
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    audio_format: int
+    data: memoryview
+
+    @property
+    def block_align(self) -> int:
+        return self.channels * self.bits_per_sample // 8
+
+    @property
+    def frames(self) -> int:
+        return len(self.data) // self.block_align
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frames / self.sample_rate
+
+    @property
+    def is_linear16(self) -> bool:
+        return self.audio_format == WAVE_FORMAT_PCM and self.bits_per_sample == 16
+
+
+def parse_wav(buffer: Buffer) -> Optional[WavInfo]:
+    """
+    Read a RIFF/WAVE header without copying the samples.
+
+    Args:
+        buffer: The file's bytes, or at least its beginning
+
+    Returns:
+        The format and a view of the data chunk, cut short if the buffer
+        is, or None if the buffer is not a WAV file
+
+    Raises:
+        ValueError: If the WAV is malformed or its encoding is not PCM or
+            IEEE float
+    """
+    view = memoryview(buffer)
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = view[offset:offset + 4]
+        size = struct.unpack_from("<I", view, offset + 4)[0]
+        body_start = offset + 8
+        if chunk_id == b"fmt ":
+            if size < 16 or body_start + 16 > len(view):
+                raise ValueError("Malformed WAV fmt chunk")
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", view, body_start)
+            if audio_format == WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                # The sub-format GUID starts with the actual format code
+                audio_format = struct.unpack_from("<H", view, body_start + 24)[0]
+            fmt = (audio_format, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes the fmt chunk")
+            audio_format, channels, sample_rate, bits = fmt
+            if audio_format not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+                raise ValueError(f"Unsupported WAV encoding: 0x{audio_format:04x}")
+            if not channels or not sample_rate or bits not in _SAMPLE_TYPES.get(audio_format, {}):
+                raise ValueError(f"Unsupported WAV format: {channels} channels, {sample_rate} Hz, {bits}-bit")
+            end = len(view) if size in _UNKNOWN_SIZES else min(body_start + size, len(view))
+            return WavInfo(sample_rate, channels, bits, audio_format, view[body_start:end])
+        # Chunks are padded to an even length
+        offset = body_start + size + (size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+# Sample widths per format: (little-endian dtype, scale to [-1, 1]); 8-bit PCM is unsigned
+_SAMPLE_TYPES = {
+    WAVE_FORMAT_PCM: {8: ("u1", 128.0), 16: ("<i2", 32768.0), 24: (None, 8388608.0), 32: ("<i4", 2147483648.0)},
+    WAVE_FORMAT_IEEE_FLOAT: {32: ("<f4", 1.0), 64: ("<f8", 1.0)},
+}
+
+
+def samples(info: WavInfo) -> np.ndarray:
+    """The samples as float32 in [-1, 1], shaped (frames, channels)."""
+    data = info.data[:info.frames * info.block_align]
+    dtype, scale = _SAMPLE_TYPES[info.audio_format][info.bits_per_sample]
+    if info.bits_per_sample == 24:
+        # Assemble little-endian triplets, sign-extending through the top byte
+        triplets = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2].astype(np.int8).astype(np.int32) << 16)
+    else:
+        values = np.frombuffer(data, dtype=dtype)
+    values = values.astype(np.float32)
+    if info.bits_per_sample == 8:
+        values -= 128.0
+    if scale != 1.0:
+        values /= scale
+    return values.reshape(-1, info.channels)
+
+
+# Resampling filter: a Kaiser-windowed sinc spanning this many zero
+# crossings either side, cut off just below the lower Nyquist frequency
+RESAMPLE_ZERO_CROSSINGS = 8
+RESAMPLE_KAISER_BETA = 6.0
+RESAMPLE_ROLLOFF = 0.9
+# Output frames computed per block, which bounds the working memory
+RESAMPLE_BLOCK_FRAMES = 16384
+
+
+@lru_cache(maxsize=16)
+def _filter_bank(up: int, down: int) -> Tuple[np.ndarray, int]:
+    """
+    Polyphase filter for resampling by up/down.
+
+    Returns:
+        (bank, half_width): row p holds the taps for an output frame p/up of
+        an input frame past its base frame, applied to the input frames
+        base - half_width + 1 through base + half_width
+    """
+    cutoff = RESAMPLE_ROLLOFF * min(1.0, up / down)
+    half_width = int(np.ceil(RESAMPLE_ZERO_CROSSINGS / cutoff))
+    offsets = np.arange(-half_width + 1, half_width + 1)
+    distance = np.arange(up)[:, None] / up - offsets[None, :]
+    window = np.i0(RESAMPLE_KAISER_BETA * np.sqrt(np.clip(1 - (distance / half_width) ** 2, 0, None)))
+    bank = cutoff * np.sinc(cutoff * distance) * window / np.i0(RESAMPLE_KAISER_BETA)
+    return bank.astype(np.float32), half_width
+
+
+def resample(
+    read: Callable[[int, int], np.ndarray],
+    frames: int,
+    from_rate: int,
+    to_rate: int
+) -> Iterator[np.ndarray]:
+    """
+    Resample a mono signal block by block with a polyphase windowed-sinc filter.
+
+    Args:
+        read: Returns input frames [start, stop) as a mono float32 array,
+            so the input is never converted as a whole
+        frames: Length of the input
+
+    Yields:
+        Consecutive blocks of the resampled signal; memory use depends on
+        the block size and the filter, not on the length of the input
+    """
+    if from_rate == to_rate:
+        for start in range(0, frames, RESAMPLE_BLOCK_FRAMES):
+            yield read(start, min(start + RESAMPLE_BLOCK_FRAMES, frames))
+        return
+    if frames == 0:
+        return
+    divisor = gcd(from_rate, to_rate)
+    up, down = to_rate // divisor, from_rate // divisor
+    bank, half_width = _filter_bank(up, down)
+    taps = np.arange(2 * half_width)
+    length = max(int(round(frames * to_rate / from_rate)), 1)
+    for first in range(0, length, RESAMPLE_BLOCK_FRAMES):
+        positions = np.arange(first, min(first + RESAMPLE_BLOCK_FRAMES, length), dtype=np.int64) * down
+        base, phase = positions // up, positions % up
+        # The input frames this block's filters reach, zero beyond the ends
+        start, stop = int(base[0]) - half_width + 1, int(base[-1]) + half_width + 1
+        block = read(max(start, 0), min(stop, frames))
+        block = np.pad(block, (max(-start, 0), stop - start - max(-start, 0) - len(block)))
+        yield np.einsum("ij,ij->i", block[(base - base[0])[:, None] + taps], bank[phase])
+
+
+def to_linear16(signal: np.ndarray) -> bytes:
+    return np.clip(np.round(signal * 32767.0), -32768, 32767).astype("<i2").tobytes()
+
+
+def prepare_for_recognition(content: Buffer, max_sample_rate: int) -> Tuple[bytes, Optional[int]]:
+    """
+    Convert a WAV upload to mono LINEAR16 without its header.
+
+    Audio above max_sample_rate is downsampled to it; lower rates are kept,
+    as upsampling adds nothing for the recogniser. A max_sample_rate of 0
+    keeps the original rate.
+
+    Returns:
+        (audio, sample_rate); anything but a WAV file is returned as is
+        with a sample_rate of None, to be sent with the configured rate
+
+    Raises:
+        ValueError: If the WAV is malformed or unsupported
+    """
+    info = parse_wav(content)
+    if info is None:
+        return bytes(content), None
+    rate = min(info.sample_rate, max_sample_rate) if max_sample_rate else info.sample_rate
+    if info.is_linear16 and info.channels == 1 and rate == info.sample_rate:
+        # Already what the recogniser wants; only the header goes
+        return info.data[:info.frames * info.block_align].tobytes(), rate
+
+    def read(start: int, stop: int) -> np.ndarray:
+        block = info._replace(data=info.data[start * info.block_align:stop * info.block_align])
+        return samples(block).mean(axis=1)
+
+    blocks = resample(read, info.frames, info.sample_rate, rate)
+    return b"".join(to_linear16(block) for block in blocks), rate
+
+
+# Voice activity is judged per frame of this length
+VAD_FRAME_MS = 20
+# Unvoiced consonants (s, f, th) are quiet but noisy: frames up to this far
+# below the energy threshold still count as speech when their zero-crossing
+# rate is at least VAD_ZCR_THRESHOLD
+VAD_ZCR_MARGIN_DB = 10.0
+VAD_ZCR_THRESHOLD = 0.25
+
+
+def speech_frames(signal: np.ndarray, frame_length: int, threshold_db: float) -> np.ndarray:
+    """
+    Which frames of a mono signal in [-1, 1] hold speech.
+
+    Frames are judged by their energy in dBFS and their zero-crossing rate;
+    the last frame may be short.
+    """
+    starts = np.arange(0, len(signal), frame_length)
+    counts = np.diff(np.append(starts, len(signal)))
+    energy_db = 10 * np.log10(np.add.reduceat(signal * signal, starts) / counts + 1e-12)
+    crossings = np.append(np.signbit(signal[1:]) != np.signbit(signal[:-1]), False)
+    zcr = np.add.reduceat(crossings, starts) / counts
+    return (energy_db >= threshold_db) | (
+        (energy_db >= threshold_db - VAD_ZCR_MARGIN_DB) & (zcr >= VAD_ZCR_THRESHOLD)
+    )
+
+
+def trim_silence(
+    content: Buffer,
+    sample_rate: int,
+    threshold_db: float,
+    padding_ms: int,
+    max_pause_ms: int
+) -> bytes:
+    """
+    Cut the silence out of mono LINEAR16 audio.
+
+    Leading and trailing silence is trimmed to padding_ms, so the edges of
+    the first and last words survive, and pauses between words longer than
+    max_pause_ms are shortened to it.
+
+    Returns:
+        The trimmed audio, content itself if nothing was cut, or b"" if
+        no frame holds speech
+    """
+    values = np.frombuffer(content, dtype="<i2", count=len(content) // 2)
+    if len(values) == 0:
+        return b""
+    frame_length = max(sample_rate * VAD_FRAME_MS // 1000, 1)
+    speech = speech_frames(values / 32768.0, frame_length, threshold_db)
+    if not speech.any():
+        return b""
+
+    # Frames since the last speech frame and until the next one
+    index = np.arange(len(speech))
+    previous = np.maximum.accumulate(np.where(speech, index, -1))
+    following = np.minimum.accumulate(np.where(speech, index, len(speech))[::-1])[::-1]
+    since = index - previous
+    until = following - index
+    leading = previous < 0
+    trailing = following == len(speech)
+    inside = ~leading & ~trailing
+
+    padding = padding_ms // VAD_FRAME_MS
+    max_pause = max_pause_ms // VAD_FRAME_MS
+    keep = speech | (leading & (until <= padding)) | (trailing & (since <= padding))
+    # Long pauses keep their first and last half of max_pause
+    keep |= inside & ((since + until - 1 <= max_pause) | (since <= (max_pause + 1) // 2) | (until <= max_pause // 2))
+    if keep.all():
+        return bytes(content)
+
+    counts = np.minimum(frame_length, len(values) - index * frame_length)
+    return values[np.repeat(keep, counts)].tobytes()
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_sentence(sentence: str) -> str:
+    """
+    Normalise a sentence so trivially different spellings share a cache entry:
+    Unicode NFKC, lowercase and collapsed whitespace.
+    """
+    return " ".join(unicodedata.normalize("NFKC", sentence).lower().split())
+
+
+def make_cache_key(sentence: str, context_expressions: Optional[Iterable[str]], version: str) -> str:
+    """
+    Build a content-addressed key from the normalised sentence, the prior
+    context expressions and the prompt/model version.
+    """
+    context = [" ".join(expr.split()) for expr in (context_expressions or [])]
+    payload = json.dumps(
+        [version, normalize_sentence(sentence), context],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier result cache.
+
+    The memory tier is an LRU bounded by entry count with a per-entry TTL. The
+    optional disk tier is an SQLite file that survives restarts; disk hits are
+    promoted back into memory. Async callers use get_async and set_async, which
+    run the disk tier's queries on a worker thread.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400.0, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Guards the memory tier and counters; the disk tier has its own lock so
+        # a slow query on a worker thread never holds up memory hits on the loop
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+            logger.info(f"Result cache disk tier opened at {disk_path}")
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached value, checking memory first and then disk.
+
+        Returns:
+            The cached value, or None on a miss or an expired entry
+        """
+        now = time.time()
+        value = self._get_from_memory(key, now)
+        if value is None and self._db is not None:
+            value = self._get_from_disk(key, now)
+        if value is None:
+            self._count_miss()
+        return value
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """Like get, but queries the disk tier on a worker thread, off the event loop."""
+        now = time.time()
+        value = self._get_from_memory(key, now)
+        if value is None and self._db is not None:
+            value = await asyncio.to_thread(self._get_from_disk, key, now)
+        if value is None:
+            self._count_miss()
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """
+        Store a JSON-serialisable value in every enabled tier.
+        """
+        created = time.time()
+        with self._lock:
+            self._store_in_memory(key, created, value)
+        if self._db is not None:
+            self._set_on_disk(key, created, value)
+
+    async def set_async(self, key: str, value: Dict[str, Any]):
+        """Like set, but writes the disk tier on a worker thread, off the event loop."""
+        created = time.time()
+        with self._lock:
+            self._store_in_memory(key, created, value)
+        if self._db is not None:
+            await asyncio.to_thread(self._set_on_disk, key, created, value)
+
+    def _get_from_memory(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, value = entry
+            if self._expired(created, now):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _get_from_disk(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self._db.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1], now):
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+        value = json.loads(row[0])
+        with self._lock:
+            self._store_in_memory(key, row[1], value)
+            self.hits += 1
+            self.disk_hits += 1
+        return value
+
+    def _set_on_disk(self, key: str, created: float, value: Dict[str, Any]):
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), created)
+            )
+            self._db.commit()
+
+    def _count_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def _store_in_memory(self, key: str, created: float, value: Dict[str, Any]):
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry from both tiers and reset the counters."""
+        with self._lock, self._db_lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "disk_enabled": self._db is not None
+        }
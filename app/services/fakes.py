@@ -0,0 +1,345 @@
+"""
+Offline stand-ins for the external providers.
+
+Each fake mimics the slice of the provider SDK that the services use
+(AsyncOpenAI chat completions, Google SpeechClient, ElevenLabs text_to_speech),
+so the real service code runs unchanged against it. Latency and failures are
+injected from Settings, which makes the whole app usable for tests, load tests
+and benchmarks on a laptop without credentials.
+"""
+
+import asyncio
+import random
+import re
+import time
+import uuid
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from google.cloud import speech
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from ..config import settings
+
+
+class FakeProviderError(Exception):
+    """Raised by a fake provider when an error is injected."""
+
+
+class FaultInjector:
+    """
+    Samples per-call latency from a distribution and injects random errors.
+
+    Distributions:
+        - fixed: always mean_ms
+        - uniform: mean_ms ± jitter_ms
+        - normal: gaussian around mean_ms with jitter_ms standard deviation
+        - lognormal: right-skewed with median mean_ms, like real API latency
+    """
+
+    def __init__(
+        self,
+        name: str,
+        mean_ms: float,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        distribution: str = "fixed",
+        scale: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        if distribution not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.name = name
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.distribution = distribution
+        self.scale = scale
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    @classmethod
+    def from_settings(cls, name: str) -> "FaultInjector":
+        """Build the injector for one provider (LLM, LOGIC, STT or TTS) from Settings."""
+        return cls(
+            name=name,
+            mean_ms=getattr(settings, f"FAKE_{name}_LATENCY_MS"),
+            jitter_ms=getattr(settings, f"FAKE_{name}_LATENCY_JITTER_MS"),
+            error_rate=getattr(settings, f"FAKE_{name}_ERROR_RATE"),
+            distribution=settings.FAKE_LATENCY_DISTRIBUTION,
+            scale=settings.FAKE_LATENCY_SCALE,
+            seed=settings.FAKE_SEED
+        )
+
+    def sample_seconds(self) -> float:
+        """Draw one latency sample, in seconds."""
+        if self.distribution == "uniform":
+            latency = self.random.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        elif self.distribution == "normal":
+            latency = self.random.gauss(self.mean_ms, self.jitter_ms)
+        elif self.distribution == "lognormal" and self.mean_ms > 0:
+            sigma = self.jitter_ms / self.mean_ms
+            latency = self.mean_ms * self.random.lognormvariate(0.0, sigma)
+        else:
+            latency = self.mean_ms
+        return max(latency, 0.0) * self.scale / 1000
+
+    def _maybe_fail(self):
+        self.calls += 1
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            raise FakeProviderError(f"Injected {self.name} provider error")
+
+    async def delay(self):
+        """Wait for one latency sample (non-blocking) and maybe raise."""
+        await asyncio.sleep(self.sample_seconds())
+        self._maybe_fail()
+
+    def delay_sync(self):
+        """Wait for one latency sample (blocking, for synchronous SDKs) and maybe raise."""
+        time.sleep(self.sample_seconds())
+        self._maybe_fail()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "errors": self.errors}
+
+
+def _pick(options: List[str], text: str) -> str:
+    """Choose a canned option deterministically from the input text."""
+    return options[zlib.crc32(text.encode("utf-8")) % len(options)]
+
+
+CANNED_REBUTTALS = [
+    "While {point} sounds appealing, the costs fall hardest on those least able to pay.",
+    "While {point} has merit, the evidence shows slower change produces more lasting results.",
+    "While {point} is a fair concern, stronger institutions matter more than new rules.",
+    "While {point} may be true, it ignores the trade-offs faced by developing nations.",
+]
+
+CANNED_TRANSCRIPTS = [
+    "If renewable energy is adopted immediately, then carbon emissions will fall.",
+    "Strict AI ethics protect human rights, so they are necessary.",
+    "If healthcare is universal, then everyone can afford treatment.",
+    "Progressive taxation reduces inequality and funds public services.",
+]
+
+_CONDITIONAL = re.compile(r"^if\s+(?P<antecedent>.+?),?\s+then\s+(?P<consequent>.+)$", re.IGNORECASE)
+
+
+def template_logical_expression(sentence: str) -> str:
+    """
+    Produce a plausible logical expression for a sentence using simple
+    connective substitution ("if ... then", "and", "or", "not").
+    """
+    text = sentence.strip().rstrip(".!?")
+    match = _CONDITIONAL.match(text)
+    if match:
+        text = f"{match.group('antecedent')} → {match.group('consequent')}"
+    text = re.sub(r"\s+and\s+", " ∧ ", text, flags=re.IGNORECASE)
+    text = re.sub(r"\s+or\s+", " ∨ ", text, flags=re.IGNORECASE)
+    text = re.sub(r"\bnot\s+", "~ ", text, flags=re.IGNORECASE)
+    return text
+
+
+def template_logic_analysis(sentence: str) -> str:
+    """
+    Produce an analysis in the "Logical Expression / Performances" format that
+    parse_llm_output expects.
+    """
+    sound = zlib.crc32(sentence.encode("utf-8")) % 2 == 0
+    return (
+        "Logical Expression:\n"
+        f"{template_logical_expression(sentence)}\n"
+        "\n"
+        "Performances:\n"
+        "Valid: True\n"
+        "Valid Explanation:\n"
+        f"Sound: {sound}\n"
+        f"Sound Explanation: {'' if sound else 'The premises are not necessarily true.'}\n"
+    )
+
+
+class _FakeChatCompletions:
+    def __init__(self, faults: FaultInjector):
+        self.faults = faults
+        self._cached_prefixes = set()  # Simulated provider-side prompt prefix cache
+
+    async def create(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs):
+        """Mimic AsyncOpenAI chat.completions.create for the prompts this app sends."""
+        prompt = "\n".join(message["content"] for message in messages)
+        user_text = messages[-1]["content"]
+        batch = re.findall(r'^Sentence (\d+): "(.*)"$', user_text, re.MULTILINE)
+        if batch:
+            content = "\n".join(
+                f"### Sentence {number}\n{template_logic_analysis(sentence)}" for number, sentence in batch
+            )
+        elif "Logical Expression" in prompt:
+            # The analysed sentence is the last quoted string of the user message
+            quoted = re.findall(r'"([^"]*)"', user_text)
+            content = template_logic_analysis(quoted[-1] if quoted else user_text)
+        else:
+            point = user_text.strip().rstrip(".!?")
+            point = point[0].lower() + point[1:] if point else "that point"
+            content = _pick(CANNED_REBUTTALS, user_text).format(point=point)
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        # Like OpenAI, serve a repeated leading system message from cache in 128-token blocks
+        cached_tokens = 0
+        if messages[0]["role"] == "system":
+            prefix = messages[0]["content"]
+            if prefix in self._cached_prefixes:
+                cached_tokens = len(prefix) // 4 // 128 * 128
+            self._cached_prefixes.add(prefix)
+        if stream:
+            return self._stream(model, content)
+
+        await self.faults.delay()
+        return ChatCompletion.model_validate({
+            "id": f"chatcmpl-fake-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": {
+                **CompletionUsage(
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    total_tokens=prompt_tokens + completion_tokens
+                ).model_dump(),
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        })
+
+    async def _stream(self, model: str, content: str) -> AsyncIterator[ChatCompletionChunk]:
+        # Spread the sampled latency over time-to-first-token and the token stream
+        total = self.faults.sample_seconds()
+        tokens = re.findall(r"\S+\s*", content)
+        await asyncio.sleep(total / 2)
+        self.faults._maybe_fail()
+        completion_id = f"chatcmpl-fake-{uuid.uuid4().hex}"
+        for token in tokens:
+            yield ChatCompletionChunk.model_validate({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": None, "delta": {"content": token}}]
+            })
+            await asyncio.sleep(total / 2 / max(len(tokens), 1))
+
+
+class _FakeChat:
+    def __init__(self, faults: FaultInjector):
+        self.completions = _FakeChatCompletions(faults)
+
+
+class FakeOpenAIClient:
+    """Offline stand-in for AsyncOpenAI (chat completions only)."""
+
+    def __init__(self, faults: FaultInjector):
+        self.faults = faults
+        self.chat = _FakeChat(faults)
+
+    async def close(self):
+        pass
+
+
+class FakeSpeechClient:
+    """Offline stand-in for google.cloud.speech.SpeechClient."""
+
+    def __init__(self, faults: FaultInjector):
+        self.faults = faults
+
+    def recognize(self, config: speech.RecognitionConfig, audio: speech.RecognitionAudio) -> speech.RecognizeResponse:
+        self.faults.delay_sync()
+        transcript = _pick(CANNED_TRANSCRIPTS, str(zlib.crc32(audio.content)))
+        return speech.RecognizeResponse(results=[
+            speech.SpeechRecognitionResult(alternatives=[
+                speech.SpeechRecognitionAlternative(transcript=transcript, confidence=0.95)
+            ])
+        ])
+
+    def long_running_recognize(self, config: speech.RecognitionConfig, audio: speech.RecognitionAudio) -> "_FakeOperation":
+        return _FakeOperation(lambda: speech.LongRunningRecognizeResponse(
+            results=self.recognize(config=config, audio=audio).results
+        ))
+
+    def streaming_recognize(
+        self,
+        config: speech.StreamingRecognitionConfig,
+        requests: Iterator[speech.StreamingRecognizeRequest]
+    ) -> Iterator[speech.StreamingRecognizeResponse]:
+        """
+        One interim result per request, growing with the audio. A silent
+        (all-zero) request ends the utterance with its final transcript, as
+        Google finalises results at pauses, and so does the end of the stream.
+        """
+        checksum = count = 0
+        for request in requests:
+            if not request.audio_content.strip(b"\x00"):
+                if count:
+                    yield self._final_response(checksum)
+                    checksum = count = 0
+                continue
+            checksum = zlib.crc32(request.audio_content, checksum)
+            count += 1
+            if config.interim_results:
+                words = _pick(CANNED_TRANSCRIPTS, str(checksum)).split()
+                yield speech.StreamingRecognizeResponse(results=[
+                    speech.StreamingRecognitionResult(
+                        alternatives=[speech.SpeechRecognitionAlternative(transcript=" ".join(words[:count]))],
+                        is_final=False,
+                        stability=0.5
+                    )
+                ])
+        if count:
+            yield self._final_response(checksum)
+
+    def _final_response(self, checksum: int) -> speech.StreamingRecognizeResponse:
+        self.faults.delay_sync()
+        # The same transcript recognize gives for the utterance's audio
+        transcript = _pick(CANNED_TRANSCRIPTS, str(checksum))
+        return speech.StreamingRecognizeResponse(results=[
+            speech.StreamingRecognitionResult(
+                alternatives=[speech.SpeechRecognitionAlternative(transcript=transcript, confidence=0.95)],
+                is_final=True
+            )
+        ])
+
+
+class _FakeOperation:
+    """Stand-in for google.api_core.operation.Operation."""
+
+    def __init__(self, run):
+        self._run = run
+
+    def result(self, timeout: Optional[float] = None):
+        return self._run()
+
+
+# One silent MPEG-2 Layer III frame (32 kbps, 22.05 kHz mono), matching mp3_22050_32
+_SILENT_MP3_FRAME = b"\xff\xf3\x40\xc4" + bytes(100)
+
+
+class _FakeTextToSpeech:
+    def __init__(self, faults: FaultInjector):
+        self.faults = faults
+
+    def convert(self, voice_id: str, *, text: str, **kwargs) -> Iterator[bytes]:
+        self.faults.delay_sync()
+        # Roughly 15 characters of speech per 26 ms frame
+        for _ in range(max(len(text) // 15, 1)):
+            yield _SILENT_MP3_FRAME
+
+
+class FakeElevenLabsClient:
+    """Offline stand-in for elevenlabs.client.ElevenLabs (text_to_speech only)."""
+
+    def __init__(self, faults: FaultInjector):
+        self.faults = faults
+        self.text_to_speech = _FakeTextToSpeech(faults)
@@ -1,30 +1,31 @@
-from openai import OpenAI
-from typing import List, Dict
+from openai import AsyncOpenAI
+from typing import AsyncIterator, List, Dict
 from ..config import settings
 from ..models.schemas import Side
+from .fakes import FakeOpenAIClient, FaultInjector
+from .openai_client import get_openai_client
 
 class LLMService:
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        if settings.LLM_BACKEND not in ("openai", "fake"):
+            raise ValueError(f"Unknown LLM backend: {settings.LLM_BACKEND}")
+        # Offline stand-in, used instead of OpenAI when LLM_BACKEND is "fake"
+        self.fake_client = FakeOpenAIClient(FaultInjector.from_settings("LLM")) if settings.LLM_BACKEND == "fake" else None
 
-    async def generate_debate_response(
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The process-wide async OpenAI client (shared connection pool)"""
+        return self.fake_client or get_openai_client()
+
+    def _build_messages(
         self,
         topic: str,
         user_side: Side,
         user_utterance: str,
         conversation_history: List[Dict[str, str]] = None
-    ) -> str:
+    ) -> List[Dict[str, str]]:
         """
-        Generate a debate response using OpenAI's GPT API.
-        
-        Args:
-            topic: The debate topic
-            user_side: The side chosen by the user (supporting/opposing)
-            user_utterance: The user's latest argument
-            conversation_history: Previous exchanges in the debate (optional)
-            
-        Returns:
-            A focused counterargument to one key point from the user's argument
+        Build the chat messages for a debate response.
         """
         # Configure the AI debater with system instructions
         messages = [
@@ -50,10 +51,32 @@ class LLMService:
 
         # Add the user's current argument
         messages.append({"role": "user", "content": user_utterance})
+        return messages
+
+    async def generate_debate_response(
+        self,
+        topic: str,
+        user_side: Side,
+        user_utterance: str,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> str:
+        """
+        Generate a debate response using OpenAI's GPT API.
+        
+        Args:
+            topic: The debate topic
+            user_side: The side chosen by the user (supporting/opposing)
+            user_utterance: The user's latest argument
+            conversation_history: Previous exchanges in the debate (optional)
+            
+        Returns:
+            A focused counterargument to one key point from the user's argument
+        """
+        messages = self._build_messages(topic, user_side, user_utterance, conversation_history)
 
         try:
             # Generate the AI's response
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=messages,
                 temperature=0.7,
@@ -63,6 +86,41 @@ class LLMService:
         except Exception as e:
             raise Exception(f"Error in generating LLM response: {str(e)}")
 
+    async def stream_debate_response(
+        self,
+        topic: str,
+        user_side: Side,
+        user_utterance: str,
+        conversation_history: List[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a debate response from OpenAI's GPT API token by token.
+        
+        Args:
+            topic: The debate topic
+            user_side: The side chosen by the user (supporting/opposing)
+            user_utterance: The user's latest argument
+            conversation_history: Previous exchanges in the debate (optional)
+            
+        Yields:
+            Text fragments of the counterargument as they are generated
+        """
+        messages = self._build_messages(topic, user_side, user_utterance, conversation_history)
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=100,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise Exception(f"Error in streaming LLM response: {str(e)}")
+
 
 # Initialize the LLM service
 llm_service = LLMService() 
\ No newline at end of file
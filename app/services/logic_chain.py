@@ -1,8 +1,27 @@
+import asyncio
+import logging
 import re
-from typing import Dict, Any, List
-from ..models.schemas import LogicChain, LogicalPerformance
+import time
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from ..models.schemas import BatchAnalysisItem, LogicChain, LogicalPerformance
 from ..config import settings
-from openai import OpenAI
+from .cache import ResultCache, make_cache_key
+from .fakes import FakeOpenAIClient, FaultInjector
+from .logic_fastpath import FastPathAnalyzer, FastPathResult
+from .openai_client import get_openai_client
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Model used for logic analysis
+LOGIC_MODEL = "gpt-4o"
+
+# Bump whenever the prompt or output parsing changes so cached analyses are not reused
+PROMPT_VERSION = "2"
+CACHE_VERSION = f"{PROMPT_VERSION}:{LOGIC_MODEL}"
+# Batch analyses come from a different prompt, so they are cached apart from single ones
+BATCH_CACHE_VERSION = f"batch:{CACHE_VERSION}"
 
 
 # Common instructions for the "Logical Expression" and "Performances" sections
@@ -50,14 +69,109 @@ Sound: True
 Sound Explanation:
 """
 
-# Overall prompt template
-PROMPT_TEMPLATE = """You are an AI assistant that analyzes the logical structure of a sentence and identifies logical errors.
-{additional_instructions}
+# Static system prompt. It is identical on every call, so providers that cache
+# prompt prefixes can reuse it; everything that varies goes in the user message.
+SYSTEM_PROMPT = """You are an AI assistant that analyzes the logical structure of sentences and identifies logical errors.
+For every sentence you analyze, provide the following sections:
+""" + COMMON_INSTRUCTIONS
 
-Now, analyze this sentence:
+# Per-call user message for a single sentence
+ANALYSIS_TEMPLATE = """Now, analyze this sentence:
 "{sentence}"
 """
 
+# Per-call user message for several independent sentences
+BATCH_ANALYSIS_TEMPLATE = """Analyze each of the following sentences independently. Start the analysis of each sentence with a line "### Sentence N", where N is the sentence number, followed by its "Logical Expression:" and "Performances:" sections.
+
+{numbered_sentences}
+"""
+
+def _context_section(previous_context_expressions: list = None) -> str:
+    """Render the previous logical expressions that precede the new sentence(s)."""
+    if not previous_context_expressions:
+        return ""
+    previous_context_str = "Previous Logical Expressions:\n"
+    for expr in previous_context_expressions:
+        previous_context_str += f"{expr}\n"
+    return previous_context_str + "\nPlease integrate the previous analysis with the new sentence and analyze it.\n\n"
+
+def build_analysis_messages(sentence: str, previous_context_expressions: list = None) -> List[Dict[str, str]]:
+    """
+    Builds the chat messages for analyzing one sentence.
+    
+    The static instructions form the system message (a stable, cacheable
+    prefix); the context expressions and the sentence come last.
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": _context_section(previous_context_expressions) + ANALYSIS_TEMPLATE.format(sentence=sentence)}
+    ]
+
+def build_batch_messages(sentences: List[str], previous_context_expressions: list = None) -> List[Dict[str, str]]:
+    """
+    Builds the chat messages for analyzing several sentences in one request,
+    sharing the same static prefix as build_analysis_messages.
+    """
+    numbered_sentences = "\n".join(f'Sentence {i + 1}: "{sentence}"' for i, sentence in enumerate(sentences))
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": _context_section(previous_context_expressions) + BATCH_ANALYSIS_TEMPLATE.format(numbered_sentences=numbered_sentences)}
+    ]
+
+# Marks the start of each sentence's analysis in a batch response
+BATCH_SECTION_PATTERN = re.compile(r"^\s*#+\s*Sentence\s+(\d+)\s*:?\s*$", re.MULTILINE)
+
+# Numeric codes for logical operators; operands are coded as OPERAND
+OPERAND = 0
+OPERATOR_CODES = {
+    "∧": 1,  # AND
+    "∨": 2,  # OR
+    "~": 3,  # NOT
+    "～": 3,  # Full-width NOT
+    "→": 4,  # IMPLY
+    "↔": 5,  # IF AND ONLY IF
+    "(": 6,
+    ")": 6
+}
+OPERATOR_TOKENS = {symbol: str(code) for symbol, code in OPERATOR_CODES.items()}
+_CODE_TOKENS = ("",) + tuple(str(code) for code in range(1, 7))
+
+# One operator symbol, or a run of operand text without surrounding whitespace
+_TOKEN_RE = re.compile(r"[∧∨~～→↔()]|[^∧∨~～→↔()\s](?:[^∧∨~～→↔()]*[^∧∨~～→↔()\s])?")
+
+
+class CompactExpression:
+    """
+    Integer-coded form of a converted logical expression.
+
+    codes holds one signed byte per token (OPERAND or an operator code) and
+    operands holds the operand texts in order, so a long history costs one
+    small array per expression instead of a list of strings.
+    """
+
+    __slots__ = ("codes", "operands")
+
+    def __init__(self, codes: array, operands: Tuple[str, ...]):
+        self.codes = codes
+        self.operands = operands
+
+    def to_tokens(self) -> List[str]:
+        """Expand to the list-of-strings form returned by convert_logical_expression."""
+        next_operand = iter(self.operands).__next__
+        return [_CODE_TOKENS[code] if code else next_operand() for code in self.codes]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactExpression):
+            return NotImplemented
+        return self.codes == other.codes and self.operands == other.operands
+
+    def __repr__(self) -> str:
+        return f"CompactExpression(codes={self.codes.tolist()}, operands={self.operands})"
+
+
 def convert_logical_expression(expr: str) -> list:
     """
     Converts a logical expression string into a list of tokens according to the following rules:
@@ -75,31 +189,48 @@ def convert_logical_expression(expr: str) -> list:
     Returns:
         A list of tokens representing the converted logical expression
     """
-    # Define mapping for logical operators to numeric tokens
-    mapping = {
-        "∧": "1",
-        "∨": "2",
-        "~": "3",
-        "→": "4",
-        "↔": "5",
-        "(": "6",
-        ")": "6",
-        "～": "3"  # Handle full-width NOT symbol
-    }
-    # Pattern to match all logical operators
-    pattern = r"(\∧|\∨|~|→|↔|\(|\)|～)"
-    tokens = re.split(pattern, expr)
-    converted_tokens = []
-    for token in tokens:
-        token = token.strip()
-        if not token:
-            continue
-        if token in mapping:
-            converted_tokens.append(mapping[token])
-        else:
-            # Convert non-operator text to lowercase
-            converted_tokens.append(token.lower())
-    return converted_tokens
+    # Operator symbols have no case, so lowering the whole string lowers only the operands
+    get_token = OPERATOR_TOKENS.get
+    return [get_token(token, token) for token in _TOKEN_RE.findall(expr.lower())]
+
+
+def compile_logical_expression(expr: str, operand_table: Optional[Dict[str, str]] = None) -> CompactExpression:
+    """
+    Converts a logical expression string into its integer-coded form.
+
+    Args:
+        expr: The logical expression string to convert
+        operand_table: Optional dict shared between calls; equal operand texts
+            are stored once and reused across expressions
+
+    Returns:
+        A CompactExpression whose to_tokens() equals convert_logical_expression(expr)
+    """
+    tokens = _TOKEN_RE.findall(expr.lower())
+    get_code = OPERATOR_CODES.get
+    codes = array("b", [get_code(token, OPERAND) for token in tokens])
+    operands = [token for token in tokens if token not in OPERATOR_CODES]
+    if operand_table is not None:
+        operands = [operand_table.setdefault(operand, operand) for operand in operands]
+    return CompactExpression(codes, tuple(operands))
+
+
+def compile_logical_expressions(expressions: Iterable[str]) -> List[CompactExpression]:
+    """
+    Converts many logical expressions, e.g. a whole debate history, at once.
+
+    Repeated expressions are converted once and repeated operand texts share
+    a single string object.
+    """
+    operand_table: Dict[str, str] = {}
+    compiled: Dict[str, CompactExpression] = {}
+    results = []
+    for expr in expressions:
+        compact = compiled.get(expr)
+        if compact is None:
+            compact = compiled[expr] = compile_logical_expression(expr, operand_table)
+        results.append(compact)
+    return results
 
 
 def parse_llm_output(raw_output: str, sentence: str) -> dict:
@@ -164,18 +295,167 @@ def parse_llm_output(raw_output: str, sentence: str) -> dict:
         }
     }
 
+def parse_batch_output(raw_output: str, count: int) -> Dict[int, dict]:
+    """
+    Splits a batch response into per-sentence sections and parses each one.
+    
+    Args:
+        raw_output: The raw string output from the LLM for a batch prompt
+        count: Number of sentences in the batch
+        
+    Returns:
+        A dictionary mapping the zero-based sentence position to the
+        parse_llm_output result; sentences without a parseable section are absent
+    """
+    results = {}
+    matches = list(BATCH_SECTION_PATTERN.finditer(raw_output))
+    for i, match in enumerate(matches):
+        position = int(match.group(1)) - 1
+        if position < 0 or position >= count or position in results:
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(raw_output)
+        result = parse_llm_output(raw_output[match.end():end], "")
+        if result.get("logic_expression"):
+            results[position] = result
+    return results
+
+
+def logic_chain_from_result(result: dict) -> LogicChain:
+    """
+    Converts a parse_llm_output result into a LogicChain model.
+    """
+    return LogicChain(
+        logic_expression=result.get("logic_expression", ""),
+        converted_logical_expression=result.get("converted_logical_expression", []),
+        performance=LogicalPerformance(
+            valid=result.get("performance", {}).get("valid", False),
+            valid_explanation=result.get("performance", {}).get("valid_explanation", ""),
+            sound=result.get("performance", {}).get("sound", False),
+            sound_explanation=result.get("performance", {}).get("sound_explanation", "")
+        )
+    )
+
+def logic_chain_from_fast_path(result: FastPathResult) -> LogicChain:
+    """
+    Converts a rule-based FastPathResult into a LogicChain model.
+    """
+    return LogicChain(
+        logic_expression=result.logic_expression,
+        converted_logical_expression=convert_logical_expression(result.logic_expression),
+        performance=LogicalPerformance(
+            valid=result.valid,
+            valid_explanation=result.valid_explanation,
+            sound=result.sound,
+            sound_explanation=result.sound_explanation
+        ),
+        source="fast_path"
+    )
+
+def combine_logic_chains(chains: List[LogicChain]) -> LogicChain:
+    """
+    Combines the analyses of consecutive sentences into one conjunction.
+
+    The argument is valid or sound only if every sentence is; explanations
+    are concatenated in order.
+    """
+    if len(chains) == 1:
+        return chains[0]
+    expressions = [
+        f"({chain.logic_expression})" if any(symbol in chain.logic_expression for symbol in OPERATOR_CODES) else chain.logic_expression
+        for chain in chains
+        if chain.logic_expression
+    ]
+    logic_expression = " ∧ ".join(expressions)
+    sources = {chain.source for chain in chains}
+    return LogicChain(
+        logic_expression=logic_expression,
+        converted_logical_expression=convert_logical_expression(logic_expression),
+        performance=LogicalPerformance(
+            valid=all(chain.performance.valid for chain in chains),
+            valid_explanation=" ".join(filter(None, (chain.performance.valid_explanation for chain in chains))),
+            sound=all(chain.performance.sound for chain in chains),
+            sound_explanation=" ".join(filter(None, (chain.performance.sound_explanation for chain in chains)))
+        ),
+        source=sources.pop() if len(sources) == 1 else "llm"
+    )
+
+class TokenUsage:
+    """
+    Accumulates token counts and latency across LLM calls.
+    
+    cached_tokens is the part of the prompt the provider served from its
+    prefix cache (usage.prompt_tokens_details.cached_tokens).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.latency_seconds = 0.0
+
+    def record(self, usage: Any, latency_seconds: float):
+        """Add one call's usage report and log it."""
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        if isinstance(details, dict):
+            cached_tokens = details.get("cached_tokens", 0) or 0
+        else:
+            cached_tokens = getattr(details, "cached_tokens", 0) or 0
+
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cached_tokens += cached_tokens
+        self.latency_seconds += latency_seconds
+        logger.info(
+            f"Logic analysis usage: prompt_tokens={prompt_tokens}, completion_tokens={completion_tokens}, "
+            f"cached_tokens={cached_tokens}, latency_ms={latency_seconds * 1000:.0f}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return totals and per-call averages."""
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "avg_prompt_tokens": self.prompt_tokens / calls,
+            "avg_cached_tokens": self.cached_tokens / calls,
+            "avg_latency_ms": self.latency_seconds * 1000 / calls
+        }
+
 class LogicChainService:
     def __init__(self):
-        """Initialize the Logic Chain Service with OpenAI client"""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        """Initialize the Logic Chain Service"""
         self.conversation_contexts = {}  # Store context expressions for conversations
+        self.cache = ResultCache(
+            max_entries=settings.LOGIC_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LOGIC_CACHE_TTL_SECONDS,
+            disk_path=settings.LOGIC_CACHE_PATH
+        ) if settings.LOGIC_CACHE_ENABLED else None
+        self._inflight: Dict[str, asyncio.Task] = {}  # Identical analyses currently awaiting the LLM
+        self.usage = TokenUsage()
+        self.fast_path = FastPathAnalyzer() if settings.LOGIC_FAST_PATH_ENABLED else None
+        if settings.LOGIC_BACKEND not in ("openai", "fake"):
+            raise ValueError(f"Unknown logic backend: {settings.LOGIC_BACKEND}")
+        # Offline stand-in, used instead of OpenAI when LOGIC_BACKEND is "fake"
+        self.fake_client = FakeOpenAIClient(FaultInjector.from_settings("LOGIC")) if settings.LOGIC_BACKEND == "fake" else None
 
-    async def get_response(self, prompt: str) -> str:
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The process-wide async OpenAI client (shared connection pool)"""
+        return self.fake_client or get_openai_client()
+
+    async def get_response(self, messages: List[Dict[str, str]], max_tokens: int = 500) -> str:
         """
-        Get response from OpenAI API.
+        Get response from OpenAI API and record its token usage.
         
         Args:
-            prompt: The input prompt for the language model
+            messages: The chat messages for the language model
+            max_tokens: Upper bound on the completion length
             
         Returns:
             The generated response text
@@ -184,12 +464,14 @@ class LogicChainService:
             Exception: If there's an error in getting the LLM response
         """
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
+            started = time.perf_counter()
+            response = await self.client.chat.completions.create(
+                model=LOGIC_MODEL,
+                messages=messages,
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=max_tokens
             )
+            self.usage.record(response.usage, time.perf_counter() - started)
             return response.choices[0].message.content
         except Exception as e:
             raise Exception(f"Error in getting LLM response: {str(e)}")
@@ -197,6 +479,12 @@ class LogicChainService:
     async def analyze_logic(self, sentence: str, previous_context_expressions: list = None) -> LogicChain:
         """
         Analyze the logical structure of a sentence.
+
+        Simple argument shapes are answered by the rule-based fast path. Other
+        results are cached by the normalised sentence, the context expressions
+        and the prompt/model version, and concurrent identical requests share
+        a single LLM call. The returned chain's source records which path
+        produced it.
         
         Args:
             sentence: The sentence to analyze
@@ -208,34 +496,142 @@ class LogicChainService:
             - converted_logical_expression: List of tokens
             - performance: LogicalPerformance object with validity and soundness analysis
         """
-        # Prepare analysis instructions with context if available
-        additional_instructions = ""
-        if previous_context_expressions and len(previous_context_expressions) > 0:
-            previous_context_str = "Previous Logical Expressions:\n"
-            for expr in previous_context_expressions:
-                previous_context_str += f"{expr}\n"
-            additional_instructions = previous_context_str + "\n" + COMMON_INSTRUCTIONS + "\nNow, please integrate the previous analysis with the new sentence and analyze it."
-        else:
-            additional_instructions = COMMON_INSTRUCTIONS
+        # Simple shapes are analysed locally; context needs the LLM to integrate it
+        if self.fast_path is not None and not previous_context_expressions:
+            result = self.fast_path.analyze(sentence)
+            if result is not None:
+                return logic_chain_from_fast_path(result)
+
+        if self.cache is None:
+            return await self._analyze_with_llm(sentence, previous_context_expressions)
 
-        # Generate the analysis prompt
-        prompt = PROMPT_TEMPLATE.format(additional_instructions=additional_instructions, sentence=sentence)
+        cache_key = make_cache_key(sentence, previous_context_expressions, CACHE_VERSION)
+        cached = await self.cache.get_async(cache_key)
+        if cached is not None:
+            return LogicChain.model_validate({**cached, "source": "cache"})
+
+        # Join an identical analysis that is already in flight
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze_with_llm(sentence, previous_context_expressions))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        analysis = await asyncio.shield(task)
+
+        # Only cache analyses the LLM output could actually be parsed into
+        if analysis.logic_expression:
+            await self.cache.set_async(cache_key, analysis.model_dump())
+        return analysis.model_copy(deep=True)
+
+    async def _analyze_with_llm(self, sentence: str, previous_context_expressions: list = None) -> LogicChain:
+        """
+        Build the analysis prompt, call the LLM and parse its output.
+        """
+        messages = build_analysis_messages(sentence, previous_context_expressions)
 
         # Get and parse the LLM response
-        raw_response = await self.get_response(prompt)
+        raw_response = await self.get_response(messages)
         result = parse_llm_output(raw_response, sentence)
         
         # Convert to LogicChain model
-        return LogicChain(
-            logic_expression=result.get("logic_expression", ""),
-            converted_logical_expression=result.get("converted_logical_expression", []),
-            performance=LogicalPerformance(
-                valid=result.get("performance", {}).get("valid", False),
-                valid_explanation=result.get("performance", {}).get("valid_explanation", ""),
-                sound=result.get("performance", {}).get("sound", False),
-                sound_explanation=result.get("performance", {}).get("sound_explanation", "")
-            )
-        )
+        return logic_chain_from_result(result)
+
+    async def analyze_batch(
+        self,
+        sentences: List[str],
+        previous_context_expressions: list = None,
+        max_sentences_per_request: int = None,
+        max_chars_per_request: int = None,
+        max_concurrency: int = None
+    ) -> List[BatchAnalysisItem]:
+        """
+        Analyze many independent sentences, packing them into few LLM requests.
+        
+        Cached sentences are answered directly. The rest are grouped into
+        requests bounded by sentence count and total characters, so the shared
+        instructions are sent once per request instead of once per sentence,
+        and the requests run concurrently under a limit.
+        
+        Args:
+            sentences: The sentences to analyze
+            previous_context_expressions: Logical expressions shared as context by every sentence
+            max_sentences_per_request: Sentences per LLM request (default: LOGIC_BATCH_MAX_SENTENCES)
+            max_chars_per_request: Sentence characters per LLM request (default: LOGIC_BATCH_MAX_CHARS)
+            max_concurrency: Concurrent LLM requests (default: LOGIC_BATCH_CONCURRENCY)
+            
+        Returns:
+            One BatchAnalysisItem per input sentence, in input order, holding
+            either the LogicChain or the error for that sentence
+        """
+        max_sentences_per_request = max_sentences_per_request or settings.LOGIC_BATCH_MAX_SENTENCES
+        max_chars_per_request = max_chars_per_request or settings.LOGIC_BATCH_MAX_CHARS
+        semaphore = asyncio.Semaphore(max_concurrency or settings.LOGIC_BATCH_CONCURRENCY)
+
+        items = [BatchAnalysisItem(index=i, sentence=sentence) for i, sentence in enumerate(sentences)]
+        pending = []
+        for item in items:
+            if not item.sentence.strip():
+                item.error = "Empty sentence"
+                continue
+            if self.fast_path is not None and not previous_context_expressions:
+                result = self.fast_path.analyze(item.sentence)
+                if result is not None:
+                    item.logic_chain = logic_chain_from_fast_path(result)
+                    continue
+            if self.cache is not None:
+                cached = await self.cache.get_async(make_cache_key(item.sentence, previous_context_expressions, BATCH_CACHE_VERSION))
+                if cached is not None:
+                    item.logic_chain = LogicChain.model_validate({**cached, "source": "cache"})
+                    continue
+            pending.append(item)
+
+        # Pack the remaining sentences into size-bounded requests
+        chunks: List[List[BatchAnalysisItem]] = []
+        chunk_chars = 0
+        for item in pending:
+            if (not chunks
+                    or len(chunks[-1]) >= max_sentences_per_request
+                    or chunk_chars + len(item.sentence) > max_chars_per_request):
+                chunks.append([])
+                chunk_chars = 0
+            chunks[-1].append(item)
+            chunk_chars += len(item.sentence)
+
+        async def analyze_chunk(chunk: List[BatchAnalysisItem]):
+            async with semaphore:
+                try:
+                    results = await self._analyze_chunk_with_llm(
+                        [item.sentence for item in chunk], previous_context_expressions
+                    )
+                except Exception as e:
+                    for item in chunk:
+                        item.error = str(e)
+                    return
+            for position, item in enumerate(chunk):
+                if position not in results:
+                    item.error = "No analysis returned for this sentence"
+                    continue
+                try:
+                    item.logic_chain = logic_chain_from_result(results[position])
+                except Exception as e:
+                    item.error = f"Invalid analysis returned for this sentence: {str(e)}"
+                    continue
+                if self.cache is not None:
+                    await self.cache.set_async(
+                        make_cache_key(item.sentence, previous_context_expressions, BATCH_CACHE_VERSION),
+                        item.logic_chain.model_dump()
+                    )
+
+        await asyncio.gather(*[analyze_chunk(chunk) for chunk in chunks])
+        return items
+
+    async def _analyze_chunk_with_llm(self, sentences: List[str], previous_context_expressions: list = None) -> Dict[int, dict]:
+        """
+        Analyze several sentences in a single LLM request.
+        """
+        messages = build_batch_messages(sentences, previous_context_expressions)
+        raw_response = await self.get_response(messages, max_tokens=500 * len(sentences))
+        return parse_batch_output(raw_response, len(sentences))
 
 # Initialize the Logic Chain Service
 logic_chain_service = LogicChainService() 
\ No newline at end of file
@@ -0,0 +1,358 @@
+"""
+Deterministic fast path for simple argument shapes.
+
+Recognises plain conditionals ("If A, then B"), biconditionals, disjunctions,
+negations and the classic two-premise forms (modus ponens/tollens, denying
+the antecedent, affirming the consequent, disjunctive and hypothetical
+syllogisms) without calling the LLM. Anything it is not confident about
+returns None so the caller can fall back to the LLM analysis.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+INVALID_SOUND_EXPLANATION = (
+    "An argument is sound if and only if it is valid and all premises are true. "
+    "Since it's invalid, it's unsound."
+)
+# The rules see the argument's shape only, never whether its premises are true
+UNVERIFIED_SOUND_EXPLANATION = (
+    "An argument is sound if and only if it is valid and all premises are true. "
+    "The premises were not verified, so soundness is not established."
+)
+
+# Words that signal structure the fast path does not model
+_UNSUPPORTED_WORDS = {
+    "and", "but", "because", "unless", "either", "neither", "nor", "only", "even",
+    "all", "some", "every", "none", "most", "if", "then", "or", "since", "although",
+    "though", "while", "whereas", "not", "no", "never", "n't", "cannot",
+    # Complement, embedded and relative clauses ("He knows that ...", "Policies that fail ...")
+    "that", "whether", "which", "who", "whom", "whose", "what", "where", "when", "why", "how",
+    # Verbs and adjectives that take a clause rather than assert one
+    "wonder", "wonders", "wondered", "ask", "asks", "asked", "know", "knows", "knew",
+    "think", "thinks", "thought", "believe", "believes", "doubt", "doubts", "unclear",
+    "unsure", "uncertain", "see", "tell", "check", "let", "suppose", "imagine"
+}
+# Clauses opening with these are usually imperatives ("If it rains, close the window")
+_IMPERATIVE_OPENERS = {
+    "please", "consider", "note", "remember", "look", "stop", "go", "take", "give", "make",
+    "keep", "try", "vote", "support", "close", "open", "bring", "call", "use", "read"
+}
+_CONCLUSION_MARKER = re.compile(
+    r"(?:^|,\s*|\s+)(?:so|therefore|thus|hence|consequently)\s*,?\s+", re.IGNORECASE
+)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!;])\s+")
+_IF_THEN = re.compile(r"^if\s+(?P<a>.+?)\s*,?\s+then\s+(?P<b>.+)$", re.IGNORECASE)
+_IF_COMMA = re.compile(r"^if\s+(?P<a>[^,]+),\s*(?P<b>.+)$", re.IGNORECASE)
+_IFF = re.compile(r"^(?P<a>.+?)\s*,?\s+if and only if\s+(?P<b>.+)$", re.IGNORECASE)
+_EITHER_OR = re.compile(r"^(?:either\s+)?(?P<a>.+?)\s*,?\s+or\s+(?P<b>.+)$", re.IGNORECASE)
+_NOT_THE_CASE = re.compile(r"^it is not (?:the case|true) that\s+(?P<a>.+)$", re.IGNORECASE)
+_WORD = re.compile(r"[a-z']+")
+_NEGATION_WORDS = {"not", "n't"}
+_AUXILIARIES = {"do", "does", "did"}
+# Contracted negations whose base is not the word before "n't"
+_CONTRACTION_BASES = {"ca": "can", "wo": "will", "sha": "shall"}
+# Displayed without their negation: "don't learn" -> "learn", "can't" -> "can"
+_NEGATED_AUXILIARY = re.compile(r"\b(?:do|does|did)(?:\s+not\b|n't\b)\s*", re.IGNORECASE)
+_CONTRACTED_NEGATION = re.compile(r"\b(?P<base>[a-z]+)n't\b", re.IGNORECASE)
+# Sentences opening with these are questions, not assertions ("What if it rains")
+_QUESTION_WORDS = {
+    "what", "why", "how", "when", "where", "who", "whom", "whose", "which",
+    "do", "does", "did", "is", "are", "was", "were", "am", "can", "could", "will", "would",
+    "shall", "should", "may", "might", "must", "have", "has", "had"
+}
+
+
+@dataclass
+class FastPathResult:
+    """Outcome of a rule-based analysis."""
+    form: str
+    logic_expression: str
+    valid: bool
+    valid_explanation: str = ""
+    sound: bool = False
+    sound_explanation: str = UNVERIFIED_SOUND_EXPLANATION
+
+
+@dataclass(frozen=True)
+class _Proposition:
+    """An atomic statement, possibly negated, with a key used for matching."""
+    text: str
+    negated: bool
+    key: Tuple[str, ...]
+
+    def render(self, names: Dict[Tuple[str, ...], str]) -> str:
+        text = names.get(self.key, self.text)
+        return f"~ {text}" if self.negated else text
+
+    def negate(self) -> "_Proposition":
+        return _Proposition(self.text, not self.negated, self.key)
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping, used only to match propositions to each other."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def _split_contractions(text: str) -> List[str]:
+    words = []
+    for word in _WORD.findall(text.lower()):
+        if word.endswith("n't"):
+            base = word[:-3]
+            words.extend([_CONTRACTION_BASES.get(base, base), "n't"])
+        else:
+            words.append(word)
+    return words
+
+
+def _contraction_base(match: re.Match) -> str:
+    base = match.group("base")
+    expanded = _CONTRACTION_BASES.get(base.lower(), base)
+    return expanded.capitalize() if base[:1].isupper() else expanded
+
+
+def _atom(text: str) -> Optional[_Proposition]:
+    """
+    Parse an atomic statement, recognising a single verbal negation
+    ("X is not Y", "X did not rain", "X isn't Y").
+    """
+    text = text.strip().strip(",").strip()
+    match = _NOT_THE_CASE.match(text)
+    if match:
+        inner = _atom(match.group("a"))
+        return inner.negate() if inner is not None and not inner.negated else None
+
+    words = _split_contractions(text)
+    if not words:
+        return None
+    negations = [i for i, word in enumerate(words) if word in _NEGATION_WORDS]
+    if len(negations) > 1:
+        return None
+    negated = bool(negations)
+    if negated:
+        position = negations[0]
+        # "did not rain" matches "rained": drop the negation and a bare auxiliary
+        drop = {position}
+        if position > 0 and words[position - 1] in _AUXILIARIES:
+            drop.add(position - 1)
+        words = [word for i, word in enumerate(words) if i not in drop]
+    # A clause needs at least a subject and a verb
+    if len(words) < 2 or words[0] in _IMPERATIVE_OPENERS or any(word in _UNSUPPORTED_WORDS for word in words):
+        return None
+
+    display = text
+    if negated:
+        display, count = _NEGATED_AUXILIARY.subn("", text, count=1)
+        if not count:
+            display, count = _CONTRACTED_NEGATION.subn(_contraction_base, text, count=1)
+        if not count:
+            display = re.sub(r"\bnot\s+", "", text, count=1, flags=re.IGNORECASE)
+    key = tuple(_stem(word) for word in words if word not in {"a", "an", "the"})
+    return _Proposition(display.strip(), negated, key)
+
+
+def _statement(text: str) -> Optional[Tuple[str, tuple]]:
+    """
+    Parse one clause into (kind, propositions), where kind is "atom",
+    "implies", "iff" or "or".
+    """
+    text = text.strip().rstrip(".!;").strip()
+    first_word = _WORD.match(text.lower())
+    if first_word is None or first_word.group() in _QUESTION_WORDS:
+        return None
+    if _NOT_THE_CASE.match(text):
+        # Only a negated atom is unambiguous; "it is not the case that A or B" is not
+        atom = _atom(text)
+        return ("atom", (atom,)) if atom is not None else None
+    for pattern, kind in ((_IFF, "iff"), (_IF_THEN, "implies"), (_IF_COMMA, "implies")):
+        match = pattern.match(text)
+        if match:
+            a, b = _atom(match.group("a")), _atom(match.group("b"))
+            return (kind, (a, b)) if a is not None and b is not None else None
+    match = _EITHER_OR.match(text)
+    if match:
+        a, b = _atom(match.group("a")), _atom(match.group("b"))
+        return ("or", (a, b)) if a is not None and b is not None else None
+    atom = _atom(text)
+    return ("atom", (atom,)) if atom is not None else None
+
+
+def _render(statement: Tuple[str, tuple], names: Dict[Tuple[str, ...], str], group: bool = False) -> str:
+    kind, parts = statement
+    if kind == "atom":
+        return parts[0].render(names)
+    symbol = {"implies": "→", "iff": "↔", "or": "∨"}[kind]
+    rendered = f"{parts[0].render(names)} {symbol} {parts[1].render(names)}"
+    return f"({rendered})" if group else rendered
+
+
+def _names(*statements: Tuple[str, tuple]) -> Dict[Tuple[str, ...], str]:
+    """
+    Pick one display text per proposition, preferring its first positive
+    wording, so "it rained" and "it did not rain" render as the same atom.
+    """
+    names: Dict[Tuple[str, ...], str] = {}
+    propositions = [p for statement in statements for p in statement[1]]
+    for proposition in sorted(propositions, key=lambda p: p.negated):
+        names.setdefault(proposition.key, proposition.text)
+    return names
+
+
+def _same(p: _Proposition, q: _Proposition) -> bool:
+    return p.key == q.key and p.negated == q.negated
+
+
+def _classify(first: Tuple[str, tuple], second: Tuple[str, tuple], conclusion: Tuple[str, tuple]) -> Optional[Tuple[str, bool, str]]:
+    """
+    Identify a known two-premise form.
+
+    Returns:
+        (form name, validity, explanation if invalid), or None if unrecognised
+    """
+    # Put the compound premise first
+    if first[0] == "atom" and second[0] != "atom":
+        first, second = second, first
+
+    if first[0] == "implies" and second[0] == "atom" and conclusion[0] == "atom":
+        a, b = first[1]
+        x, y = second[1][0], conclusion[1][0]
+        if _same(x, a) and _same(y, b):
+            return "modus_ponens", True, ""
+        if _same(x, b.negate()) and _same(y, a.negate()):
+            return "modus_tollens", True, ""
+        if _same(x, a.negate()) and _same(y, b.negate()):
+            return "denying_the_antecedent", False, (
+                "The argument commits the fallacy of denying the antecedent by incorrectly assuming "
+                "if the antecedent of a conditional statement is false, then the consequent must also "
+                "be false, which is not logically valid."
+            )
+        if _same(x, b) and _same(y, a):
+            return "affirming_the_consequent", False, (
+                "The argument commits the fallacy of affirming the consequent by incorrectly assuming "
+                "that if the consequent of a conditional statement is true, then the antecedent must "
+                "also be true, which is not logically valid."
+            )
+
+    if first[0] == "or" and second[0] == "atom" and conclusion[0] == "atom":
+        a, b = first[1]
+        x, y = second[1][0], conclusion[1][0]
+        for p, q in ((a, b), (b, a)):
+            if _same(x, p.negate()) and _same(y, q):
+                return "disjunctive_syllogism", True, ""
+            if _same(x, p) and _same(y, q.negate()):
+                return "affirming_a_disjunct", False, (
+                    "The argument commits the fallacy of affirming a disjunct by assuming that because "
+                    "one option of an inclusive 'or' is true, the other must be false, which is not "
+                    "logically valid."
+                )
+
+    if first[0] == "implies" and second[0] == "implies" and conclusion[0] == "implies":
+        (a, b), (c, d), (x, y) = first[1], second[1], conclusion[1]
+        for (p, q), (r, s) in (((a, b), (c, d)), ((c, d), (a, b))):
+            if _same(q, r) and _same(x, p) and _same(y, s):
+                return "hypothetical_syllogism", True, ""
+
+    return None
+
+
+def _split_argument(text: str) -> Optional[Tuple[List[str], str]]:
+    """Split text into premises and a conclusion introduced by a marker like 'so'."""
+    clauses = [clause for clause in _SENTENCE_BOUNDARY.split(text.strip()) if clause.strip()]
+    premises: List[str] = []
+    conclusion = None
+    for clause in clauses:
+        parts = _CONCLUSION_MARKER.split(clause, maxsplit=1)
+        if len(parts) == 2:
+            if conclusion is not None:
+                return None
+            if parts[0].strip():
+                premises.append(parts[0])
+            conclusion = parts[1]
+        elif conclusion is None:
+            premises.append(clause)
+        else:
+            return None
+    if conclusion is None:
+        return None
+    return premises, conclusion
+
+
+class FastPathAnalyzer:
+    """
+    Rule-based analyser with hit-rate counters.
+    """
+
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.forms: Dict[str, int] = {}
+
+    def analyze(self, sentence: str) -> Optional[FastPathResult]:
+        """
+        Analyze a sentence if it has one of the supported shapes.
+
+        Returns:
+            A FastPathResult, or None when the analyser is not confident
+        """
+        self.attempts += 1
+        result = self._analyze(sentence)
+        if result is not None:
+            self.hits += 1
+            self.forms[result.form] = self.forms.get(result.form, 0) + 1
+        return result
+
+    def _analyze(self, sentence: str) -> Optional[FastPathResult]:
+        if not sentence or "?" in sentence:
+            return None
+
+        argument = _split_argument(sentence)
+        if argument is not None:
+            premises, conclusion_text = argument
+            if len(premises) != 2:
+                return None
+            first, second = _statement(premises[0]), _statement(premises[1])
+            conclusion = _statement(conclusion_text)
+            if first is None or second is None or conclusion is None:
+                return None
+            classified = _classify(first, second, conclusion)
+            if classified is None:
+                return None
+            form, valid, explanation = classified
+            names = _names(first, second, conclusion)
+            expression = (
+                f"({_render(first, names, group=True)} ∧ {_render(second, names, group=True)}) "
+                f"→ {_render(conclusion, names, group=True)}"
+            )
+            return FastPathResult(
+                form=form,
+                logic_expression=expression,
+                valid=valid,
+                valid_explanation=explanation,
+                sound=False,
+                sound_explanation=UNVERIFIED_SOUND_EXPLANATION if valid else INVALID_SOUND_EXPLANATION
+            )
+
+        # A single statement must be one clause
+        if len(_SENTENCE_BOUNDARY.split(sentence.strip())) != 1:
+            return None
+        statement = _statement(sentence)
+        if statement is None:
+            return None
+        form = {"atom": "negation", "implies": "conditional", "iff": "biconditional", "or": "disjunction"}[statement[0]]
+        if statement[0] == "atom" and not statement[1][0].negated:
+            # Bare assertions carry no logical structure worth a fast answer
+            return None
+        return FastPathResult(form=form, logic_expression=_render(statement, _names(statement)), valid=True)
+
+    def stats(self) -> Dict:
+        """Return attempts, hits, hit rate and hits per form."""
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+            "forms": dict(self.forms)
+        }
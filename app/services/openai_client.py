@@ -0,0 +1,57 @@
+import httpx
+from openai import AsyncOpenAI
+from typing import Optional
+from ..config import settings
+
+# Process-wide client shared by every service that talks to OpenAI
+_client: Optional[AsyncOpenAI] = None
+
+
+def build_openai_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> AsyncOpenAI:
+    """
+    Build an asynchronous OpenAI client backed by a tuned HTTP connection pool.
+
+    Args:
+        transport: Optional httpx transport (used to plug in local stubs)
+
+    Returns:
+        An AsyncOpenAI client configured from settings
+    """
+    http_client = httpx.AsyncClient(
+        transport=transport,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            settings.OPENAI_READ_TIMEOUT,
+            connect=settings.OPENAI_CONNECT_TIMEOUT
+        )
+    )
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        http_client=http_client
+    )
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        _client = build_openai_client()
+    return _client
+
+
+async def close_openai_client():
+    """
+    Close the shared client and release its pooled connections.
+    """
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
+
+
+class StageGraph:
+    """
+    A small dependency graph of async stages.
+
+    Each stage is an async callable that receives the results of the stages it
+    depends on as positional arguments. Stages whose dependencies are satisfied
+    run concurrently, so the total latency is the length of the critical path
+    rather than the sum of every stage.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...]]] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.total_ms: float = 0.0
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends_on: Iterable[str] = ()
+    ) -> "StageGraph":
+        """
+        Register a stage.
+
+        Args:
+            name: Unique stage name
+            func: Async callable invoked with the results of its dependencies
+            depends_on: Names of previously registered stages this stage needs
+
+        Returns:
+            The graph itself, so calls can be chained
+
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage already registered: {name}")
+        depends_on = tuple(depends_on)
+        for dependency in depends_on:
+            # Requiring dependencies to exist up front keeps the graph acyclic
+            if dependency not in self._stages:
+                raise ValueError(f"Unknown dependency '{dependency}' for stage '{name}'")
+        self._stages[name] = (func, depends_on)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every stage as soon as its dependencies complete.
+
+        Returns:
+            Dict mapping stage names to their results
+
+        Raises:
+            Exception: The first stage failure; remaining stages are cancelled
+        """
+        origin = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+        self.timings = {}
+
+        async def run_stage(name: str) -> Any:
+            func, depends_on = self._stages[name]
+            args = [await tasks[dependency] for dependency in depends_on]
+            started = time.perf_counter()
+            try:
+                return await func(*args)
+            finally:
+                finished = time.perf_counter()
+                self.timings[name] = {
+                    "start_ms": round((started - origin) * 1000, 2),
+                    "duration_ms": round((finished - started) * 1000, 2)
+                }
+
+        for name in self._stages:
+            tasks[name] = asyncio.create_task(run_stage(name))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            self.total_ms = round((time.perf_counter() - origin) * 1000, 2)
+
+        return {name: task.result() for name, task in tasks.items()}
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Dict, Optional
+
+
+class Turn:
+    """A submission's place in its session's line."""
+
+    def __init__(self, previous: Optional[asyncio.Future], done: asyncio.Future):
+        self._previous = previous
+        self._done = done
+        self._finished = False
+
+    async def wait(self):
+        """Wait until every earlier submission to the session has finished."""
+        if self._previous is not None:
+            # Shielded so cancelling this waiter does not cancel the line
+            await asyncio.shield(self._previous)
+
+    def finish(self):
+        """
+        Leave the line. Call it however the submission ends, so a failed or
+        cancelled one never holds up the ones behind it; later calls do nothing.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        self._leave()
+
+    def _leave(self):
+        if self._previous is None or self._previous.done():
+            if not self._done.done():
+                self._done.set_result(None)
+        else:
+            # Left early: later turns still wait for the earlier ones
+            self._previous.add_done_callback(lambda _: self._leave())
+
+
+class SessionSequencer:
+    """
+    Orders the round submissions of each session by arrival.
+
+    A submission takes a turn when it arrives and may do its slow work (LLM
+    calls, analysis, synthesis) straight away; it only waits for its turn
+    before storing the round. Rounds of one session are therefore stored in
+    the order they were submitted, while different sessions, and the work
+    before the store, run fully in parallel.
+
+    The order is kept within one process. Across workers the stores still
+    give every round a unique round_index (see app.storage.sqlite).
+    """
+
+    def __init__(self):
+        # Last turn's done future per session with submissions in flight
+        self._tails: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._tails)
+
+    def take(self, session_id: str) -> Turn:
+        """Take the next place in the session's line; call Turn.finish when done."""
+        done = asyncio.get_running_loop().create_future()
+        done.add_done_callback(lambda _: self._release(session_id, done))
+        turn = Turn(self._tails.get(session_id), done)
+        self._tails[session_id] = done
+        return turn
+
+    def _release(self, session_id: str, done: asyncio.Future):
+        # Forget the session once its last submission is through the line
+        if self._tails.get(session_id) is done:
+            del self._tails[session_id]
+
+
+round_sequencer = SessionSequencer()
@@ -1,10 +1,20 @@
 from google.cloud import speech
-import io
+from fastapi import UploadFile
+import asyncio
 from pathlib import Path
 import logging
 import os
+import queue
+import shutil
+import threading
+import time
 import traceback
+import uuid
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Iterator, NamedTuple, Optional, Tuple, Union
 from dotenv import load_dotenv
+from ..config import settings
+from .audio import WavInfo, parse_wav, prepare_for_recognition, trim_silence
+from .fakes import FakeSpeechClient, FaultInjector
 
 # Load environment variables
 load_dotenv()
@@ -13,9 +23,106 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Streamed WAV headers are looked for in this many leading bytes
+WAV_HEADER_SNIFF_BYTES = 4096
+
+# Audio accepted by STTService.transcribe
+AudioSource = Union[bytes, bytearray, memoryview, BinaryIO, AsyncIterable[bytes]]
+
+
+async def _read_audio(audio: AudioSource) -> bytes:
+    """The audio's bytes, copied only where the source is not bytes already."""
+    if isinstance(audio, bytes):
+        return audio
+    if isinstance(audio, (bytearray, memoryview)):
+        return bytes(audio)
+    if hasattr(audio, "__aiter__"):
+        return b"".join([chunk async for chunk in audio])
+    # File objects may be spooled to disk, so read off the event loop
+    return await asyncio.to_thread(audio.read)
+
+
+class Transcript(NamedTuple):
+    """A streaming recognition result."""
+    text: str
+    is_final: bool
+
+
+def _default_sample_rate() -> int:
+    """The rate of audio without a WAV header."""
+    return int(os.getenv('STT_SAMPLE_RATE', '22050'))
+
+
+def _recognition_config(sample_rate: Optional[int] = None, channels: int = 1) -> speech.RecognitionConfig:
+    """LINEAR16 recognition; audio without a WAV header is taken to be at STT_SAMPLE_RATE."""
+    return speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+        sample_rate_hertz=sample_rate or _default_sample_rate(),
+        language_code=os.getenv('STT_LANGUAGE', 'en-US'),
+        enable_automatic_punctuation=True,
+        model="latest_long",
+        use_enhanced=True,
+        audio_channel_count=channels,
+        enable_word_time_offsets=True,
+        profanity_filter=False
+    )
+
+
+def _duration_seconds(content: bytes, sample_rate: Optional[int] = None) -> float:
+    """Length of mono LINEAR16 audio."""
+    return len(content) / (2 * (sample_rate or _default_sample_rate()))
+
+
+async def _split_wav_header(audio: AsyncIterable[bytes]) -> Tuple[Optional[WavInfo], AsyncIterator[bytes]]:
+    """
+    Read the header of a streamed WAV file.
+
+    Returns:
+        The WAV's format (None for headerless audio) and the stream of
+        sample data that follows the header
+    """
+    chunks = audio.__aiter__()
+    head = b""
+    info = None
+    async for chunk in chunks:
+        head += chunk
+        # Headerless audio is passed on from its first chunk
+        if len(head) >= 4 and not head.startswith(b"RIFF"):
+            break
+        try:
+            info = parse_wav(head)
+        except ValueError:
+            # The header may continue in the next chunk
+            if len(head) >= WAV_HEADER_SNIFF_BYTES:
+                raise
+            continue
+        if info is not None:
+            break
+
+    async def sample_data() -> AsyncIterator[bytes]:
+        yield info.data.tobytes() if info is not None else head
+        async for chunk in chunks:
+            yield chunk
+
+    return info, sample_data()
+
+
+def _copy_to_file(source: BinaryIO, path: Path):
+    with open(path, "wb") as target:
+        shutil.copyfileobj(source, target)
+
+
 class STTService:
     def __init__(self):
         try:
+            if settings.STT_BACKEND == "fake":
+                # Offline stand-in that returns canned transcripts
+                self.client = FakeSpeechClient(FaultInjector.from_settings("STT"))
+                logger.info("Initialized STT service with the fake backend")
+                return
+            if settings.STT_BACKEND != "google":
+                raise ValueError(f"Unknown STT backend: {settings.STT_BACKEND}")
+
             credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
             logger.info(f"Initializing STT service with credentials from: {credentials_path}")
             
@@ -32,50 +139,94 @@ class STTService:
 
     async def transcribe_audio(self, audio_file_path: Path) -> str:
         """
-        Transcribe audio file to text using Google Cloud Speech-to-Text
+        Transcribe an audio file to text using Google Cloud Speech-to-Text.
+
+        Prefer transcribe for audio that is already in memory; this is the
+        fallback for uploads spooled to disk.
         """
         if not self.client:
             raise RuntimeError("STT service not properly initialized")
-            
+
+        logger.info(f"Starting transcription of file: {audio_file_path}")
+
+        # Verify file exists and is readable
+        if not audio_file_path.exists():
+            logger.error(f"Audio file not found: {audio_file_path}")
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+
+        if not os.access(audio_file_path, os.R_OK):
+            logger.error(f"Audio file not readable: {audio_file_path}")
+            raise PermissionError(f"Audio file not readable: {audio_file_path}")
+
+        # Read the audio file
         try:
-            logger.info(f"Starting transcription of file: {audio_file_path}")
-            
-            # Verify file exists and is readable
-            if not audio_file_path.exists():
-                logger.error(f"Audio file not found: {audio_file_path}")
-                raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
-            
-            if not os.access(audio_file_path, os.R_OK):
-                logger.error(f"Audio file not readable: {audio_file_path}")
-                raise PermissionError(f"Audio file not readable: {audio_file_path}")
-            
-            # Read the audio file
-            try:
-                with io.open(audio_file_path, "rb") as audio_file:
-                    content = audio_file.read()
-                logger.info(f"Successfully read audio file, size: {len(content)} bytes")
-                
-                if len(content) == 0:
-                    logger.error("Audio file is empty")
-                    raise ValueError("Audio file is empty")
-                    
-            except IOError as io_error:
-                logger.error(f"Failed to read audio file: {str(io_error)}")
-                raise IOError(f"Failed to read audio file: {str(io_error)}")
+            content = await asyncio.to_thread(audio_file_path.read_bytes)
+        except IOError as io_error:
+            logger.error(f"Failed to read audio file: {str(io_error)}")
+            raise IOError(f"Failed to read audio file: {str(io_error)}")
+
+        return await self.transcribe(content)
+
+    async def transcribe_upload(self, upload: UploadFile) -> str:
+        """
+        Transcribe an uploaded audio file.
+
+        The upload's bytes go straight to the recogniser. Only uploads of at
+        least STT_TEMP_FILE_MIN_BYTES, when set, are copied to
+        TEMP_STORAGE_PATH and transcribed from there.
+        """
+        threshold = settings.STT_TEMP_FILE_MIN_BYTES
+        if not threshold or upload.size is None or upload.size < threshold:
+            return await self.transcribe(await upload.read())
+
+        temp_dir = Path(settings.TEMP_STORAGE_PATH)
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        temp_audio_path = temp_dir / f"temp_{uuid.uuid4()}.wav"
+        try:
+            await upload.seek(0)
+            await asyncio.to_thread(_copy_to_file, upload.file, temp_audio_path)
+            return await self.transcribe_audio(temp_audio_path)
+        finally:
+            temp_audio_path.unlink(missing_ok=True)
+
+    async def transcribe(self, audio: AudioSource) -> str:
+        """
+        Transcribe audio held in memory or streamed to the service.
+
+        Args:
+            audio: The encoded audio as bytes, a bytes-like buffer, a binary
+                file object (read from its current position) or an async
+                iterable of chunks, e.g. an upload's request stream
+
+        Returns:
+            The combined transcript
+
+        Raises:
+            ValueError: If the audio is empty or contains no speech
+        """
+        if not self.client:
+            raise RuntimeError("STT service not properly initialized")
+
+        try:
+            content = await _read_audio(audio)
+            logger.info(f"Received audio, size: {len(content)} bytes")
+
+            if len(content) == 0:
+                logger.error("Audio is empty")
+                raise ValueError("Audio is empty")
+
+            # WAV uploads become mono LINEAR16 at no more than STT_TARGET_SAMPLE_RATE
+            content, sample_rate = await asyncio.to_thread(
+                prepare_for_recognition, content, settings.STT_TARGET_SAMPLE_RATE
+            )
+            logger.info(f"Prepared audio, size: {len(content)} bytes, sample rate: {sample_rate or 'configured'}")
+
+            if settings.STT_VAD_ENABLED:
+                content = await self._trim_silence(content, sample_rate)
 
             # Configure the recognition settings
             try:
-                config = speech.RecognitionConfig(
-                    encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                    sample_rate_hertz=int(os.getenv('STT_SAMPLE_RATE', '22050')),
-                    language_code=os.getenv('STT_LANGUAGE', 'en-US'),
-                    enable_automatic_punctuation=True,
-                    model="latest_long",
-                    use_enhanced=True,
-                    audio_channel_count=1,
-                    enable_word_time_offsets=True,
-                    profanity_filter=False
-                )
+                config = _recognition_config(sample_rate)
                 logger.info("Recognition config created")
 
                 # Create the audio object
@@ -87,9 +238,19 @@ class STTService:
 
             # Perform the transcription
             logger.info("Starting recognition request")
+            started = time.perf_counter()
             try:
-                response = self.client.recognize(config=config, audio=audio)
-                logger.info(f"Recognition completed, results: {response.results}")
+                # The Speech client is synchronous; keep the event loop free
+                if _duration_seconds(content, sample_rate) > settings.STT_LONG_RUNNING_MIN_SECONDS:
+                    # Synchronous recognition only accepts about a minute of audio
+                    logger.info("Using long-running recognition")
+                    response = await asyncio.to_thread(self._long_running_recognize, config, audio)
+                else:
+                    response = await asyncio.to_thread(self.client.recognize, config=config, audio=audio)
+                logger.info(
+                    f"Recognition completed in {(time.perf_counter() - started) * 1000:.0f} ms "
+                    f"for {len(content)} bytes, results: {response.results}"
+                )
             except Exception as recognition_error:
                 logger.error(f"Recognition request failed: {str(recognition_error)}\n{traceback.format_exc()}")
                 raise Exception(f"Speech recognition failed: {str(recognition_error)}")
@@ -121,5 +282,100 @@ class STTService:
             logger.error(f"Error in transcribing audio: {str(e)}\n{traceback.format_exc()}")
             raise
 
+    async def _trim_silence(self, content: bytes, sample_rate: Optional[int]) -> bytes:
+        """Cut silence from prepared audio, rejecting clips without speech before the recogniser sees them."""
+        trimmed = await asyncio.to_thread(
+            trim_silence,
+            content,
+            sample_rate or _default_sample_rate(),
+            settings.STT_VAD_THRESHOLD_DB,
+            settings.STT_VAD_PADDING_MS,
+            settings.STT_VAD_MAX_PAUSE_MS
+        )
+        if not trimmed:
+            logger.error("No speech content detected in the audio")
+            raise ValueError("No speech content detected in the audio")
+        saved = len(content) - len(trimmed)
+        logger.info(f"Trimmed silence: {len(content)} -> {len(trimmed)} bytes, {saved} saved ({saved / len(content):.0%})")
+        return trimmed
+
+    def _long_running_recognize(self, config: speech.RecognitionConfig, audio: speech.RecognitionAudio):
+        operation = self.client.long_running_recognize(config=config, audio=audio)
+        return operation.result(timeout=settings.STT_LONG_RUNNING_TIMEOUT_SECONDS)
+
+    async def stream_transcribe(self, audio: AsyncIterable[bytes]) -> AsyncIterator[Transcript]:
+        """
+        Transcribe audio while it is still arriving.
+
+        Chunks are sent to the recogniser as they are received, so
+        recognition overlaps with the upload instead of starting after it.
+        A stream is limited to about five minutes of audio.
+
+        Args:
+            audio: Async iterable of LINEAR16 chunks, e.g. a request body
+                stream; a leading WAV header sets the rate and channels
+
+        Yields:
+            Interim transcripts of the current utterance (is_final False),
+            which later results revise, and each utterance's final
+            transcript (is_final True)
+        """
+        if not self.client:
+            raise RuntimeError("STT service not properly initialized")
+
+        # Streamed audio cannot be resampled as a whole, so it is sent as recorded
+        info, audio = await _split_wav_header(audio)
+        if info is not None and not info.is_linear16:
+            raise ValueError("Streamed WAV audio must be 16-bit PCM")
+        recognition_config = (
+            _recognition_config(info.sample_rate, info.channels) if info is not None else _recognition_config()
+        )
+
+        loop = asyncio.get_running_loop()
+        requests: queue.Queue = queue.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+        config = speech.StreamingRecognitionConfig(config=recognition_config, interim_results=True)
+
+        def request_stream() -> Iterator[speech.StreamingRecognizeRequest]:
+            while (chunk := requests.get()) is not None:
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+        def recognize():
+            # streaming_recognize blocks for the whole stream, so it gets its
+            # own thread rather than one of the default executor's
+            try:
+                for response in self.client.streaming_recognize(config, request_stream()):
+                    for result in response.results:
+                        if result.alternatives:
+                            transcript = Transcript(result.alternatives[0].transcript, result.is_final)
+                            loop.call_soon_threadsafe(results.put_nowait, transcript)
+            except Exception as e:
+                loop.call_soon_threadsafe(results.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(results.put_nowait, None)
+
+        async def feed():
+            try:
+                async for chunk in audio:
+                    for start in range(0, len(chunk), settings.STT_STREAM_CHUNK_BYTES):
+                        requests.put(chunk[start:start + settings.STT_STREAM_CHUNK_BYTES])
+            finally:
+                requests.put(None)
+
+        logger.info("Starting streaming recognition")
+        threading.Thread(target=recognize, name="stt-stream", daemon=True).start()
+        feeder = asyncio.create_task(feed())
+        try:
+            while (item := await results.get()) is not None:
+                if isinstance(item, Exception):
+                    logger.error(f"Streaming recognition failed: {str(item)}")
+                    raise Exception(f"Speech recognition failed: {str(item)}")
+                yield item
+            # Surface a failure to read the upload
+            await feeder
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+
 # Initialize the STT service
-stt_service = STTService() 
\ No newline at end of file
+stt_service = STTService()
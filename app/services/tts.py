@@ -1,9 +1,13 @@
+import asyncio
 import os
+import re
 import uuid
 from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
 from elevenlabs import VoiceSettings
 from elevenlabs.client import ElevenLabs
 from ..config import settings
+from .fakes import FakeElevenLabsClient, FaultInjector
 import logging
 
 # Configure logging
@@ -13,8 +17,15 @@ logger = logging.getLogger(__name__)
 class TTSService:
     def __init__(self):
         try:
-            self.client = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
+            if settings.TTS_BACKEND == "fake":
+                # Offline stand-in that returns silent mp3 frames
+                self.client = FakeElevenLabsClient(FaultInjector.from_settings("TTS"))
+            elif settings.TTS_BACKEND == "elevenlabs":
+                self.client = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
+            else:
+                raise ValueError(f"Unknown TTS backend: {settings.TTS_BACKEND}")
             self.voice_id = "pNInz6obpgDQGcFmaJgB"  # Adam pre-made voice
+            self.incremental_streams: Dict[str, "IncrementalSpeech"] = {}  # Sessions still being synthesised
             logger.info("Successfully initialized TTS service")
         except Exception as e:
             logger.error(f"Failed to initialize TTS service: {str(e)}")
@@ -37,32 +48,9 @@ class TTSService:
             output_path = Path(settings.AUDIO_STORAGE_PATH) / filename
             logger.info(f"Generated output path: {output_path}")
 
-            # Convert text to speech
-            logger.info("Calling ElevenLabs API")
-            response = self.client.text_to_speech.convert(
-                voice_id=self.voice_id,
-                output_format="mp3_22050_32",
-                text=text,
-                model_id="eleven_turbo_v2_5",  # use the turbo model for low latency
-                voice_settings=VoiceSettings(
-                    stability=0.0,
-                    similarity_boost=1.0,
-                    style=0.0,
-                    use_speaker_boost=True,
-                )
-            )
-            logger.info("Received response from ElevenLabs API")
-
-            # Save the audio file
-            try:
-                with open(output_path, "wb") as f:
-                    for chunk in response:
-                        if chunk:
-                            f.write(chunk)
-                logger.info(f"Successfully saved audio file to {output_path}")
-            except Exception as save_error:
-                logger.error(f"Failed to save audio file: {str(save_error)}")
-                raise
+            # The ElevenLabs client is synchronous, so synthesise in a worker
+            # thread to keep the event loop free for concurrent stages
+            await asyncio.to_thread(self._synthesize_to_file, text, output_path)
 
             # Return the relative path as a string
             relative_path = str(Path("audio_storage") / filename)
@@ -73,5 +61,254 @@ class TTSService:
             logger.error(f"Error in text-to-speech conversion: {str(e)}")
             raise Exception(f"Error in text-to-speech conversion: {str(e)}")
 
+    def start_incremental(self) -> "IncrementalSpeech":
+        """
+        Start an incremental synthesis session.
+
+        Text is fed in as it is generated; each complete sentence is synthesised
+        as soon as it is available and its audio is appended to a single mp3
+        that can be served while it is still being written.
+
+        Returns:
+            The IncrementalSpeech session, registered under its stream_id
+        """
+        os.makedirs(settings.AUDIO_STORAGE_PATH, exist_ok=True)
+        stream_id = str(uuid.uuid4())
+        speech = IncrementalSpeech(
+            stream_id=stream_id,
+            synthesize=self._convert,
+            output_path=Path(settings.AUDIO_STORAGE_PATH) / f"{stream_id}.mp3",
+            relative_path=str(Path("audio_storage") / f"{stream_id}.mp3"),
+            min_chars=settings.TTS_MIN_SENTENCE_CHARS
+        )
+        self.incremental_streams[stream_id] = speech
+        speech.add_done_callback(lambda: self.incremental_streams.pop(stream_id, None))
+        return speech
+
+    def _convert(self, text: str) -> Iterator[bytes]:
+        """
+        Call ElevenLabs and return an iterator over the mp3 bytes (blocking)
+        """
+        logger.info("Calling ElevenLabs API")
+        return self.client.text_to_speech.convert(
+            voice_id=self.voice_id,
+            output_format="mp3_22050_32",
+            text=text,
+            model_id="eleven_turbo_v2_5",  # use the turbo model for low latency
+            voice_settings=VoiceSettings(
+                stability=0.0,
+                similarity_boost=1.0,
+                style=0.0,
+                use_speaker_boost=True,
+            )
+        )
+
+    def _synthesize_to_file(self, text: str, output_path: Path):
+        """
+        Call ElevenLabs and stream the resulting audio into output_path (blocking)
+        """
+        # Convert text to speech
+        response = self._convert(text)
+        logger.info("Received response from ElevenLabs API")
+
+        # Save the audio file
+        try:
+            with open(output_path, "wb") as f:
+                for chunk in response:
+                    if chunk:
+                        f.write(chunk)
+            logger.info(f"Successfully saved audio file to {output_path}")
+        except Exception as save_error:
+            logger.error(f"Failed to save audio file: {str(save_error)}")
+            raise
+
+
+class SentenceSplitter:
+    """
+    Accumulates streamed text and releases it one complete sentence at a time.
+
+    Sentences shorter than min_chars are merged with the following one so the
+    synthesiser is not called for fragments like "Yes."
+    """
+
+    # Sentence-ending punctuation (optionally followed by closing quotes) and whitespace
+    BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text and return any sentences it completed.
+        """
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in self.BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) >= self.min_chars:
+                sentences.append(candidate)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """
+        Return whatever text remains once the stream has ended.
+        """
+        remainder, self._buffer = self._buffer.strip(), ""
+        return [remainder] if remainder else []
+
+
+class IncrementalSpeech:
+    """
+    One incremental synthesis session.
+
+    Sentences are synthesised in order by a single worker task; every audio
+    chunk is appended to the output file and to an in-memory chunk list that
+    any number of listeners can replay from the start and then follow live.
+    The file is written as <output>.part and renamed when complete, so other
+    workers can follow it with follow_partial_audio.
+    """
+
+    def __init__(
+        self,
+        stream_id: str,
+        synthesize: Callable[[str], Iterable[bytes]],
+        output_path: Path,
+        relative_path: str,
+        min_chars: int = 20
+    ):
+        self.stream_id = stream_id
+        self.output_path = output_path
+        self.relative_path = relative_path
+        self._synthesize = synthesize
+        self._splitter = SentenceSplitter(min_chars=min_chars)
+        self._sentences: asyncio.Queue = asyncio.Queue()
+        self._chunks: List[bytes] = []
+        self._changed = asyncio.Condition()
+        self._done_callbacks: List[Callable[[], None]] = []
+        self.error: Optional[BaseException] = None
+        self.finished = False
+        self._worker = asyncio.create_task(self._run())
+
+    def feed(self, text: str):
+        """Add streamed text; completed sentences are queued for synthesis."""
+        for sentence in self._splitter.feed(text):
+            self._sentences.put_nowait(sentence)
+
+    def finish(self):
+        """Mark the end of the text stream and queue the final fragment."""
+        for sentence in self._splitter.flush():
+            self._sentences.put_nowait(sentence)
+        self._sentences.put_nowait(None)
+
+    def cancel(self):
+        """Abandon the session, e.g. when the round failed."""
+        self._worker.cancel()
+
+    def add_done_callback(self, callback: Callable[[], None]):
+        self._done_callbacks.append(callback)
+
+    async def wait_closed(self) -> str:
+        """
+        Wait until every sentence has been synthesised.
+
+        Returns:
+            The relative path to the complete mp3 file
+        """
+        await asyncio.shield(self._worker)
+        if self.error is not None:
+            raise Exception(f"Error in text-to-speech conversion: {str(self.error)}")
+        return self.relative_path
+
+    async def iter_audio(self) -> AsyncIterator[bytes]:
+        """
+        Yield the audio produced so far, then each new chunk as it arrives.
+        """
+        position = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: position < len(self._chunks) or self.finished)
+                chunks = self._chunks[position:]
+                finished = self.finished
+            position += len(chunks)
+            for chunk in chunks:
+                yield chunk
+            if finished and position >= len(self._chunks):
+                return
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        partial_path = partial_audio_path(self.output_path)
+        try:
+            with open(partial_path, "wb") as output:
+                while True:
+                    sentence = await self._sentences.get()
+                    if sentence is None:
+                        break
+                    logger.info(f"Synthesising sentence for stream {self.stream_id}: {sentence}")
+                    await asyncio.to_thread(self._synthesize_sentence, sentence, output, loop)
+            os.replace(partial_path, self.output_path)
+            logger.info(f"Incremental audio complete: {self.output_path}")
+        except BaseException as e:
+            self.error = e
+            # Followers in other workers stop once the partial file is gone
+            if partial_path.exists():
+                os.remove(partial_path)
+            logger.error(f"Error in incremental text-to-speech: {str(e)}")
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            async with self._changed:
+                self.finished = True
+                self._changed.notify_all()
+            for callback in self._done_callbacks:
+                callback()
+
+    def _synthesize_sentence(self, sentence: str, output, loop: asyncio.AbstractEventLoop):
+        """Synthesise one sentence in a worker thread, publishing chunks as they arrive (blocking)."""
+        for chunk in self._synthesize(sentence):
+            if chunk:
+                output.write(chunk)
+                output.flush()
+                asyncio.run_coroutine_threadsafe(self._publish(chunk), loop).result()
+
+    async def _publish(self, chunk: bytes):
+        async with self._changed:
+            self._chunks.append(chunk)
+            self._changed.notify_all()
+
+def partial_audio_path(output_path: Path) -> Path:
+    """Where an IncrementalSpeech writes its mp3 until it is complete."""
+    return output_path.with_name(f"{output_path.name}.part")
+
+
+async def follow_partial_audio(output_path: Path, poll_interval: float = 0.05) -> AsyncIterator[bytes]:
+    """
+    Yield an mp3 that another worker's IncrementalSpeech is still writing,
+    following the partial file until it is renamed to output_path.
+
+    Stops early if the synthesis fails and the partial file is removed.
+    """
+    partial_path = partial_audio_path(output_path)
+    try:
+        audio = open(partial_path, "rb")
+    except FileNotFoundError:
+        # Finished in the meantime
+        audio = open(output_path, "rb")
+    with audio:
+        while True:
+            chunk = await asyncio.to_thread(audio.read, 64 * 1024)
+            if chunk:
+                yield chunk
+                continue
+            # The file is closed before it is renamed, so once the final path
+            # exists everything has been read
+            if output_path.exists() or not partial_path.exists():
+                return
+            await asyncio.sleep(poll_interval)
+
 # Initialize the TTS service
-tts_service = TTSService() 
\ No newline at end of file
+tts_service = TTSService()
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Storage Package
+"""
+
+from typing import Tuple
+from ..config import settings
+from .base import ConversationStore, DebateStore, RoundVersion
+from .journal import DebateJournal
+from .memory import JournalDebateStore, MemoryConversationStore
+from .sqlite import SqliteConversationStore, SqliteDatabase, SqliteDebateStore
+from .writer import JournalWriter
+
+__all__ = [
+    "ConversationStore",
+    "DebateStore",
+    "DebateJournal",
+    "JournalDebateStore",
+    "JournalWriter",
+    "MemoryConversationStore",
+    "RoundVersion",
+    "SqliteConversationStore",
+    "SqliteDatabase",
+    "SqliteDebateStore",
+    "create_stores",
+    "debate_store",
+    "conversation_store",
+]
+
+
+def create_stores() -> Tuple[DebateStore, ConversationStore]:
+    """
+    Build the debate and conversation stores selected by STORAGE_BACKEND.
+
+    Backends:
+        - json: debates persisted to DEBATE_DATA_PATH through an append-only
+          journal and loaded on first access; conversations in memory within
+          the CONVERSATION_* bounds, spilled to CONVERSATION_SPILL_PATH if set.
+          Single process only: the journal is locked at startup
+        - sqlite: both in indexed tables of STORAGE_SQLITE_PATH, shared by
+          every worker process that opens the same file, so requests need
+          not be routed to the worker that started a session
+    """
+    if settings.STORAGE_BACKEND == "sqlite":
+        database = SqliteDatabase(settings.STORAGE_SQLITE_PATH)
+        return SqliteDebateStore(database), SqliteConversationStore(database)
+    if settings.STORAGE_BACKEND == "json":
+        journal = DebateJournal(
+            settings.DEBATE_DATA_PATH,
+            settings.DEBATE_JOURNAL_PATH,
+            compact_min_bytes=settings.DEBATE_JOURNAL_COMPACT_MIN_BYTES,
+            compact_ratio=settings.DEBATE_JOURNAL_COMPACT_RATIO
+        )
+        writer = JournalWriter(
+            journal,
+            durability=settings.DEBATE_DURABILITY,
+            flush_interval=settings.DEBATE_FLUSH_INTERVAL_MS / 1000,
+            max_batch_events=settings.DEBATE_FLUSH_MAX_EVENTS
+        )
+        conversation_store = MemoryConversationStore(
+            ttl_seconds=settings.CONVERSATION_TTL_SECONDS,
+            max_entries=settings.CONVERSATION_MAX_ENTRIES,
+            max_bytes=settings.CONVERSATION_MAX_BYTES,
+            spill_dir=settings.CONVERSATION_SPILL_PATH
+        )
+        return JournalDebateStore(journal, writer, cache_size=settings.DEBATE_CACHE_MAX_DEBATES), conversation_store
+    raise ValueError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
+
+
+debate_store, conversation_store = create_stores()
@@ -0,0 +1,160 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+from ..models.records import ConversationRound
+
+
+class RoundVersion(NamedTuple):
+    """
+    Version of a debate or conversation.
+
+    Rounds are only ever appended, so the round count is a version that
+    increases with every change; updated_at is when the last round (or, with
+    none, the session) was stored.
+    """
+
+    version: int
+    updated_at: datetime
+
+
+def as_datetime(value: Union[datetime, str]) -> datetime:
+    """Accept a stored timestamp as a datetime or as its ISO 8601 / str() text."""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+class DebateStore(ABC):
+    """
+    Storage for debates, their participants and their rounds.
+
+    Debates are dicts with topic, start_time, participants (speaker ID to
+    side and join_time) and rounds. Every method is safe to await from the
+    event loop; backends that block do their work in a thread.
+    """
+
+    @abstractmethod
+    async def create_debate(self, debate_id: str, debate: Dict[str, Any]):
+        """Store a new debate."""
+
+    @abstractmethod
+    async def get_debate(self, debate_id: str, include_rounds: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a debate.
+
+        Args:
+            debate_id: The debate to fetch
+            include_rounds: Whether to load the rounds as well
+
+        Returns:
+            The debate, or None if it does not exist
+        """
+
+    @abstractmethod
+    async def get_version(self, debate_id: str) -> Optional[RoundVersion]:
+        """Fetch a debate's version without its rounds, or None if it does not exist."""
+
+    @abstractmethod
+    async def add_round(self, debate_id: str, round_data: Dict[str, Any]) -> int:
+        """
+        Append a round to a debate.
+
+        Returns:
+            The round_index assigned to the round
+        """
+
+    @abstractmethod
+    async def get_rounds(
+        self,
+        debate_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch a range of a debate's rounds in order.
+
+        Args:
+            debate_id: The debate to read
+            since_round: Only rounds with a greater round_index
+            limit: At most this many rounds
+        """
+
+    def open(self):
+        """Take any locks the store needs before serving requests, once the server starts."""
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every accepted write has been persisted.
+
+        Returns:
+            False if the timeout expired first
+        """
+        return True
+
+    def close(self):
+        """Release any files or connections held by the store."""
+
+
+class ConversationStore(ABC):
+    """
+    Storage for agent-training conversations and their rounds.
+
+    Conversations are dicts with topic, topic_info, user_side, start_time and
+    rounds, a list of ConversationRound records. Every method is safe to
+    await from the event loop.
+    """
+
+    @abstractmethod
+    async def create_conversation(self, conversation_id: str, conversation: Dict[str, Any]):
+        """Store a new conversation."""
+
+    @abstractmethod
+    async def get_conversation(self, conversation_id: str, include_rounds: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a conversation.
+
+        Args:
+            conversation_id: The conversation to fetch
+            include_rounds: Whether to load the rounds as well
+
+        Returns:
+            The conversation, or None if it does not exist
+        """
+
+    @abstractmethod
+    async def get_version(self, conversation_id: str) -> Optional[RoundVersion]:
+        """Fetch a conversation's version without its rounds, or None if it does not exist."""
+
+    @abstractmethod
+    async def add_round(self, conversation_id: str, record: ConversationRound) -> int:
+        """
+        Append a round to a conversation and set its round_index.
+
+        Returns:
+            The round_index assigned to the round
+        """
+
+    @abstractmethod
+    async def get_rounds(
+        self,
+        conversation_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[ConversationRound]:
+        """
+        Fetch a range of a conversation's rounds in order.
+
+        Args:
+            conversation_id: The conversation to read
+            since_round: Only rounds with a greater round_index
+            limit: At most this many rounds
+        """
+
+    @abstractmethod
+    async def get_last_round(self, conversation_id: str) -> Optional[ConversationRound]:
+        """Fetch the latest round of a conversation, or None if it has none."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupancy and eviction counters, for backends that keep any."""
+        return {}
+
+    def close(self):
+        """Release any files or connections held by the store."""
@@ -0,0 +1,149 @@
+import json
+import mmap
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+INDEX_MAGIC = b"DEBATEIDX1"
+OFFSET_WIDTH = 16
+LENGTH_WIDTH = 12
+
+
+class SnapshotIndex:
+    """
+    Sorted, fixed-width offset index for a snapshot file.
+
+    The file starts with a header line (magic, key width, record count and
+    the size of the snapshot it describes), followed by one record per
+    debate: the debate ID null-padded to the key width, the byte offset and
+    the byte length of its JSON value. Records are sorted by key, so a lookup
+    is a binary search over the memory-mapped file and opening the index
+    costs the same whatever the archive size.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.key_width = 0
+        self.count = 0
+        self.snapshot_size = 0
+        self._map: Optional[mmap.mmap] = None
+        self._header_size = 0
+        self._record_size = 0
+
+    @classmethod
+    def write(cls, path: str, entries: Iterable[Tuple[str, int, int]], snapshot_size: int):
+        """
+        Write an index atomically.
+
+        Args:
+            path: Index file path
+            entries: (debate_id, offset, length) tuples in any order
+            snapshot_size: Size of the snapshot the offsets refer to
+        """
+        records = sorted((debate_id.encode("utf-8"), offset, length) for debate_id, offset, length in entries)
+        key_width = max((len(key) for key, _, _ in records), default=1)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(b"%s %d %d %d\n" % (INDEX_MAGIC, key_width, len(records), snapshot_size))
+            for key, offset, length in records:
+                f.write(key.ljust(key_width, b"\0") + b"%0*d%0*d\n" % (OFFSET_WIDTH, offset, LENGTH_WIDTH, length))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def open(self) -> bool:
+        """
+        Map the index file.
+
+        Returns:
+            False if the file is missing or malformed
+        """
+        self.close()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return False
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._map.find(b"\n")
+        fields = self._map[:header_end].split(b" ")
+        if len(fields) != 4 or fields[0] != INDEX_MAGIC:
+            self.close()
+            return False
+        self.key_width, self.count, self.snapshot_size = (int(field) for field in fields[1:])
+        self._header_size = header_end + 1
+        self._record_size = self.key_width + OFFSET_WIDTH + LENGTH_WIDTH + 1
+        if len(self._map) != self._header_size + self.count * self._record_size:
+            self.close()
+            return False
+        return True
+
+    def _record(self, position: int) -> Tuple[bytes, int, int]:
+        start = self._header_size + position * self._record_size
+        key = self._map[start:start + self.key_width]
+        offset = int(self._map[start + self.key_width:start + self.key_width + OFFSET_WIDTH])
+        length = int(self._map[start + self.key_width + OFFSET_WIDTH:start + self._record_size - 1])
+        return key, offset, length
+
+    def lookup(self, debate_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Find a debate's value in the snapshot.
+
+        Returns:
+            (offset, length), or None if the debate is not in the snapshot
+        """
+        if self._map is None:
+            return None
+        key = debate_id.encode("utf-8")
+        if len(key) > self.key_width:
+            return None
+        key = key.ljust(self.key_width, b"\0")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            start = self._header_size + middle * self._record_size
+            if self._map[start:start + self.key_width] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            found, offset, length = self._record(low)
+            if found == key:
+                return offset, length
+        return None
+
+    def __iter__(self) -> Iterator[Tuple[str, int, int]]:
+        """Yield (debate_id, offset, length) in key order."""
+        for position in range(self.count if self._map is not None else 0):
+            key, offset, length = self._record(position)
+            yield key.rstrip(b"\0").decode("utf-8"), offset, length
+
+    def __len__(self) -> int:
+        return self.count if self._map is not None else 0
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def scan_snapshot(data: Union[bytes, mmap.mmap]) -> List[Tuple[str, int, int]]:
+    """
+    Rebuild index entries from a snapshot in the one-debate-per-line layout.
+
+    Returns:
+        (debate_id, offset, length) tuples
+    """
+    decoder = json.JSONDecoder()
+    entries = []
+    position = data.find(b"\n") + 1
+    while position < len(data):
+        end = data.find(b"\n", position)
+        if end < 0:
+            end = len(data)
+        line = data[position:end]
+        if line.startswith(b'"'):
+            text = line.decode("utf-8")
+            debate_id, key_end = decoder.raw_decode(text)
+            prefix = len(text[:key_end].encode("utf-8")) + len(b": ")
+            value_end = len(line) - 1 if line.endswith(b",") else len(line)
+            entries.append((debate_id, position + prefix, value_end - prefix))
+        position = end + 1
+    return entries
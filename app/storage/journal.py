@@ -0,0 +1,350 @@
+import heapq
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .index import SnapshotIndex, scan_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where the journal is not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_DEBATE_ID = re.compile(rb'"debate_id": ("(?:[^"\\]|\\.)*")')
+
+
+class DebateJournal:
+    """
+    Append-only persistence for debates with lazy, indexed reads.
+
+    Each change is written as one JSON line ("start" with the whole new debate,
+    "round" with one new round) to the journal, so the cost of a write does
+    not depend on how much history is stored. When the journal outgrows the
+    snapshot it is compacted into a new snapshot through a temporary file and
+    an atomic rename, and the journal is truncated.
+
+    The snapshot is still one JSON object of debates (readable as the
+    original debate_data.json), laid out one debate per line with a sorted
+    offset index beside it (see SnapshotIndex). Opening the journal maps the
+    index and scans only the journal tail; a debate is parsed when it is
+    first read, straight from the memory-mapped snapshot plus its journal
+    events. Compaction copies unchanged debates byte for byte.
+
+    Replay is idempotent (a debate is only started once and a round is only
+    appended at its own round_index), so a crash between writing the snapshot
+    and truncating the journal cannot duplicate rounds. A torn final line
+    from a crash mid-append is dropped, and an index that does not match its
+    snapshot is rebuilt.
+
+    Only one process may write a journal: the writer holds an exclusive lock
+    on <snapshot>.lock, and a second process fails when it tries to take it.
+    Several workers need the sqlite backend instead.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        journal_path: Optional[str] = None,
+        compact_min_bytes: int = 4 * 1024 * 1024,
+        compact_ratio: float = 1.0
+    ):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or f"{snapshot_path}.journal"
+        self.index_path = f"{snapshot_path}.index"
+        self.lock_path = f"{snapshot_path}.lock"
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_ratio = compact_ratio
+        self.snapshot_bytes = 0
+        self.journal_bytes = 0
+        self.appends = 0
+        self.compactions = 0
+        self.reads = 0
+        self.index = SnapshotIndex(self.index_path)
+        # Journal events not yet compacted: debate ID -> [(offset, length)]
+        self._tail: Dict[str, List[Tuple[int, int]]] = {}
+        self._snapshot_map: Optional[mmap.mmap] = None
+        self._file = None
+        self._lock_file = None
+        self._opened = False
+        # Serialises reads against appends and compaction, which run on the writer thread
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def apply(debates: Dict[str, dict], event: Dict[str, Any]) -> bool:
+        """
+        Apply one journal event to the in-memory state.
+
+        Returns:
+            True if the event changed the state, False if it was already applied
+        """
+        debate_id = event["debate_id"]
+        if event["op"] == "start":
+            if debate_id in debates:
+                return False
+            debates[debate_id] = event["debate"]
+            return True
+        if event["op"] == "round":
+            debate = debates.get(debate_id)
+            round_data = event["round"]
+            if debate is None or round_data["round_index"] != len(debate["rounds"]):
+                return False
+            debate["rounds"].append(round_data)
+            return True
+        raise ValueError(f"Unknown journal operation: {event['op']}")
+
+    def open(self):
+        """
+        Map the snapshot and its index and index the journal tail.
+
+        A snapshot in the original single-line layout is rewritten in the
+        indexed layout once.
+        """
+        with self._lock:
+            if self._opened:
+                return
+            if os.path.exists(self.snapshot_path) and os.path.getsize(self.snapshot_path) > 0:
+                self._open_snapshot()
+            self._scan_journal()
+            self._opened = True
+            logger.info(
+                f"Opened debate journal: {len(self.index)} debates in snapshot, "
+                f"{len(self._tail)} with journal events"
+            )
+
+    def lock(self):
+        """
+        Take the single-writer lock, if this process does not hold it yet.
+
+        Raises:
+            RuntimeError: If another process is writing the journal
+        """
+        with self._lock:
+            if self._lock_file is not None or fcntl is None:
+                return
+            lock_file = open(self.lock_path, "a")
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                raise RuntimeError(
+                    f"{self.snapshot_path} is being written by another process; "
+                    "the json storage backend supports a single worker, use STORAGE_BACKEND=sqlite for several"
+                )
+            self._lock_file = lock_file
+
+    def _open_snapshot(self):
+        with open(self.snapshot_path, "rb") as f:
+            self._snapshot_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.snapshot_bytes = len(self._snapshot_map)
+        if self.index.open() and self.index.snapshot_size == self.snapshot_bytes:
+            return
+
+        # The indexed layout puts every debate key at the start of a line
+        if self._snapshot_map[:3] in (b'{\n"', b"{\n}"):
+            logger.warning(f"Rebuilding snapshot index for {self.snapshot_path}")
+            SnapshotIndex.write(self.index_path, scan_snapshot(self._snapshot_map), self.snapshot_bytes)
+            self.index.open()
+            return
+
+        logger.info(f"Converting {self.snapshot_path} to the indexed layout")
+        debates = json.loads(self._snapshot_map[:])
+        self._snapshot_map.close()
+        self._snapshot_map = None
+        self._write_snapshot((debate_id, json.dumps(debate, default=str).encode("utf-8"))
+                             for debate_id, debate in sorted(debates.items()))
+
+    def _scan_journal(self):
+        self._tail = {}
+        self.journal_bytes = 0
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                match = _DEBATE_ID.search(line)
+                debate_id = json.loads(match.group(1)) if match else json.loads(line)["debate_id"]
+                self._tail.setdefault(debate_id, []).append((offset, len(line)))
+                offset += len(line)
+        if offset < os.path.getsize(self.journal_path):
+            logger.warning(f"Ignoring torn journal entry at byte {offset} of {self.journal_path}")
+            # Drop the torn tail so new events start on a clean line
+            os.truncate(self.journal_path, offset)
+        self.journal_bytes = offset
+
+    def contains(self, debate_id: str) -> bool:
+        """Whether a debate exists in the snapshot or the journal."""
+        with self._lock:
+            self.open()
+            return debate_id in self._tail or self.index.lookup(debate_id) is not None
+
+    def read_debate(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse one debate from the snapshot and replay its journal events.
+
+        Returns:
+            The debate, or None if it does not exist
+        """
+        with self._lock:
+            self.open()
+            self.reads += 1
+            debates: Dict[str, dict] = {}
+            location = self.index.lookup(debate_id)
+            if location is not None:
+                offset, length = location
+                debates[debate_id] = json.loads(self._snapshot_map[offset:offset + length])
+            events = self._tail.get(debate_id)
+            if events:
+                with open(self.journal_path, "rb") as f:
+                    for offset, length in events:
+                        self.apply(debates, json.loads(os.pread(f.fileno(), length, offset)))
+            return debates.get(debate_id)
+
+    def debate_ids(self) -> Iterator[str]:
+        """Yield every debate ID in key order."""
+        with self._lock:
+            self.open()
+            ids = [debate_id for debate_id, _, _ in self.index]
+            tail = sorted(set(self._tail) - set(ids))
+        previous = None
+        for debate_id in heapq.merge(ids, tail):
+            if debate_id != previous:
+                yield debate_id
+            previous = debate_id
+
+    def load(self) -> Dict[str, dict]:
+        """
+        Read every debate into memory, e.g. for migrations and tools.
+
+        Returns:
+            Dict mapping debate IDs to debate data
+        """
+        return {debate_id: self.read_debate(debate_id) for debate_id in self.debate_ids()}
+
+    def append(self, event: Dict[str, Any]):
+        """
+        Append one event to the journal and flush it to the operating system.
+        """
+        self.append_many([event])
+
+    def append_many(self, events: List[Dict[str, Any]], fsync: bool = False):
+        """
+        Append events with a single write.
+
+        Args:
+            events: Events in the order they happened
+            fsync: Also force the data to stable storage before returning
+        """
+        lines = [(json.dumps(event, default=str) + "\n").encode("utf-8") for event in events]
+        with self._lock:
+            self.lock()
+            self.open()
+            if self._file is None:
+                self._file = open(self.journal_path, "ab")
+            self._file.write(b"".join(lines))
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+            offset = self.journal_bytes
+            for event, line in zip(events, lines):
+                self._tail.setdefault(event["debate_id"], []).append((offset, len(line)))
+                offset += len(line)
+            self.journal_bytes = offset
+            self.appends += len(events)
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether the journal has grown large enough relative to the snapshot."""
+        return self.journal_bytes >= max(self.compact_min_bytes, self.snapshot_bytes * self.compact_ratio)
+
+    def _write_snapshot(self, entries):
+        """
+        Write (debate_id, value bytes) entries, in key order, as the new snapshot
+        and index, then map them.
+        """
+        temp_path = f"{self.snapshot_path}.tmp"
+        index_entries = []
+        with open(temp_path, "wb") as f:
+            f.write(b"{")
+            position = 1
+            separator = b"\n"
+            for debate_id, value in entries:
+                key = separator + json.dumps(debate_id).encode("utf-8") + b": "
+                f.write(key)
+                f.write(value)
+                index_entries.append((debate_id, position + len(key), len(value)))
+                position += len(key) + len(value)
+                separator = b",\n"
+            f.write(b"\n}\n")
+            f.flush()
+            os.fsync(f.fileno())
+            size = position + 3
+
+        # The index records the snapshot size, so a crash between these two
+        # renames is detected on open and the index is rebuilt
+        SnapshotIndex.write(self.index_path, index_entries, size)
+        if self._snapshot_map is not None:
+            self._snapshot_map.close()
+            self._snapshot_map = None
+        os.replace(temp_path, self.snapshot_path)
+        self.index.open()
+        with open(self.snapshot_path, "rb") as f:
+            self._snapshot_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.snapshot_bytes = size
+
+    def compact(self):
+        """
+        Merge the journal into a new snapshot and start an empty journal.
+
+        Debates without journal events are copied from the old snapshot
+        without being parsed.
+        """
+        with self._lock:
+            self.lock()
+            self.open()
+
+            def entries():
+                for debate_id in self.debate_ids():
+                    if debate_id in self._tail:
+                        yield debate_id, json.dumps(self.read_debate(debate_id), default=str).encode("utf-8")
+                    else:
+                        offset, length = self.index.lookup(debate_id)
+                        yield debate_id, self._snapshot_map[offset:offset + length]
+
+            # Entries are read from the old snapshot while the new one is written
+            self._write_snapshot(entries())
+
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            open(self.journal_path, "wb").close()
+            self._tail = {}
+            self.journal_bytes = 0
+            self.compactions += 1
+            logger.info(f"Compacted debate journal into {self.snapshot_path} ({self.snapshot_bytes} bytes)")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                # Closing the file releases the lock
+                self._lock_file.close()
+                self._lock_file = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "snapshot_bytes": self.snapshot_bytes,
+            "journal_bytes": self.journal_bytes,
+            "indexed_debates": len(self.index),
+            "appends": self.appends,
+            "reads": self.reads,
+            "compactions": self.compactions
+        }
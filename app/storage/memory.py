@@ -0,0 +1,413 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+from ..models.records import ConversationRound
+from ..models.schemas import Side
+from .base import ConversationStore, DebateStore, RoundVersion, as_datetime
+from .journal import DebateJournal
+from .writer import JournalWriter
+
+
+def _without_rounds(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in record.items() if key != "rounds"}
+
+
+def _round_range(rounds: list, since_round: Optional[int], limit: Optional[int]) -> list:
+    # Rounds are stored at their own round_index
+    start = 0 if since_round is None else since_round + 1
+    return rounds[start:] if limit is None else rounds[start:start + limit]
+
+
+class JournalDebateStore(DebateStore):
+    """
+    Debates persisted through a DebateJournal and loaded on first access.
+
+    Loaded debates are kept in an LRU of at most cache_size entries. A debate
+    with writes the JournalWriter has not finished is pinned, since its
+    on-disk copy is not yet complete; any other debate can be dropped and
+    read back from disk. Writes go through the JournalWriter, so no disk I/O
+    happens on the event loop; in the always durability mode each write
+    still completes before the request returns.
+    """
+
+    def __init__(self, journal: DebateJournal, writer: Optional[JournalWriter] = None, cache_size: int = 256):
+        self.journal = journal
+        self.writer = writer or JournalWriter(journal, durability="always")
+        self.cache_size = cache_size
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        # Writer sequence number of each cached debate's latest write
+        self._pending_writes: Dict[str, int] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+
+    def _save_event(self, debate_id: str, event: Dict[str, Any]) -> int:
+        sequence = self._pending_writes[debate_id] = self.writer.submit(event)
+        if self.journal.needs_compaction and not self.writer.compaction_pending:
+            self.writer.request_compaction()
+        return sequence
+
+    async def _wait_written(self, sequence: int):
+        # The always mode's guarantee, kept without blocking the event loop
+        if self.writer.durability == "always":
+            await asyncio.to_thread(self.writer.wait_written, sequence)
+
+    def _cache_debate(self, debate_id: str, debate: dict):
+        self._cache[debate_id] = debate
+        self._cache.move_to_end(debate_id)
+        if len(self._cache) <= self.cache_size:
+            return
+        written = self.writer.written
+        for candidate in list(self._cache):
+            if len(self._cache) <= self.cache_size:
+                break
+            if self._pending_writes.get(candidate, 0) <= written:
+                del self._cache[candidate]
+                self._pending_writes.pop(candidate, None)
+                self.evictions += 1
+
+    async def _load(self, debate_id: str) -> Optional[dict]:
+        debate = self._cache.get(debate_id)
+        if debate is not None:
+            self._cache.move_to_end(debate_id)
+            self.hits += 1
+            return debate
+
+        # Concurrent requests for the same cold debate share one read
+        loading = self._loading.get(debate_id)
+        if loading is not None:
+            await loading
+            return await self._load(debate_id)
+
+        loading = self._loading[debate_id] = asyncio.get_running_loop().create_future()
+        try:
+            # Debates are only modified while cached, so the copy on disk is current
+            debate = await asyncio.to_thread(self.journal.read_debate, debate_id)
+            self.loads += 1
+            if debate is not None:
+                self._cache_debate(debate_id, debate)
+            return debate
+        finally:
+            del self._loading[debate_id]
+            loading.set_result(None)
+
+    async def create_debate(self, debate_id: str, debate: Dict[str, Any]):
+        # The event gets its own rounds list, as it may be serialised on the writer thread
+        sequence = self._save_event(debate_id, {"op": "start", "debate_id": debate_id, "debate": {**debate, "rounds": []}})
+        self._cache_debate(debate_id, {**debate, "rounds": []})
+        await self._wait_written(sequence)
+
+    async def get_debate(self, debate_id: str, include_rounds: bool = True) -> Optional[Dict[str, Any]]:
+        debate = await self._load(debate_id)
+        if debate is None or include_rounds:
+            return debate
+        return _without_rounds(debate)
+
+    async def get_version(self, debate_id: str) -> Optional[RoundVersion]:
+        debate = await self._load(debate_id)
+        if debate is None:
+            return None
+        rounds = debate["rounds"]
+        return RoundVersion(len(rounds), as_datetime(rounds[-1]["timestamp"] if rounds else debate["start_time"]))
+
+    async def add_round(self, debate_id: str, round_data: Dict[str, Any]) -> int:
+        debate = await self._load(debate_id)
+        if debate is None:
+            raise KeyError(debate_id)
+        rounds = debate["rounds"]
+        stored = {"round_index": len(rounds), **round_data}
+        rounds.append(stored)
+        await self._wait_written(self._save_event(debate_id, {"op": "round", "debate_id": debate_id, "round": stored}))
+        return stored["round_index"]
+
+    async def get_rounds(
+        self,
+        debate_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        debate = await self._load(debate_id)
+        return _round_range(debate["rounds"], since_round, limit) if debate is not None else []
+
+    def open(self):
+        # Fail at startup, not on the first write, if another worker holds the journal
+        self.journal.lock()
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        return await asyncio.to_thread(self.writer.flush, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached_debates": len(self._cache),
+            "cache_size": self.cache_size,
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "writer": self.writer.stats()
+        }
+
+    def close(self):
+        # Callers flush first with their own timeout, so closing never blocks
+        self.writer.close(timeout=0)
+
+
+class MemoryConversationStore(ConversationStore):
+    """
+    Conversations held in memory within an idle TTL and an entry and byte budget.
+
+    Conversations are kept in least-recently-used order. One left idle for
+    longer than ttl_seconds is dropped. While the store holds more than
+    max_entries conversations, or more than max_bytes of them, the least
+    recently used are evicted: written to spill_dir if one is set, and read
+    back transparently on their next access, or dropped otherwise. Sizes are
+    estimated from the JSON encoding of each record, counted once when it is
+    stored. A bound of 0 disables it. Spill files are written, read back and
+    swept on worker threads, so no disk I/O happens on the event loop.
+
+    Without a spill directory conversations are lost on restart.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 0,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        spill_dir: Optional[str] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.conversations: "OrderedDict[str, dict]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.spills = 0
+        self.rehydrations = 0
+        self._sizes: Dict[str, int] = {}
+        self._last_access: Dict[str, float] = {}
+        self._last_sweep = time.time()
+        # Conversations evicted from memory whose spill file is still being written
+        self._spilling: Dict[str, dict] = {}
+        # Serialises spill writes, reads and sweeps, which run off the event loop
+        self._disk = asyncio.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _spill_path(self, conversation_id: str) -> str:
+        return os.path.join(self.spill_dir, f"{quote(conversation_id, safe='')}.json")
+
+    def _expired(self, last_access: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - last_access > self.ttl_seconds
+
+    @staticmethod
+    def _size(conversation: dict) -> int:
+        return len(json.dumps(
+            {**conversation, "rounds": [record.to_dict() for record in conversation["rounds"]]},
+            default=str
+        ))
+
+    def _drop(self, conversation_id: str):
+        del self.conversations[conversation_id]
+        del self._last_access[conversation_id]
+        self.bytes -= self._sizes.pop(conversation_id)
+
+    async def _expire(self, now: float):
+        """Drop idle conversations, which sit at the least recently used end."""
+        if self.ttl_seconds <= 0:
+            return
+        while self.conversations:
+            conversation_id = next(iter(self.conversations))
+            if not self._expired(self._last_access[conversation_id], now):
+                break
+            self._drop(conversation_id)
+            self.expirations += 1
+
+        # Spilled conversations expire too, checked at most once per TTL
+        if self.spill_dir and now - self._last_sweep > self.ttl_seconds:
+            self._last_sweep = now
+            async with self._disk:
+                self.expirations += await asyncio.to_thread(self._sweep_spills, now)
+
+    def _sweep_spills(self, now: float) -> int:
+        expired = 0
+        for entry in os.scandir(self.spill_dir):
+            if entry.name.endswith(".json") and self._expired(entry.stat().st_mtime, now):
+                os.remove(entry.path)
+                expired += 1
+        return expired
+
+    async def _evict(self):
+        spilled = []
+        # The conversation just used is kept even if it alone is over budget
+        while len(self.conversations) > 1 and (
+            (self.max_entries > 0 and len(self.conversations) > self.max_entries)
+            or (self.max_bytes > 0 and self.bytes > self.max_bytes)
+        ):
+            conversation_id = next(iter(self.conversations))
+            if self.spill_dir:
+                conversation = self._spilling[conversation_id] = self.conversations[conversation_id]
+                # Encoded here, as later rounds may be added on the loop while the file is written
+                spilled.append((conversation_id, conversation, {
+                    **conversation,
+                    "rounds": [round_record.to_dict() for round_record in conversation["rounds"]],
+                    "last_access": self._last_access[conversation_id]
+                }))
+            self._drop(conversation_id)
+            self.evictions += 1
+        if not spilled:
+            return
+
+        try:
+            async with self._disk:
+                # Skip any read back while waiting for earlier disk work
+                records = [(conversation_id, record) for conversation_id, conversation, record in spilled
+                           if self._spilling.get(conversation_id) is conversation]
+                await asyncio.to_thread(self._write_spills, records)
+                self.spills += len(records)
+        finally:
+            for conversation_id, conversation, _ in spilled:
+                if self._spilling.get(conversation_id) is conversation:
+                    del self._spilling[conversation_id]
+
+    def _write_spills(self, records: List[tuple]):
+        for conversation_id, record in records:
+            temp_path = f"{self._spill_path(conversation_id)}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(record, f, default=str)
+            os.replace(temp_path, self._spill_path(conversation_id))
+
+    def _read_spill(self, conversation_id: str) -> Optional[dict]:
+        """Read a spilled conversation back, restoring the types JSON loses."""
+        path = self._spill_path(conversation_id)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        os.remove(path)
+        record["user_side"] = Side(record["user_side"])
+        record["start_time"] = datetime.fromisoformat(record["start_time"])
+        record["rounds"] = [ConversationRound.from_dict(round_data) for round_data in record["rounds"]]
+        return record
+
+    def _admit(self, conversation_id: str, conversation: dict, size: int, now: float):
+        self.conversations[conversation_id] = conversation
+        self._last_access[conversation_id] = now
+        self._sizes[conversation_id] = size
+        self.bytes += size
+
+    def _lookup(self, conversation_id: str, now: float) -> Optional[dict]:
+        """Find a conversation in memory, taking back one evicted but not yet spilled."""
+        conversation = self.conversations.get(conversation_id)
+        if conversation is not None:
+            self.conversations.move_to_end(conversation_id)
+            self._last_access[conversation_id] = now
+            return conversation
+        conversation = self._spilling.pop(conversation_id, None)
+        if conversation is not None:
+            self._admit(conversation_id, conversation, self._size(conversation), now)
+        return conversation
+
+    async def _rehydrate(self, conversation_id: str, now: float) -> Optional[dict]:
+        async with self._disk:
+            # Another request may have read it back while this one waited
+            conversation = self._lookup(conversation_id, now)
+            if conversation is not None:
+                return conversation
+            record = await asyncio.to_thread(self._read_spill, conversation_id)
+        if record is None:
+            return None
+        if self._expired(record.pop("last_access"), now):
+            self.expirations += 1
+            return None
+        self._admit(conversation_id, record, self._size(record), now)
+        self.rehydrations += 1
+        return record
+
+    async def _get(self, conversation_id: str) -> Optional[dict]:
+        now = time.time()
+        await self._expire(now)
+        conversation = self.conversations.get(conversation_id)
+        if conversation is not None:
+            self.conversations.move_to_end(conversation_id)
+            self._last_access[conversation_id] = now
+            self.hits += 1
+            return conversation
+        if self.spill_dir:
+            conversation = self._lookup(conversation_id, now) or await self._rehydrate(conversation_id, now)
+            if conversation is not None:
+                await self._evict()
+                return conversation
+        self.misses += 1
+        return None
+
+    async def create_conversation(self, conversation_id: str, conversation: Dict[str, Any]):
+        now = time.time()
+        await self._expire(now)
+        record = {**conversation, "rounds": []}
+        self._admit(conversation_id, record, self._size(record), now)
+        await self._evict()
+
+    async def get_conversation(self, conversation_id: str, include_rounds: bool = True) -> Optional[Dict[str, Any]]:
+        conversation = await self._get(conversation_id)
+        if conversation is None or include_rounds:
+            return conversation
+        return _without_rounds(conversation)
+
+    async def get_version(self, conversation_id: str) -> Optional[RoundVersion]:
+        conversation = await self._get(conversation_id)
+        if conversation is None:
+            return None
+        rounds = conversation["rounds"]
+        return RoundVersion(len(rounds), rounds[-1].timestamp if rounds else conversation["start_time"])
+
+    async def add_round(self, conversation_id: str, record: ConversationRound) -> int:
+        conversation = await self._get(conversation_id)
+        if conversation is None:
+            raise KeyError(conversation_id)
+        rounds = conversation["rounds"]
+        record.round_index = len(rounds)
+        rounds.append(record)
+        size = len(json.dumps(record.to_dict(), default=str))
+        self._sizes[conversation_id] += size
+        self.bytes += size
+        await self._evict()
+        return record.round_index
+
+    async def get_rounds(
+        self,
+        conversation_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[ConversationRound]:
+        conversation = await self._get(conversation_id)
+        return _round_range(conversation["rounds"], since_round, limit) if conversation is not None else []
+
+    async def get_last_round(self, conversation_id: str) -> Optional[ConversationRound]:
+        conversation = await self._get(conversation_id)
+        return conversation["rounds"][-1] if conversation is not None and conversation["rounds"] else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "conversations": len(self.conversations),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "spills": self.spills,
+            "rehydrations": self.rehydrations,
+            "spill_enabled": bool(self.spill_dir)
+        }
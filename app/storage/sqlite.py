@@ -0,0 +1,430 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..models.records import ConversationRound, LogicChainRecord
+from ..models.schemas import Side
+from .base import ConversationStore, DebateStore, RoundVersion, as_datetime
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS debates (
+    debate_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    start_time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS participants (
+    debate_id TEXT NOT NULL,
+    speaker_id TEXT NOT NULL,
+    side TEXT NOT NULL,
+    join_time TEXT NOT NULL,
+    PRIMARY KEY (debate_id, speaker_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS debate_rounds (
+    debate_id TEXT NOT NULL,
+    round_index INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    speaker_id TEXT NOT NULL,
+    side TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (debate_id, round_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS conversations (
+    conversation_id TEXT PRIMARY KEY,
+    topic_id INTEGER NOT NULL,
+    topic_info TEXT NOT NULL,
+    user_side TEXT NOT NULL,
+    start_time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversation_rounds (
+    conversation_id TEXT NOT NULL,
+    round_index INTEGER NOT NULL,
+    user_text TEXT NOT NULL,
+    ai_text TEXT NOT NULL,
+    audio_url TEXT,
+    timings TEXT,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, round_index)
+) WITHOUT ROWID;
+-- One row per analysed utterance; owner_id is a debate or conversation ID and
+-- role is "speaker" for debate rounds, "user" or "ai" for conversation rounds
+CREATE TABLE IF NOT EXISTS logic_chains (
+    owner_id TEXT NOT NULL,
+    round_index INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    logic_expression TEXT NOT NULL,
+    converted_logical_expression TEXT NOT NULL,
+    valid INTEGER NOT NULL,
+    valid_explanation TEXT NOT NULL,
+    sound INTEGER NOT NULL,
+    sound_explanation TEXT NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (owner_id, round_index, role)
+) WITHOUT ROWID;
+"""
+
+
+def _text(value: Any) -> str:
+    """Store datetimes as ISO 8601 and enums by value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+class SqliteDatabase:
+    """
+    One SQLite file shared by the SQLite stores.
+
+    The connection runs in WAL mode so readers in other processes are not
+    blocked by a writer. Calls run in a worker thread, serialised by a lock.
+    Reads run in one transaction each, so they see a consistent snapshot,
+    and writes use BEGIN IMMEDIATE so concurrent writers, in this or any
+    other process, queue on the database lock instead of failing on commit.
+    Several uvicorn workers can therefore share one file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.executescript(SCHEMA)
+        logger.info(f"SQLite storage opened at {path}")
+
+    def _read(self, func: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            # One read transaction, so every query sees the same snapshot even
+            # while other workers write
+            self._db.execute("BEGIN")
+            try:
+                return func(self._db, *args)
+            finally:
+                self._db.execute("COMMIT")
+
+    def _write(self, func: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(self._db, *args)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    async def read(self, func: Callable[..., Any], *args) -> Any:
+        """Run func(connection, *args) in a worker thread."""
+        return await asyncio.to_thread(self._read, func, *args)
+
+    async def write(self, func: Callable[..., Any], *args) -> Any:
+        """Run func(connection, *args) in a worker thread inside one transaction."""
+        return await asyncio.to_thread(self._write, func, *args)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def _insert_logic_chain(db: sqlite3.Connection, owner_id: str, round_index: int, role: str, chain: Dict[str, Any]):
+    performance = chain["performance"]
+    db.execute(
+        "INSERT INTO logic_chains VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            owner_id,
+            round_index,
+            role,
+            chain["logic_expression"],
+            json.dumps(chain["converted_logical_expression"], ensure_ascii=False),
+            int(performance["valid"]),
+            performance["valid_explanation"],
+            int(performance["sound"]),
+            performance["sound_explanation"],
+            chain.get("source", "llm")
+        )
+    )
+
+
+def _select_logic_chains(
+    db: sqlite3.Connection,
+    owner_id: str,
+    first: int,
+    last: int
+) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    """Logic chains of the rounds first to last, inclusive, by (round_index, role)."""
+    query = "SELECT * FROM logic_chains WHERE owner_id = ? AND round_index BETWEEN ? AND ?"
+    params = (owner_id, first, last)
+    return {
+        (row["round_index"], row["role"]): {
+            "logic_expression": row["logic_expression"],
+            "converted_logical_expression": json.loads(row["converted_logical_expression"]),
+            "performance": {
+                "valid": bool(row["valid"]),
+                "valid_explanation": row["valid_explanation"],
+                "sound": bool(row["sound"]),
+                "sound_explanation": row["sound_explanation"]
+            },
+            "source": row["source"]
+        }
+        for row in db.execute(query, params)
+    }
+
+
+def _select_round_rows(
+    db: sqlite3.Connection,
+    table: str,
+    id_column: str,
+    owner_id: str,
+    since_round: Optional[int],
+    limit: Optional[int]
+) -> List[sqlite3.Row]:
+    # A negative LIMIT means no limit in SQLite
+    return db.execute(
+        f"SELECT * FROM {table} WHERE {id_column} = ? AND round_index > ? ORDER BY round_index LIMIT ?",
+        (owner_id, -1 if since_round is None else since_round, -1 if limit is None else limit)
+    ).fetchall()
+
+
+def _select_version(
+    db: sqlite3.Connection,
+    table: str,
+    rounds_table: str,
+    id_column: str,
+    owner_id: str
+) -> Optional[RoundVersion]:
+    row = db.execute(f"SELECT start_time FROM {table} WHERE {id_column} = ?", (owner_id,)).fetchone()
+    if row is None:
+        return None
+    last = db.execute(
+        f"SELECT round_index, timestamp FROM {rounds_table} WHERE {id_column} = ? ORDER BY round_index DESC LIMIT 1",
+        (owner_id,)
+    ).fetchone()
+    if last is None:
+        return RoundVersion(0, as_datetime(row["start_time"]))
+    return RoundVersion(last["round_index"] + 1, as_datetime(last["timestamp"]))
+
+
+def _next_round_index(db: sqlite3.Connection, table: str, id_column: str, owner_id: str) -> int:
+    row = db.execute(f"SELECT MAX(round_index) FROM {table} WHERE {id_column} = ?", (owner_id,)).fetchone()
+    return 0 if row[0] is None else row[0] + 1
+
+
+class SqliteDebateStore(DebateStore):
+    """
+    Debates stored in indexed SQLite tables.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    async def create_debate(self, debate_id: str, debate: Dict[str, Any]):
+        def insert(db: sqlite3.Connection):
+            db.execute(
+                "INSERT INTO debates VALUES (?, ?, ?)",
+                (debate_id, debate["topic"], _text(debate["start_time"]))
+            )
+            db.executemany(
+                "INSERT INTO participants VALUES (?, ?, ?, ?)",
+                [
+                    (debate_id, speaker_id, _text(participant["side"]), _text(participant["join_time"]))
+                    for speaker_id, participant in debate["participants"].items()
+                ]
+            )
+
+        await self.database.write(insert)
+
+    async def get_debate(self, debate_id: str, include_rounds: bool = True) -> Optional[Dict[str, Any]]:
+        def select(db: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            row = db.execute("SELECT * FROM debates WHERE debate_id = ?", (debate_id,)).fetchone()
+            if row is None:
+                return None
+            debate = {
+                "topic": row["topic"],
+                "start_time": row["start_time"],
+                "participants": {
+                    participant["speaker_id"]: {"side": participant["side"], "join_time": participant["join_time"]}
+                    for participant in db.execute("SELECT * FROM participants WHERE debate_id = ?", (debate_id,))
+                }
+            }
+            if include_rounds:
+                debate["rounds"] = self._select_rounds(db, debate_id)
+            return debate
+
+        return await self.database.read(select)
+
+    @staticmethod
+    def _select_rounds(
+        db: sqlite3.Connection,
+        debate_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        rows = _select_round_rows(db, "debate_rounds", "debate_id", debate_id, since_round, limit)
+        if not rows:
+            return []
+        chains = _select_logic_chains(db, debate_id, rows[0]["round_index"], rows[-1]["round_index"])
+        return [
+            {
+                "round_index": row["round_index"],
+                "text": row["text"],
+                "speaker_id": row["speaker_id"],
+                "side": row["side"],
+                "logic_chain": chains.get((row["round_index"], "speaker")),
+                "timestamp": row["timestamp"]
+            }
+            for row in rows
+        ]
+
+    async def get_rounds(
+        self,
+        debate_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return await self.database.read(self._select_rounds, debate_id, since_round, limit)
+
+    async def get_version(self, debate_id: str) -> Optional[RoundVersion]:
+        return await self.database.read(_select_version, "debates", "debate_rounds", "debate_id", debate_id)
+
+    async def add_round(self, debate_id: str, round_data: Dict[str, Any]) -> int:
+        def insert(db: sqlite3.Connection) -> int:
+            round_index = _next_round_index(db, "debate_rounds", "debate_id", debate_id)
+            db.execute(
+                "INSERT INTO debate_rounds VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    debate_id,
+                    round_index,
+                    round_data["text"],
+                    round_data["speaker_id"],
+                    _text(round_data["side"]),
+                    _text(round_data["timestamp"])
+                )
+            )
+            _insert_logic_chain(db, debate_id, round_index, "speaker", round_data["logic_chain"])
+            return round_index
+
+        return await self.database.write(insert)
+
+    def close(self):
+        self.database.close()
+
+
+class SqliteConversationStore(ConversationStore):
+    """
+    Agent-training conversations stored in indexed SQLite tables, so they
+    survive restarts.
+    """
+
+    def __init__(self, database: SqliteDatabase):
+        self.database = database
+
+    async def create_conversation(self, conversation_id: str, conversation: Dict[str, Any]):
+        await self.database.write(
+            lambda db: db.execute(
+                "INSERT INTO conversations VALUES (?, ?, ?, ?, ?)",
+                (
+                    conversation_id,
+                    conversation["topic"],
+                    json.dumps(conversation["topic_info"], ensure_ascii=False),
+                    _text(conversation["user_side"]),
+                    _text(conversation["start_time"])
+                )
+            )
+        )
+
+    async def get_conversation(self, conversation_id: str, include_rounds: bool = True) -> Optional[Dict[str, Any]]:
+        def select(db: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            row = db.execute("SELECT * FROM conversations WHERE conversation_id = ?", (conversation_id,)).fetchone()
+            if row is None:
+                return None
+            conversation = {
+                "topic": row["topic_id"],
+                "topic_info": json.loads(row["topic_info"]),
+                "user_side": Side(row["user_side"]),
+                "start_time": row["start_time"]
+            }
+            if include_rounds:
+                conversation["rounds"] = self._select_rounds(db, conversation_id)
+            return conversation
+
+        return await self.database.read(select)
+
+    async def get_version(self, conversation_id: str) -> Optional[RoundVersion]:
+        return await self.database.read(
+            _select_version, "conversations", "conversation_rounds", "conversation_id", conversation_id
+        )
+
+    async def add_round(self, conversation_id: str, record: ConversationRound) -> int:
+        def insert(db: sqlite3.Connection) -> int:
+            round_index = _next_round_index(db, "conversation_rounds", "conversation_id", conversation_id)
+            db.execute(
+                "INSERT INTO conversation_rounds VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    conversation_id,
+                    round_index,
+                    record.user_text,
+                    record.ai_text,
+                    record.audio_url,
+                    json.dumps(record.timings),
+                    _text(record.timestamp)
+                )
+            )
+            _insert_logic_chain(db, conversation_id, round_index, "user", record.user_chain.to_dict())
+            _insert_logic_chain(db, conversation_id, round_index, "ai", record.ai_chain.to_dict())
+            return round_index
+
+        record.round_index = await self.database.write(insert)
+        return record.round_index
+
+    @staticmethod
+    def _select_rounds(
+        db: sqlite3.Connection,
+        conversation_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[ConversationRound]:
+        rows = _select_round_rows(db, "conversation_rounds", "conversation_id", conversation_id, since_round, limit)
+        if not rows:
+            return []
+        chains = _select_logic_chains(db, conversation_id, rows[0]["round_index"], rows[-1]["round_index"])
+        return [
+            ConversationRound(
+                user_text=row["user_text"],
+                user_chain=LogicChainRecord.from_dict(chains[(row["round_index"], "user")]),
+                ai_text=row["ai_text"],
+                audio_url=row["audio_url"],
+                ai_chain=LogicChainRecord.from_dict(chains[(row["round_index"], "ai")]),
+                timings=json.loads(row["timings"]) if row["timings"] else None,
+                timestamp=datetime.fromisoformat(row["timestamp"]),
+                round_index=row["round_index"]
+            )
+            for row in rows
+        ]
+
+    async def get_rounds(
+        self,
+        conversation_id: str,
+        since_round: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[ConversationRound]:
+        return await self.database.read(self._select_rounds, conversation_id, since_round, limit)
+
+    async def get_last_round(self, conversation_id: str) -> Optional[ConversationRound]:
+        def select(db: sqlite3.Connection) -> Optional[ConversationRound]:
+            round_index = _next_round_index(db, "conversation_rounds", "conversation_id", conversation_id) - 1
+            if round_index < 0:
+                return None
+            return self._select_rounds(db, conversation_id, round_index - 1, 1)[0]
+
+        return await self.database.read(select)
+
+    def close(self):
+        self.database.close()
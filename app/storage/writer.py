@@ -0,0 +1,191 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .journal import DebateJournal
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("always", "batch", "fsync")
+
+
+class JournalWriter:
+    """
+    Write-behind for a DebateJournal.
+
+    Durability modes, and what a crash can lose:
+        - always: each event is written and flushed at once, and the caller
+          waits for it (wait_written) before the request returns. A process
+          crash loses nothing; an OS crash or power loss can lose what the OS
+          had not yet written back.
+        - batch: events are queued and a background thread writes them in one
+          coalesced append every flush_interval seconds, or as soon as
+          max_batch_events are waiting. A process crash loses at most the
+          events of the last flush_interval.
+        - fsync: as batch, and each batch is fsynced, so the same window also
+          holds for an OS crash or power loss.
+
+    In every mode the writing, and compaction, runs on the writer thread, in
+    order with the events, so neither blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        journal: DebateJournal,
+        durability: str = "batch",
+        flush_interval: float = 0.05,
+        max_batch_events: int = 256
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.journal = journal
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.max_batch_events = max_batch_events
+        self.compaction_pending = False
+        self.batches = 0
+        self.errors = 0
+        self._pending: List[Tuple[str, Any]] = []
+        self._submitted = 0
+        self._written = 0
+        self._flush_requested = False
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, event: Dict[str, Any]) -> int:
+        """
+        Queue one event; in the always mode it is written without waiting
+        for others to coalesce with.
+
+        Returns:
+            A sequence number; the event is on disk once written reaches it
+        """
+        return self._enqueue("event", event)
+
+    def request_compaction(self):
+        """Queue a compaction after every event submitted so far."""
+        self.compaction_pending = True
+        self._enqueue("compact", None)
+
+    @property
+    def written(self) -> int:
+        """Number of submissions (events and compactions) written so far."""
+        return self._written
+
+    def _enqueue(self, kind: str, item: Any) -> int:
+        with self._cond:
+            self._pending.append((kind, item))
+            self._submitted += 1
+            sequence = self._submitted
+            if self.durability == "always" and kind == "event":
+                self._flush_requested = True
+            if self._thread is None or not self._thread.is_alive():
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+                self._thread.start()
+            elif len(self._pending) == 1 or len(self._pending) >= self.max_batch_events or self._flush_requested:
+                self._cond.notify_all()
+        return sequence
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                # Coalesce whatever else arrives within the flush interval
+                deadline = time.monotonic() + self.flush_interval
+                while (
+                    len(self._pending) < self.max_batch_events
+                    and not self._closing
+                    and not self._flush_requested
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                self._flush_requested = False
+                if not batch and self._closing:
+                    return
+
+            self.batches += 1
+            while batch:
+                # Events are appended together up to the next compaction and
+                # count as written before it runs, so it never holds them up
+                count = next((i for i, (kind, _) in enumerate(batch) if kind == "compact"), len(batch)) or 1
+                try:
+                    self._write(batch[:count])
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Journal write failed, retrying: {str(e)}")
+                    with self._cond:
+                        self._pending[:0] = batch
+                    time.sleep(self.flush_interval)
+                    break
+                with self._cond:
+                    self._written += count
+                    self._cond.notify_all()
+                batch = batch[count:]
+
+    def _write(self, items: List[Tuple[str, Any]]):
+        if items[0][0] == "compact":
+            self.journal.compact()
+            self.compaction_pending = False
+        else:
+            self.journal.append_many([item for _, item in items], fsync=self.durability == "fsync")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until everything submitted so far has been written.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._cond:
+            target = self._submitted
+            self._flush_requested = True
+            self._cond.notify_all()
+        return self.wait_written(target, timeout)
+
+    def wait_written(self, sequence: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the submission with this sequence number has been written.
+
+        Returns:
+            False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._written < sequence:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush, stop the writer thread and close the journal.
+
+        Returns:
+            False if pending events could not be written within the timeout
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if flushed:
+            self.journal.close()
+        return flushed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "durability": self.durability,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "errors": self.errors,
+            **self.journal.stats()
+        }
@@ -0,0 +1,7 @@
+"""
+Benchmark scripts.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_logic_prompt``.
+Unless overridden in the environment or .env, benchmarks run against the
+offline provider backends from app/services/fakes.py.
+"""
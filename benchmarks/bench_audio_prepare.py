@@ -0,0 +1,72 @@
+"""
+What preparing a WAV upload for recognition costs and saves: the bytes sent
+to the recogniser before and after prepare_for_recognition and
+trim_silence, and the time each takes, for common recorder formats.
+
+Recordings are noise at speech level with --silence seconds of silence at
+either end.
+
+Usage:
+    python -m benchmarks.bench_audio_prepare [--seconds 10] [--silence 2] [--rounds 20]
+"""
+
+import argparse
+import io
+import time
+import wave
+
+import numpy as np
+
+from app.services.audio import prepare_for_recognition, trim_silence
+
+# (sample rate, channels, bytes per sample)
+FORMATS = [(16000, 1, 2), (22050, 1, 2), (44100, 2, 2), (48000, 1, 2), (48000, 2, 3)]
+
+
+def recording(rate, channels, width, seconds, silence):
+    rng = np.random.default_rng(0)
+    peak = 2 ** (8 * width - 1) - 1
+    quiet = np.zeros(int(rate * silence) * channels)
+    signal = np.concatenate([quiet, rng.uniform(-0.5, 0.5, int(rate * seconds) * channels), quiet])
+    values = (signal * peak).astype("<i4")
+    # Keep the low bytes of each little-endian int32
+    frames = values.view(np.uint8).reshape(-1, 4)[:, :width].tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+def timed(fn, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return result, (time.perf_counter() - started) / rounds
+
+
+def main(seconds, silence, rounds, target_rate):
+    print(f"{seconds:g} s recordings with {silence:g} s silence either end, prepared for at most {target_rate} Hz")
+    print(f"{'format':>20}  {'upload':>9}  {'prepared':>9}  {'trimmed':>9}  {'prep':>9}  {'trim':>9}")
+    for rate, channels, width in FORMATS:
+        content = recording(rate, channels, width, seconds, silence)
+        (audio, sample_rate), prep_s = timed(lambda: prepare_for_recognition(content, target_rate), rounds)
+        trimmed, trim_s = timed(lambda: trim_silence(audio, sample_rate, -45.0, 200, 600), rounds)
+        print(
+            f"{rate:>7} Hz {channels}ch {8 * width}-bit  "
+            f"{len(content) / 1e3:>7.0f}KB  {len(audio) / 1e3:>7.0f}KB  {len(trimmed) / 1e3:>7.0f}KB  "
+            f"{prep_s * 1e3:>6.1f} ms  {trim_s * 1e3:>6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10, help="length of each recording")
+    parser.add_argument("--silence", type=float, default=2, help="seconds of silence before and after")
+    parser.add_argument("--rounds", type=int, default=20, help="conversions per format")
+    parser.add_argument("--target-rate", type=int, default=16000, help="STT_TARGET_SAMPLE_RATE")
+    args = parser.parse_args()
+
+    main(args.seconds, args.silence, args.rounds, args.target_rate)
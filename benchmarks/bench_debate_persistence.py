@@ -0,0 +1,116 @@
+"""
+Per-round persistence cost as the debate store grows: full JSON rewrite vs
+the append-only journal, for each durability mode.
+
+The legacy save_debates rewrites every debate on every round, so its cost is
+sampled once at each checkpoint. The journal store is timed on every
+add_round call, which is what the /debate/round handler waits for: the
+whole write (and any compaction) in the always mode, only the hand-off to
+the writer thread in the batch and fsync modes.
+
+Usage:
+    python -m benchmarks.bench_debate_persistence [--rounds 100000] [--debates 1000] [--durability batch]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks._offline import use_offline_defaults
+
+
+def legacy_save(path, debates):
+    """The original save_debates, kept here only for comparison."""
+    with open(path, "w") as f:
+        json.dump(debates, f, default=str)
+
+
+def make_round(index, speaker_id):
+    expression = f"premise {index} holds → conclusion {index} follows"
+    return {
+        "round_index": index,
+        "text": f"If premise {index} holds, then conclusion {index} follows.",
+        "speaker_id": speaker_id,
+        "side": "supporting",
+        "logic_chain": {
+            "logic_expression": expression,
+            "converted_logical_expression": [f"premise {index} holds", "4", f"conclusion {index} follows"],
+            "performance": {
+                "valid": True,
+                "valid_explanation": "",
+                "sound": False,
+                "sound_explanation": "The premises are not necessarily true."
+            },
+            "source": "fast_path"
+        },
+        "timestamp": datetime.utcnow()
+    }
+
+
+async def run_mode(durability, total_rounds, debate_count, with_legacy):
+    from app.storage import DebateJournal, JournalDebateStore, JournalWriter
+
+    directory = tempfile.mkdtemp(prefix="bench_persistence_")
+    journal = DebateJournal(os.path.join(directory, "debate_data.json"))
+    store = JournalDebateStore(journal, JournalWriter(journal, durability=durability), cache_size=debate_count)
+    # The same state kept the way the legacy store held it, for its rewrite
+    legacy_debates = {}
+    for i in range(debate_count):
+        debate = {"topic": f"Topic {i}", "start_time": datetime.utcnow(), "participants": {}}
+        await store.create_debate(f"debate-{i}", debate)
+        legacy_debates[f"debate-{i}"] = {**debate, "rounds": []}
+
+    checkpoints = {total_rounds // 100, total_rounds // 10, total_rounds // 2, total_rounds}
+    window = []
+    print(f"durability={durability}")
+    print(f"{'rounds':>8}  {'journal mean':>13}  {'journal p50':>12}  {'journal p99':>12}  {'legacy rewrite':>15}")
+    for n in range(1, total_rounds + 1):
+        debate_id = f"debate-{n % debate_count}"
+        round_data = make_round(len(legacy_debates[debate_id]["rounds"]), "alice")
+        legacy_debates[debate_id]["rounds"].append(round_data)
+
+        started = time.perf_counter()
+        await store.add_round(debate_id, round_data)
+        window.append(time.perf_counter() - started)
+
+        if n in checkpoints:
+            legacy = ""
+            if with_legacy:
+                started = time.perf_counter()
+                legacy_save(os.path.join(directory, "legacy.json"), legacy_debates)
+                legacy = f"{(time.perf_counter() - started) * 1e3:>12.1f} ms"
+            quantiles = statistics.quantiles(window, n=100)
+            print(
+                f"{n:>8}  {statistics.mean(window) * 1e6:>10.1f} us  {quantiles[49] * 1e6:>9.1f} us  "
+                f"{quantiles[98] * 1e6:>9.1f} us  {legacy:>15}"
+            )
+            window = []
+
+    started = time.perf_counter()
+    await store.flush()
+    store.close()
+    print(
+        f"final flush {(time.perf_counter() - started) * 1e3:.1f} ms, writes: {store.writer.batches}, "
+        f"compactions: {journal.compactions}, snapshot: {journal.snapshot_bytes / 1e6:.1f} MB"
+    )
+
+
+def main(total_rounds, debate_count, modes):
+    for i, durability in enumerate(modes):
+        asyncio.run(run_mode(durability, total_rounds, debate_count, with_legacy=i == 0))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=100000, help="rounds to persist in total")
+    parser.add_argument("--debates", type=int, default=1000, help="debates the rounds are spread over")
+    parser.add_argument("--durability", action="append", choices=["always", "batch", "fsync"], help="modes to run (default: all)")
+    args = parser.parse_args()
+
+    use_offline_defaults()
+    main(args.rounds, args.debates, args.durability or ["always", "batch", "fsync"])
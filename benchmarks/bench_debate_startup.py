@@ -0,0 +1,116 @@
+"""
+Startup cost as the debate archive grows: parsing the whole debate_data.json
+(the legacy load_debates) vs opening the indexed snapshot, which maps the
+index and parses nothing until a debate is read.
+
+Each archive size is measured in a fresh subprocess that imports the app's
+storage package before the clock starts, so both columns share the same
+baseline RSS and differ only by the load.
+
+Usage:
+    python -m benchmarks.bench_debate_startup [--sizes 1000 10000 50000] [--rounds 10]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks._offline import use_offline_defaults
+
+MEASURE = """
+import json, sys, time
+from app.storage.journal import DebateJournal
+mode, path = sys.argv[1], sys.argv[2]
+started = time.perf_counter()
+if mode == "legacy":
+    with open(path) as f:
+        debates = json.load(f)
+    debate = debates["debate-0"]
+else:
+    journal = DebateJournal(path)
+    journal.open()
+    opened = time.perf_counter() - started
+    debate = journal.read_debate("debate-0")
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "open_ms": (opened if mode == "indexed" else elapsed) * 1e3,
+    "first_read_ms": elapsed * 1e3,
+    # VmHWM, unlike ru_maxrss, is not inherited from the parent across exec
+    "max_rss_mb": next(int(line.split()[1]) for line in open("/proc/self/status") if line.startswith("VmHWM")) / 1024
+}))
+"""
+
+
+def make_archive(path, debate_count, rounds_per_debate):
+    with open(path, "w") as f:
+        f.write("{")
+        for i in range(debate_count):
+            debate = {
+                "topic": f"Topic {i}",
+                "start_time": "2024-01-01T00:00:00",
+                "participants": {"alice": {"user_id": "alice", "side": "supporting"}},
+                "rounds": [
+                    {
+                        "round_index": r,
+                        "text": f"If premise {r} holds, then conclusion {r} follows.",
+                        "speaker_id": "alice",
+                        "side": "supporting",
+                        "logic_chain": {
+                            "logic_expression": f"premise {r} holds → conclusion {r} follows",
+                            "converted_logical_expression": [f"premise {r} holds", "4", f"conclusion {r} follows"],
+                            "performance": {"valid": True, "valid_explanation": "", "sound": False, "sound_explanation": ""},
+                            "source": "fast_path"
+                        },
+                        "timestamp": "2024-01-01T00:00:00"
+                    }
+                    for r in range(rounds_per_debate)
+                ]
+            }
+            f.write(("" if i == 0 else ", ") + json.dumps(f"debate-{i}") + ": " + json.dumps(debate))
+        f.write("}")
+
+
+def measure(mode, path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE, mode, path],
+        check=True, capture_output=True, text=True, cwd=root
+    ).stdout
+    return json.loads(output)
+
+
+def main(sizes, rounds_per_debate):
+    from app.storage.journal import DebateJournal
+
+    print(f"{'debates':>8}  {'file':>9}  {'legacy load':>12}  {'legacy RSS':>11}  {'indexed open':>13}  {'first read':>11}  {'indexed RSS':>12}")
+    for size in sizes:
+        directory = tempfile.mkdtemp(prefix="bench_startup_")
+        legacy_path = os.path.join(directory, "legacy.json")
+        indexed_path = os.path.join(directory, "debate_data.json")
+        make_archive(legacy_path, size, rounds_per_debate)
+        make_archive(indexed_path, size, rounds_per_debate)
+
+        # The one-off conversion to the indexed layout happens on the first open
+        DebateJournal(indexed_path).open()
+
+        legacy = measure("legacy", legacy_path)
+        indexed = measure("indexed", indexed_path)
+        print(
+            f"{size:>8}  {os.path.getsize(legacy_path) / 1e6:>6.1f} MB  {legacy['open_ms']:>9.1f} ms  "
+            f"{legacy['max_rss_mb']:>8.1f} MB  {indexed['open_ms']:>10.2f} ms  {indexed['first_read_ms']:>8.2f} ms  "
+            f"{indexed['max_rss_mb']:>9.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="archive sizes in debates")
+    parser.add_argument("--rounds", type=int, default=10, help="rounds per debate")
+    args = parser.parse_args()
+
+    use_offline_defaults()
+    os.environ.setdefault("DEBATE_DATA_PATH", os.path.join(tempfile.mkdtemp(prefix="bench_startup_"), "debate_data.json"))
+    main(args.sizes, args.rounds)
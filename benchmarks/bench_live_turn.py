@@ -0,0 +1,101 @@
+"""
+Turn-taking latency: how long the speaker waits after they stop talking.
+
+One-shot: the recording is uploaded to POST /agent-training/audio/{id}
+when the speaker stops; the wait ends with the response. Live: the same
+audio is streamed to the /agent-training/live/{id} WebSocket as it is
+spoken, in 100 ms frames with a pause after each sentence; the wait ends
+with the first rebuttal token (and, for comparison, with the stored round).
+
+The fake providers keep their simulated latency (FAKE_*_LATENCY_MS), with
+every delay and the speaking time scaled by --scale.
+
+Usage:
+    python -m benchmarks.bench_live_turn [--sentences 3] [--turns 3] [--scale 0.2]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import time
+
+from benchmarks._offline import use_offline_defaults
+
+FRAMES_PER_SENTENCE = 15
+
+
+def spoken_frames(turn, sentences):
+    """Distinct non-silent frames per sentence, each sentence followed by a silent one."""
+    for sentence in range(sentences):
+        for frame in range(FRAMES_PER_SENTENCE):
+            yield bytes([(turn * 31 + sentence * 7 + frame) % 255 + 1]) * 3200
+        yield bytes(3200)
+
+
+def one_shot_turn(client, conversation_id, turn, sentences, frame_seconds):
+    frames = list(spoken_frames(turn, sentences))
+    time.sleep(len(frames) * frame_seconds)
+    started = time.perf_counter()
+    response = client.post(
+        f"/agent-training/audio/{conversation_id}",
+        files={"file": ("argument.wav", b"".join(frames), "audio/wav")},
+        data={"speaker_id": "benchmark"}
+    )
+    response.raise_for_status()
+    return time.perf_counter() - started, None
+
+
+def live_turn(websocket, turn, sentences, frame_seconds):
+    for frame in spoken_frames(turn, sentences):
+        websocket.send_bytes(frame)
+        time.sleep(frame_seconds)
+    websocket.send_json({"type": "end"})
+    started = time.perf_counter()
+    first_token = None
+    while True:
+        message = websocket.receive_json()
+        if message["type"] == "token" and first_token is None:
+            first_token = time.perf_counter() - started
+        elif message["type"] == "error":
+            raise RuntimeError(message["detail"])
+        elif message["type"] == "done":
+            return first_token, time.perf_counter() - started
+
+
+def main(sentences, turns, scale):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    frame_seconds = 0.1 * scale
+
+    def start():
+        return client.post("/agent-training/start", json={"topic_id": 1, "user_side": "supporting"}).json()["conversation_id"]
+
+    conversation_id = start()
+    one_shot = [one_shot_turn(client, conversation_id, turn, sentences, frame_seconds)[0] for turn in range(turns)]
+
+    conversation_id = start()
+    with client.websocket_connect(f"/agent-training/live/{conversation_id}") as websocket:
+        live = [live_turn(websocket, turn, sentences, frame_seconds) for turn in range(turns)]
+
+    print(f"{sentences} sentences per turn, {turns} turns, latency scale {scale}")
+    print(f"  one-shot upload, response:   {statistics.median(one_shot) * 1e3:>8.0f} ms")
+    print(f"  live, first rebuttal token:  {statistics.median(t for t, _ in live) * 1e3:>8.0f} ms")
+    print(f"  live, round stored:          {statistics.median(t for _, t in live) * 1e3:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", type=int, default=3, help="sentences per turn")
+    parser.add_argument("--turns", type=int, default=3, help="turns to measure")
+    parser.add_argument("--scale", type=float, default=0.2, help="factor applied to provider latency and speaking time")
+    args = parser.parse_args()
+
+    use_offline_defaults()
+    os.environ["FAKE_LATENCY_SCALE"] = str(args.scale)
+    os.environ.setdefault("FAKE_LATENCY_DISTRIBUTION", "fixed")
+    # The services log every transcript and round at INFO
+    logging.disable(logging.INFO)
+    main(args.sentences, args.turns, args.scale)
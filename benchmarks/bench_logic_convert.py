@@ -0,0 +1,123 @@
+"""
+convert_logical_expression throughput: legacy re.split vs the compiled tokenizer.
+
+Two workloads are measured: single long multi-premise expressions, and bulk
+conversion of a debate history with many repeated context expressions. Bulk
+conversion also reports the retained size of the list-of-strings form versus
+the compact (operator-code array plus shared operand table) form.
+
+Usage:
+    python -m benchmarks.bench_logic_convert [--premises 40] [--history 10000]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+
+from benchmarks._offline import use_offline_defaults
+
+
+def legacy_convert(expr: str) -> list:
+    """The original implementation, kept here only for comparison."""
+    mapping = {
+        "∧": "1",
+        "∨": "2",
+        "~": "3",
+        "→": "4",
+        "↔": "5",
+        "(": "6",
+        ")": "6",
+        "～": "3"
+    }
+    pattern = r"(\∧|\∨|~|→|↔|\(|\)|～)"
+    tokens = re.split(pattern, expr)
+    converted_tokens = []
+    for token in tokens:
+        token = token.strip()
+        if not token:
+            continue
+        if token in mapping:
+            converted_tokens.append(mapping[token])
+        else:
+            converted_tokens.append(token.lower())
+    return converted_tokens
+
+
+def long_expression(premises: int) -> str:
+    body = " ∧ ".join(f"(Premise {i} holds → ~ Outcome {i} occurs)" for i in range(premises))
+    return f"({body}) → The conclusion follows"
+
+
+def history_expressions(size: int) -> list:
+    # Each round repeats a handful of context expressions, as debate histories do
+    base = [
+        "Renewable energy is adopted → carbon emissions fall",
+        "~ carbon emissions fall",
+        "(We subsidise solar ∨ we expand nuclear power) ∧ ~ waste storage is a problem",
+        "We expand nuclear power → waste storage becomes a problem",
+    ]
+    return [f"{base[i % len(base)]} ∧ round {i % 50} point" for i in range(size)]
+
+
+def deep_size(tokens_lists) -> int:
+    seen = set()
+    total = 0
+    for obj in tokens_lists:
+        for item in [obj, *obj]:
+            if id(item) not in seen:
+                seen.add(id(item))
+                total += sys.getsizeof(item)
+    return total
+
+
+def compact_size(compiled) -> int:
+    seen = set()
+    total = 0
+    for compact in compiled:
+        for item in [compact, compact.codes, compact.operands, *compact.operands]:
+            if id(item) not in seen:
+                seen.add(id(item))
+                total += sys.getsizeof(item)
+    return total
+
+
+def best_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(premises: int, history: int):
+    from app.services.logic_chain import (
+        compile_logical_expression,
+        compile_logical_expressions,
+        convert_logical_expression
+    )
+
+    expr = long_expression(premises)
+    assert legacy_convert(expr) == convert_logical_expression(expr) == compile_logical_expression(expr).to_tokens()
+    print(f"long expression: {len(expr)} chars, {len(convert_logical_expression(expr))} tokens")
+    print(f"  legacy            {best_us(lambda: legacy_convert(expr), 1000):>10.1f} us")
+    print(f"  compiled          {best_us(lambda: convert_logical_expression(expr), 1000):>10.1f} us")
+    print(f"  compact           {best_us(lambda: compile_logical_expression(expr), 1000):>10.1f} us")
+    print(f"  compact+tokens    {best_us(lambda: compile_logical_expression(expr).to_tokens(), 1000):>10.1f} us")
+
+    exprs = history_expressions(history)
+    print(f"history: {history} expressions")
+    print(f"  legacy            {best_us(lambda: [legacy_convert(e) for e in exprs], 1) / 1000:>10.1f} ms")
+    print(f"  compiled          {best_us(lambda: [convert_logical_expression(e) for e in exprs], 1) / 1000:>10.1f} ms")
+    print(f"  bulk compact      {best_us(lambda: compile_logical_expressions(exprs), 1) / 1000:>10.1f} ms")
+    legacy_tokens = [legacy_convert(e) for e in exprs]
+    compiled = compile_logical_expressions(exprs)
+    assert [c.to_tokens() for c in compiled] == legacy_tokens
+    print(f"  retained, lists   {deep_size(legacy_tokens) / 1024:>10.1f} KiB")
+    print(f"  retained, compact {compact_size(compiled) / 1024:>10.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--premises", type=int, default=40, help="premises in the long expression")
+    parser.add_argument("--history", type=int, default=10000, help="expressions in the bulk history")
+    args = parser.parse_args()
+
+    use_offline_defaults()
+    main(args.premises, args.history)
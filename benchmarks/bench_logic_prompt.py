@@ -0,0 +1,90 @@
+"""
+Prompt tokens and latency per logic analysis: legacy vs cache-friendly layout.
+
+The legacy layout is the original single user message, with the previous
+expressions placed before COMMON_INSTRUCTIONS. The current layout sends the
+static instructions as the system message and the per-call content last, so
+the provider can serve the shared prefix from its prompt cache.
+
+Usage:
+    python -m benchmarks.bench_logic_prompt [--rounds 20] [--latency-scale 0.01]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks._offline import use_offline_defaults
+
+# The original prompt layout, kept here only for comparison
+LEGACY_PROMPT_TEMPLATE = """You are an AI assistant that analyzes the logical structure of a sentence and identifies logical errors.
+{additional_instructions}
+
+Now, analyze this sentence:
+"{sentence}"
+"""
+
+SENTENCES = [
+    "If renewable energy is adopted immediately, then carbon emissions will fall.",
+    "Carbon emissions will not fall.",
+    "Either we subsidise solar or we expand nuclear power.",
+    "If we expand nuclear power, then waste storage becomes a problem.",
+    "Waste storage is not a problem, so we should subsidise solar.",
+]
+
+
+def legacy_messages(sentence, previous_context_expressions, common_instructions):
+    if previous_context_expressions:
+        previous_context_str = "Previous Logical Expressions:\n"
+        for expr in previous_context_expressions:
+            previous_context_str += f"{expr}\n"
+        additional_instructions = previous_context_str + "\n" + common_instructions + "\nNow, please integrate the previous analysis with the new sentence and analyze it."
+    else:
+        additional_instructions = common_instructions
+    prompt = LEGACY_PROMPT_TEMPLATE.format(additional_instructions=additional_instructions, sentence=sentence)
+    return [{"role": "user", "content": prompt}]
+
+
+async def run_layout(name, build_messages, rounds):
+    from app.services.logic_chain import LogicChainService, parse_llm_output
+
+    service = LogicChainService()
+    context = []
+    for i in range(rounds):
+        sentence = SENTENCES[i % len(SENTENCES)]
+        raw = await service.get_response(build_messages(sentence, list(context)))
+        context.append(parse_llm_output(raw, sentence).get("logic_expression", sentence))
+    stats = service.usage.stats()
+    print(
+        f"{name:<10} calls={stats['calls']:>4}  prompt_tokens/call={stats['avg_prompt_tokens']:>8.1f}  "
+        f"cached/call={stats['avg_cached_tokens']:>8.1f}  "
+        f"uncached/call={stats['avg_prompt_tokens'] - stats['avg_cached_tokens']:>8.1f}  "
+        f"latency_ms/call={stats['avg_latency_ms']:>8.1f}"
+    )
+
+
+async def main(rounds):
+    from app.services.logic_chain import COMMON_INSTRUCTIONS, build_analysis_messages
+
+    await run_layout(
+        "legacy",
+        lambda sentence, context: legacy_messages(sentence, context, COMMON_INSTRUCTIONS),
+        rounds
+    )
+    await run_layout("prefixed", build_analysis_messages, rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20, help="analyses per layout, with growing context")
+    parser.add_argument("--latency-scale", default="0.01", help="FAKE_LATENCY_SCALE for the offline backend")
+    args = parser.parse_args()
+
+    os.environ.setdefault("FAKE_LATENCY_SCALE", args.latency_scale)
+    use_offline_defaults()
+    logging.disable(logging.INFO)
+    started = time.perf_counter()
+    asyncio.run(main(args.rounds))
+    print(f"total {time.perf_counter() - started:.2f}s")
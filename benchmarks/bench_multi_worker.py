@@ -0,0 +1,102 @@
+"""
+Debate-round throughput as the number of uvicorn workers grows, with every
+worker sharing one SQLite database (STORAGE_BACKEND=sqlite).
+
+Concurrent clients each run their own debate, and every request may land on
+any worker: there is no session affinity. Scaling is bounded by the CPUs
+available, so compare worker counts up to os.cpu_count().
+
+Usage:
+    python -m benchmarks.bench_multi_worker [--workers 1 2 4] [--clients 16] [--rounds 20]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from benchmarks._offline import use_offline_defaults
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, database):
+    port = free_port()
+    # Without the fake backends' simulated latency, so the servers' own work is measured
+    env = {"FAKE_LATENCY_SCALE": "0", **os.environ, "STORAGE_BACKEND": "sqlite", "STORAGE_SQLITE_PATH": database}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            httpx.get(base_url + "/")
+            return process, base_url
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                process.kill()
+                raise
+            time.sleep(0.1)
+
+
+def run_client(base_url, rounds):
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        debate_id = client.post(
+            "/debate/start",
+            json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+        ).json()["debate_id"]
+        for i in range(rounds):
+            response = client.post(
+                f"/debate/round/{debate_id}",
+                json={"debate_text": f"Point {i}.", "speaker_id": "alice"}
+            )
+            response.raise_for_status()
+            client.get(f"/debate/history/{debate_id}", params={"since_round": max(i - 1, 0)})
+
+
+def measure(workers, clients, rounds):
+    with tempfile.TemporaryDirectory() as directory:
+        process, base_url = start_server(workers, os.path.join(directory, "debate_ai.db"))
+        try:
+            # The first worker to answer is not necessarily the last to finish starting
+            time.sleep(2)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                list(pool.map(lambda _: run_client(base_url, rounds), range(clients)))
+            return clients * rounds / (time.perf_counter() - started)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def main(worker_counts, clients, rounds):
+    print(f"{clients} clients x {rounds} rounds, {os.cpu_count()} CPUs")
+    baseline = None
+    for workers in worker_counts:
+        throughput = measure(workers, clients, rounds)
+        baseline = baseline or throughput
+        print(f"  {workers} worker(s): {throughput:>8.1f} rounds/s  ({throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to compare")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--rounds", type=int, default=20, help="rounds per client")
+    args = parser.parse_args()
+
+    use_offline_defaults()
+    main(args.workers, args.clients, args.rounds)
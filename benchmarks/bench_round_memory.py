@@ -0,0 +1,134 @@
+"""
+Retained memory of an agent-training conversation: the nested round dicts
+process_debate_round used to store vs ConversationRound records.
+
+Each round is built from fresh LogicChain analyses, as a request would
+produce them, and only what the store keeps is measured. The cost of
+rebuilding the /logic-chain view for the whole conversation is reported too.
+
+Usage:
+    python -m benchmarks.bench_round_memory [--rounds 1000]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+from datetime import datetime
+
+from benchmarks._offline import use_offline_defaults
+
+
+def make_analysis(i, speaker):
+    from app.models.schemas import LogicChain, LogicalPerformance
+
+    return LogicChain(
+        logic_expression=f"{speaker} premise {i} holds → conclusion {i} follows",
+        converted_logical_expression=[f"{speaker} premise {i} holds", "4", f"conclusion {i} follows"],
+        performance=LogicalPerformance(
+            valid=True,
+            valid_explanation="",
+            sound=False,
+            sound_explanation=f"Premise {i} is not established."
+        ),
+        source="fast_path"
+    )
+
+
+def legacy_round(i, user_analysis, agent_analysis):
+    """The round dict process_debate_round used to store, kept here only for comparison."""
+    def chain(analysis):
+        return {
+            "logic_expression": analysis.logic_expression,
+            "converted_logical_expression": analysis.converted_logical_expression,
+            "performance": {
+                "valid": analysis.performance.valid,
+                "valid_explanation": analysis.performance.valid_explanation,
+                "sound": analysis.performance.sound,
+                "sound_explanation": analysis.performance.sound_explanation
+            },
+            "source": analysis.source
+        }
+
+    return {
+        "round_index": i,
+        "user": {"text": f"User argument {i}.", "logic_chain": chain(user_analysis)},
+        "ai": {"text": f"AI rebuttal {i}.", "audio_url": f"audio_storage/{i}.mp3", "logic_chain": chain(agent_analysis)},
+        "timings": {"stages": {"analyze_user": {"start_ms": 0.0, "end_ms": 1.0}}, "total_ms": 1.0},
+        "timestamp": datetime.utcnow()
+    }
+
+
+def record_round(i, user_analysis, agent_analysis):
+    from app.models.records import ConversationRound, LogicChainRecord
+
+    return ConversationRound(
+        user_text=f"User argument {i}.",
+        user_chain=LogicChainRecord.from_logic_chain(user_analysis),
+        ai_text=f"AI rebuttal {i}.",
+        audio_url=f"audio_storage/{i}.mp3",
+        ai_chain=LogicChainRecord.from_logic_chain(agent_analysis),
+        timings={"stages": {"analyze_user": {"start_ms": 0.0, "end_ms": 1.0}}, "total_ms": 1.0},
+        round_index=i
+    )
+
+
+def retained_bytes(build, rounds):
+    gc.collect()
+    tracemalloc.start()
+    stored = []
+    for i in range(rounds):
+        # The analyses are dropped after each round unless the stored form keeps them
+        stored.append(build(i, make_analysis(i, "user"), make_analysis(i, "ai")))
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return stored, size
+
+
+def legacy_chain_view(round_data):
+    """The per-round entry get_logic_chain used to build, kept here only for comparison."""
+    return {
+        "round_index": round_data["round_index"],
+        "user_chain": {
+            "text": round_data["user"]["text"],
+            "logic_expression": round_data["user"]["logic_chain"]["logic_expression"],
+            "converted_logical_expression": round_data["user"]["logic_chain"]["converted_logical_expression"],
+            "performance": round_data["user"]["logic_chain"]["performance"]
+        },
+        "ai_chain": {
+            "text": round_data["ai"]["text"],
+            "logic_expression": round_data["ai"]["logic_chain"]["logic_expression"],
+            "converted_logical_expression": round_data["ai"]["logic_chain"]["converted_logical_expression"],
+            "performance": round_data["ai"]["logic_chain"]["performance"]
+        },
+        "timestamp": round_data["timestamp"]
+    }
+
+
+def main(rounds):
+    # Warm up imports and pydantic's validators so they are not counted
+    retained_bytes(legacy_round, 1)
+    retained_bytes(record_round, 1)
+
+    legacy, legacy_size = retained_bytes(legacy_round, rounds)
+    records, record_size = retained_bytes(record_round, rounds)
+    print(f"{rounds} rounds retained")
+    print(f"  round dicts:  {legacy_size / 1e3:>8.1f} KB  {legacy_size / rounds:>7.0f} bytes/round")
+    print(f"  records:      {record_size / 1e3:>8.1f} KB  {record_size / rounds:>7.0f} bytes/round  ({record_size / legacy_size:.0%})")
+
+    repeat = 20
+    legacy_view = min(timeit.repeat(lambda: [legacy_chain_view(r) for r in legacy], number=1, repeat=repeat))
+    record_view = min(timeit.repeat(lambda: [r.chain_view() for r in records], number=1, repeat=repeat))
+    print("/logic-chain view of the whole conversation")
+    print(f"  round dicts:  {legacy_view * 1e3:>8.2f} ms")
+    print(f"  records:      {record_view * 1e3:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=1000, help="rounds in the conversation")
+    args = parser.parse_args()
+
+    use_offline_defaults()
+    main(args.rounds)
@@ -0,0 +1,86 @@
+"""
+Cost per audio round of getting an upload to the recogniser: the legacy
+temp-file round trip (write temp_*.wav, check, re-read, delete) vs passing
+the upload's bytes to STTService.transcribe.
+
+The fake STT backend runs without simulated latency, so only the handling
+of the audio is measured. Syscalls are the read and write calls counted in
+/proc/self/io (Linux); opens, stats and unlinks come on top for the legacy
+path.
+
+Usage:
+    python -m benchmarks.bench_stt_upload [--sizes 32000 320000 3200000] [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from benchmarks._offline import use_offline_defaults
+
+
+def io_syscalls():
+    with open("/proc/self/io") as f:
+        counters = dict(line.split(": ") for line in f.read().splitlines())
+    # Minus the two reads of this file itself
+    return int(counters["syscr"]) + int(counters["syscw"]) - 2
+
+
+async def legacy_round(stt_service, content, temp_dir):
+    """What the submit_audio handlers used to do, kept here only for comparison."""
+    temp_audio_path = Path(temp_dir) / f"temp_{uuid.uuid4()}.wav"
+    with open(temp_audio_path, "wb") as buffer:
+        buffer.write(content)
+    try:
+        return await stt_service.transcribe_audio(temp_audio_path)
+    finally:
+        if temp_audio_path.exists():
+            os.remove(temp_audio_path)
+
+
+async def in_memory_round(stt_service, content, temp_dir):
+    return await stt_service.transcribe(content)
+
+
+async def measure(round_fn, stt_service, content, rounds, temp_dir):
+    await round_fn(stt_service, content, temp_dir)
+    syscalls = io_syscalls()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await round_fn(stt_service, content, temp_dir)
+    elapsed = time.perf_counter() - started
+    return elapsed / rounds, (io_syscalls() - syscalls) / rounds
+
+
+async def main(sizes, rounds):
+    from app.services.stt import stt_service
+
+    # The service logs every transcript at INFO
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"{'upload':>10}  {'temp file':>22}  {'in memory':>22}")
+        for size in sizes:
+            content = b"RIFF" + os.urandom(size - 4)
+            legacy_s, legacy_calls = await measure(legacy_round, stt_service, content, rounds, temp_dir)
+            memory_s, memory_calls = await measure(in_memory_round, stt_service, content, rounds, temp_dir)
+            print(
+                f"{size / 1e3:>8.0f}KB  "
+                f"{legacy_s * 1e6:>8.0f} us {legacy_calls:>5.1f} calls  "
+                f"{memory_s * 1e6:>8.0f} us {memory_calls:>5.1f} calls"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32000, 320000, 3200000], help="upload sizes in bytes")
+    parser.add_argument("--rounds", type=int, default=200, help="rounds per size")
+    args = parser.parse_args()
+
+    use_offline_defaults()
+    os.environ.setdefault("FAKE_LATENCY_SCALE", "0")
+    asyncio.run(main(args.sizes, args.rounds))
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+# Provide the settings the app requires at import time so the suite can run
+# without a local .env file, against the offline provider backends
+for key, value in {
+    "host": "0.0.0.0",
+    "port": "8001",
+    "debug": "True",
+    "OPENAI_API_KEY": "test_openai_key",
+    "ELEVENLABS_API_KEY": "test_elevenlabs_key",
+    "GOOGLE_APPLICATION_CREDENTIALS": "test_credentials_path",
+    "AUDIO_STORAGE_PATH": tempfile.mkdtemp(prefix="audio_storage_"),
+    "TEMP_STORAGE_PATH": "temp_storage",
+    "DEBATE_DATA_PATH": os.path.join(tempfile.mkdtemp(prefix="debate_data_"), "debate_data.json"),
+    "LOG_LEVEL": "INFO",
+    "LOG_FILE": "app.log",
+    "STT_LANGUAGE": "en-US",
+    "STT_SAMPLE_RATE": "22050",
+    "TTS_VOICE_ID": "test_voice_id",
+    "TTS_MODEL_ID": "eleven_turbo_v2_5",
+    "LLM_BACKEND": "fake",
+    "LOGIC_BACKEND": "fake",
+    "STT_BACKEND": "fake",
+    "TTS_BACKEND": "fake",
+    "FAKE_LATENCY_SCALE": "0",
+    "FAKE_SEED": "0",
+}.items():
+    os.environ.setdefault(key, value)
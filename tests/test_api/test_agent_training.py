@@ -1,6 +1,9 @@
+import io
+import wave
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services.stt import stt_service
 
 client = TestClient(app)
 
@@ -115,4 +118,111 @@ def test_get_logic_chain():
     data = response.json()
     assert "topic" in data
     assert "logic_chains" in data
-    assert len(data["logic_chains"]) == 1 
\ No newline at end of file
+    assert len(data["logic_chains"]) == 1 
+
+
+def test_get_logic_chain_pages():
+    start_response = client.post(
+        "/agent-training/start",
+        json={
+            "topic_id": 1,
+            "user_side": "supporting"
+        }
+    )
+    conversation_id = start_response.json()["conversation_id"]
+    for i in range(3):
+        client.post(f"/agent-training/round/{conversation_id}", json={"user_utterance": f"Test argument {i}"})
+
+    response = client.get(
+        f"/agent-training/logic-chain/{conversation_id}",
+        params={"since_round": 0, "limit": 1, "exclude": "explanations,converted_logical_expression"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [chain["round_index"] for chain in data["logic_chains"]] == [1]
+    assert data["next_cursor"] == 1
+    user_chain = data["logic_chains"][0]["user_chain"]
+    assert "converted_logical_expression" not in user_chain
+    assert set(user_chain["performance"]) == {"valid", "sound"}
+
+    history = client.get(f"/agent-training/history/{conversation_id}", params={"since_round": 1}).json()
+    assert [r["round_index"] for r in history["rounds"]] == [2]
+    assert history["next_cursor"] is None
+
+
+def test_logic_chain_polling_is_conditional_and_incremental():
+    start_response = client.post(
+        "/agent-training/start",
+        json={
+            "topic_id": 1,
+            "user_side": "supporting"
+        }
+    )
+    conversation_id = start_response.json()["conversation_id"]
+    assert client.get(f"/agent-training/logic-chain/{conversation_id}/current").status_code == 404
+    client.post(f"/agent-training/round/{conversation_id}", json={"user_utterance": "Test argument 0"})
+
+    current = client.get(f"/agent-training/logic-chain/{conversation_id}/current")
+    assert current.status_code == 200
+    etag = current.headers["etag"]
+    assert client.get(
+        f"/agent-training/logic-chain/{conversation_id}/current", headers={"If-None-Match": etag}
+    ).status_code == 304
+    assert client.get(
+        f"/agent-training/logic-chain/{conversation_id}",
+        headers={"If-Modified-Since": current.headers["last-modified"]}
+    ).status_code == 304
+
+    delta = client.get(f"/agent-training/logic-chain/{conversation_id}/delta", params={"version": 0}).json()
+    assert delta["version"] == 1
+    assert [chain["round_index"] for chain in delta["logic_chains"]] == [0]
+
+    client.post(f"/agent-training/round/{conversation_id}", json={"user_utterance": "Test argument 1"})
+    assert client.get(
+        f"/agent-training/logic-chain/{conversation_id}/current", headers={"If-None-Match": etag}
+    ).status_code == 200
+    delta = client.get(f"/agent-training/logic-chain/{conversation_id}/delta", params={"version": 1}).json()
+    assert delta["version"] == 2
+    assert [chain["round_index"] for chain in delta["logic_chains"]] == [1]
+    idle = client.get(f"/agent-training/logic-chain/{conversation_id}/delta", params={"version": 2}).json()
+    assert idle == {"version": 2, "logic_chains": []}
+
+
+def test_audio_with_a_malformed_wav_header_is_rejected():
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+    response = client.post(
+        f"/agent-training/audio/{conversation_id}",
+        files={"file": ("argument.wav", b"RIFF\x00\x00\x00\x00WAVE", "audio/wav")},
+        data={"speaker_id": "user-1"}
+    )
+    assert response.status_code == 400
+    assert "no data chunk" in response.json()["detail"]
+
+
+def test_silent_audio_is_rejected_before_recognition(monkeypatch):
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(bytes(32000))
+    silence = buffer.getvalue()
+
+    def recognize(**kwargs):
+        raise AssertionError("silence reached the recogniser")
+
+    monkeypatch.setattr(stt_service.client, "recognize", recognize)
+    response = client.post(
+        f"/agent-training/audio/{conversation_id}",
+        files={"file": ("argument.wav", silence, "audio/wav")},
+        data={"speaker_id": "user-1"}
+    )
+    assert response.status_code == 400
+    assert "No speech content" in response.json()["detail"]
@@ -0,0 +1,92 @@
+import asyncio
+import time
+import httpx
+import pytest
+from app.main import app
+from app.services import openai_client
+from app.services.llm import llm_service
+from app.services.logic_chain import logic_chain_service
+from app.services.tts import tts_service
+
+# Simulated round-trip of the stubbed OpenAI endpoint
+STUB_DELAY = 0.2
+CONCURRENT_ROUNDS = 10
+
+STUB_CONTENT = """Logical Expression:
+Renewable energy is adopted → planet is protected
+
+Performances:
+Valid: True
+Valid Explanation:
+Sound: True
+Sound Explanation:
+"""
+
+
+async def delayed_completion(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(STUB_DELAY)
+    return httpx.Response(200, json={
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": STUB_CONTENT}
+        }],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    })
+
+
+async def stub_text_to_speech(text: str) -> str:
+    return "audio_storage/stub.mp3"
+
+
+@pytest.fixture
+def stubbed_services(monkeypatch):
+    client = openai_client.build_openai_client(transport=httpx.MockTransport(delayed_completion))
+    monkeypatch.setattr(openai_client, "_client", client)
+    # Route both services through the real AsyncOpenAI client, not the fakes
+    monkeypatch.setattr(llm_service, "fake_client", None)
+    monkeypatch.setattr(logic_chain_service, "fake_client", None)
+    monkeypatch.setattr(tts_service, "text_to_speech", stub_text_to_speech)
+    # Every round must reach the stub, not the analysis cache or the fast path
+    monkeypatch.setattr(logic_chain_service, "cache", None)
+    monkeypatch.setattr(logic_chain_service, "fast_path", None)
+    yield
+
+
+async def submit_round(client: httpx.AsyncClient, conversation_id: str) -> httpx.Response:
+    return await client.post(
+        f"/agent-training/round/{conversation_id}",
+        json={"user_utterance": "If we adopt renewable energy, then the planet is protected."}
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rounds_do_not_block_event_loop(stubbed_services):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start_response = await client.post(
+            "/agent-training/start",
+            json={"topic_id": 1, "user_side": "supporting"}
+        )
+        conversation_id = start_response.json()["conversation_id"]
+
+        # Time a single round as the baseline
+        started = time.perf_counter()
+        response = await submit_round(client, conversation_id)
+        single_round = time.perf_counter() - started
+        assert response.status_code == 200
+
+        # Run many rounds at once; with a non-blocking client they overlap
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[
+            submit_round(client, conversation_id) for _ in range(CONCURRENT_ROUNDS)
+        ])
+        concurrent_rounds = time.perf_counter() - started
+
+    assert all(r.status_code == 200 for r in responses)
+    # A blocking client would take roughly CONCURRENT_ROUNDS * single_round
+    assert concurrent_rounds < single_round * 2
@@ -0,0 +1,182 @@
+import asyncio
+import io
+import json
+import wave
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.api.agent_training import stream_debate_round
+from app.main import app
+from app.models.schemas import AgentTrainingRoundRequest, LogicChain, LogicalPerformance
+from app.services.llm import llm_service
+from app.services.logic_chain import logic_chain_service
+from app.services.tts import tts_service
+
+client = TestClient(app)
+
+REBUTTAL_TOKENS = ["While renewables help, ", "rapid adoption ", "raises costs."]
+
+
+async def stub_stream_debate_response(**kwargs):
+    for token in REBUTTAL_TOKENS:
+        await asyncio.sleep(0.01)
+        yield token
+
+
+async def stub_analyze_logic(sentence, previous_context_expressions=None):
+    await asyncio.sleep(0.05)
+    return LogicChain(
+        logic_expression=sentence,
+        converted_logical_expression=[sentence.lower()],
+        performance=LogicalPerformance(valid=True, valid_explanation="", sound=True, sound_explanation="")
+    )
+
+
+async def stub_text_to_speech(text):
+    return "audio_storage/stub.mp3"
+
+
+@pytest.fixture
+def stubbed_services(monkeypatch):
+    monkeypatch.setattr(llm_service, "stream_debate_response", stub_stream_debate_response)
+    monkeypatch.setattr(logic_chain_service, "analyze_logic", stub_analyze_logic)
+    monkeypatch.setattr(tts_service, "text_to_speech", stub_text_to_speech)
+
+
+def parse_events(body: str):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_debate_round(stubbed_services):
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+
+    response = client.post(
+        f"/agent-training/round/{conversation_id}/stream",
+        json={"user_utterance": "Renewable energy protects the planet."}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "start"
+    assert names[1:4] == ["token", "token", "token"]
+    assert names[4] == "rebuttal"
+    assert set(names[5:8]) == {"user_analysis", "ai_analysis", "audio"}
+    assert names[-1] == "done"
+    assert dict(events)["rebuttal"]["text"] == "".join(REBUTTAL_TOKENS)
+
+    history = client.get(f"/agent-training/history/{conversation_id}").json()
+    assert len(history["rounds"]) == 1
+    assert history["rounds"][0]["ai"]["audio_url"] == "audio_storage/stub.mp3"
+    assert history["rounds"][0]["timings"]["first_token_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_streamed_rounds_are_stored_in_arrival_order(stubbed_services):
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+
+    first = await stream_debate_round(conversation_id, AgentTrainingRoundRequest(user_utterance="First point."))
+    second = await stream_debate_round(conversation_id, AgentTrainingRoundRequest(user_utterance="Second point."))
+
+    async def consume(response, delay):
+        # The later request's stream starts, and finishes its work, first
+        await asyncio.sleep(delay)
+        body = "".join([chunk async for chunk in response.body_iterator])
+        await response.background()
+        return dict(parse_events(body))["done"]["round_index"]
+
+    assert await asyncio.gather(consume(first, 0.1), consume(second, 0)) == [0, 1]
+    history = client.get(f"/agent-training/history/{conversation_id}").json()
+    assert [r["user"]["text"] for r in history["rounds"]] == ["First point.", "Second point."]
+
+
+def test_stream_debate_round_invalid_conversation():
+    response = client.post(
+        "/agent-training/round/invalid-id/stream",
+        json={"user_utterance": "Test argument"}
+    )
+    assert response.status_code == 404
+
+
+def test_stream_debate_round_incremental_audio(stubbed_services, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "AUDIO_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(tts_service, "_convert", lambda text: [text.encode()])
+
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+
+    response = client.post(
+        f"/agent-training/round/{conversation_id}/stream?incremental_audio=true",
+        json={"user_utterance": "Renewable energy protects the planet."}
+    )
+    events = parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[:2] == ["start", "audio_stream"]
+    assert names[-1] == "done"
+
+    stream_url = dict(events)["audio_stream"]["stream_url"]
+    audio = client.get(stream_url)
+    assert audio.status_code == 200
+    assert audio.headers["content-type"] == "audio/mpeg"
+    assert audio.content == b"While renewables help, rapid adoption raises costs."
+
+
+
+def test_stream_audio_upload(monkeypatch):
+    monkeypatch.setattr(settings, "STT_STREAM_CHUNK_BYTES", 16)
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+    audio = bytes(range(64))
+
+    def upload():
+        # Sent with chunked transfer encoding
+        for i in range(0, len(audio), 16):
+            yield audio[i:i + 16]
+
+    response = client.post(
+        f"/agent-training/audio/{conversation_id}/stream",
+        content=upload(),
+        headers={"Content-Type": "audio/wav"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ai_response"]["text"]
+
+    # Streamed and uploaded audio give the same transcript
+    uploaded = client.post(
+        f"/agent-training/audio/{conversation_id}",
+        files={"file": ("argument.wav", audio, "audio/wav")},
+        data={"speaker_id": "user-1"}
+    ).json()
+    assert data["user_response"]["text"] == uploaded["user_response"]["text"]
+
+    history = client.get(f"/agent-training/history/{conversation_id}").json()
+    assert history["rounds"][0]["user"]["text"] == data["user_response"]["text"]
+
+    assert client.post(f"/agent-training/audio/{conversation_id}/stream", content=b"").status_code == 400
+    # Only 16-bit PCM can be streamed to the recogniser as recorded
+    wav = io.BytesIO()
+    with wave.open(wav, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(1)
+        writer.setframerate(8000)
+        writer.writeframes(bytes(range(1, 65)))
+    rejected = client.post(f"/agent-training/audio/{conversation_id}/stream", content=wav.getvalue())
+    assert rejected.status_code == 400
+    assert "16-bit PCM" in rejected.json()["detail"]
+    assert client.post("/agent-training/audio/invalid-id/stream", content=b"audio").status_code == 404
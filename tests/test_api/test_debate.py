@@ -0,0 +1,184 @@
+import asyncio
+import io
+import wave
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.services.logic_chain import logic_chain_service
+from app.services.stt import stt_service
+from app.services.sequencer import round_sequencer
+from app.storage import DebateJournal, debate_store
+
+client = TestClient(app)
+
+def test_analyze_batch():
+    response = client.post(
+        "/debate/analyze-batch",
+        json={
+            "sentences": [
+                "If it rains, then the lawn is wet.",
+                "Renewable energy is cheap and clean.",
+                ""
+            ]
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == 2
+    assert data["failed"] == 1
+    assert data["results"][0]["logic_chain"]["converted_logical_expression"] == ["it rains", "4", "the lawn is wet"]
+    assert data["results"][2]["error"] == "Empty sentence"
+
+def test_analyze_batch_empty_request():
+    response = client.post("/debate/analyze-batch", json={"sentences": []})
+    assert response.status_code == 400
+
+@pytest.mark.skipif(settings.STORAGE_BACKEND != "json", reason="journal persistence is specific to the json backend")
+def test_rounds_are_journaled_and_recovered():
+    start = client.post(
+        "/debate/start",
+        json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+    )
+    debate_id = start.json()["debate_id"]
+    response = client.post(f"/debate/round/{debate_id}", json={"debate_text": "It rains.", "speaker_id": "alice"})
+    assert response.status_code == 200
+
+    # Rounds are written behind the request; wait for the writer
+    assert asyncio.run(debate_store.flush(timeout=5))
+    recovered = DebateJournal(settings.DEBATE_DATA_PATH).load()
+    assert recovered[debate_id]["rounds"][0]["text"] == "It rains."
+
+def test_history_is_paginated_and_projected():
+    start = client.post(
+        "/debate/start",
+        json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+    )
+    debate_id = start.json()["debate_id"]
+    for i in range(5):
+        client.post(f"/debate/round/{debate_id}", json={"debate_text": f"If it rains {i}, then the lawn is wet.", "speaker_id": "alice"})
+
+    first = client.get(f"/debate/history/{debate_id}", params={"limit": 2}).json()
+    assert [r["round_index"] for r in first["rounds"]] == [0, 1]
+    assert first["next_cursor"] == 1
+
+    rest = client.get(
+        f"/debate/history/{debate_id}",
+        params={"since_round": first["next_cursor"], "exclude": "explanations"}
+    ).json()
+    assert [r["round_index"] for r in rest["rounds"]] == [2, 3, 4]
+    assert rest["next_cursor"] is None
+    assert "valid_explanation" not in rest["rounds"][0]["logic_chain"]["performance"]
+    assert "valid" in rest["rounds"][0]["logic_chain"]["performance"]
+
+    # Projection never touches the stored rounds
+    full = client.get(f"/debate/history/{debate_id}").json()
+    assert len(full["rounds"]) == 5
+    assert "valid_explanation" in full["rounds"][2]["logic_chain"]["performance"]
+
+    assert client.get(f"/debate/history/{debate_id}", params={"limit": 0}).status_code == 422
+
+def test_history_delta_and_not_modified():
+    start = client.post(
+        "/debate/start",
+        json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+    )
+    debate_id = start.json()["debate_id"]
+    client.post(f"/debate/round/{debate_id}", json={"debate_text": "It rains.", "speaker_id": "alice"})
+
+    history = client.get(f"/debate/history/{debate_id}")
+    assert history.headers["etag"] == 'W/"1"'
+    assert client.get(f"/debate/history/{debate_id}", headers={"If-None-Match": history.headers["etag"]}).status_code == 304
+
+    client.post(f"/debate/round/{debate_id}", json={"debate_text": "The lawn is wet.", "speaker_id": "bob"})
+    delta = client.get(f"/debate/history/{debate_id}/delta", params={"version": 1})
+    assert delta.status_code == 200
+    assert delta.json()["version"] == 2
+    assert [r["text"] for r in delta.json()["rounds"]] == ["The lawn is wet."]
+    assert client.get("/debate/history/missing/delta", params={"version": 0}).status_code == 404
+
+@pytest.mark.asyncio
+async def test_concurrent_rounds_are_stored_in_submission_order(monkeypatch):
+    debates, writers, stagger = 4, 12, 0.005
+    analyze_logic = logic_chain_service.analyze_logic
+    in_flight = {"now": 0, "max": 0}
+
+    async def slower_for_earlier_rounds(sentence, *args, **kwargs):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            # Later submissions finish their analysis first
+            await asyncio.sleep((writers - int(sentence.split()[1])) * stagger)
+            return await analyze_logic(sentence, *args, **kwargs)
+        finally:
+            in_flight["now"] -= 1
+
+    monkeypatch.setattr(logic_chain_service, "analyze_logic", slower_for_earlier_rounds)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        debate_ids = []
+        for _ in range(debates):
+            start = await client.post(
+                "/debate/start",
+                json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+            )
+            debate_ids.append(start.json()["debate_id"])
+
+        async def submit(debate_id, i):
+            await asyncio.sleep(i * stagger)
+            response = await client.post(
+                f"/debate/round/{debate_id}",
+                json={"debate_text": f"Point {i} stands.", "speaker_id": "alice"}
+            )
+            assert response.status_code == 200
+
+        await asyncio.gather(*(submit(debate_id, i) for debate_id in debate_ids for i in range(writers)))
+
+        for debate_id in debate_ids:
+            rounds = (await client.get(f"/debate/history/{debate_id}")).json()["rounds"]
+            assert [r["round_index"] for r in rounds] == list(range(writers))
+            assert [r["text"] for r in rounds] == [f"Point {i} stands." for i in range(writers)]
+
+    # Debates never wait for each other: more analyses ran at once than one debate has
+    assert in_flight["max"] > writers
+    assert len(round_sequencer) == 0
+
+def test_audio_with_a_malformed_wav_header_is_rejected():
+    debate_id = client.post(
+        "/debate/start",
+        json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+    ).json()["debate_id"]
+    response = client.post(
+        f"/debate/audio/{debate_id}",
+        files={"file": ("argument.wav", b"RIFF\x00\x00\x00\x00WAVE", "audio/wav")},
+        params={"speaker_id": "alice"}
+    )
+    assert response.status_code == 400
+    assert "no data chunk" in response.json()["detail"]
+
+def test_silent_audio_is_rejected_before_recognition(monkeypatch):
+    debate_id = client.post(
+        "/debate/start",
+        json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+    ).json()["debate_id"]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(bytes(32000))
+    silence = buffer.getvalue()
+
+    def recognize(**kwargs):
+        raise AssertionError("silence reached the recogniser")
+
+    monkeypatch.setattr(stt_service.client, "recognize", recognize)
+    response = client.post(
+        f"/debate/audio/{debate_id}",
+        files={"file": ("argument.wav", silence, "audio/wav")},
+        params={"speaker_id": "alice"}
+    )
+    assert response.status_code == 400
+    assert "No speech content" in response.json()["detail"]
@@ -0,0 +1,72 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.main import app
+
+client = TestClient(app)
+
+SPEECH = [bytes(range(1, 33)), bytes(range(33, 65))]
+SILENCE = bytes(32)
+
+
+def receive_until(websocket, message_type):
+    messages = []
+    while True:
+        message = websocket.receive_json()
+        messages.append(message)
+        if message["type"] in (message_type, "error"):
+            return messages
+
+
+def test_live_session_analyses_sentences_while_speaking():
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+
+    with client.websocket_connect(f"/agent-training/live/{conversation_id}") as websocket:
+        # The pause finalises the first sentence, which is analysed before the turn ends
+        websocket.send_bytes(SPEECH[0])
+        websocket.send_bytes(SILENCE)
+        first = receive_until(websocket, "user_analysis")
+        assert [m["type"] for m in first] == ["interim", "sentence", "user_analysis"]
+        assert first[-1]["index"] == 0
+
+        websocket.send_bytes(SPEECH[1])
+        websocket.send_json({"type": "end"})
+        rest = receive_until(websocket, "done")
+        types = [m["type"] for m in rest]
+        assert types[-1] == "done"
+        assert {"sentence", "user_analysis", "token", "rebuttal", "ai_analysis", "audio"} <= set(types)
+        # The rebuttal starts once the turn ends
+        assert types.index("sentence") < types.index("token")
+
+        # Further turns on the same socket become further rounds
+        websocket.send_bytes(SPEECH[0])
+        websocket.send_json({"type": "end"})
+        assert receive_until(websocket, "done")[-1]["round_index"] == 1
+
+    history = client.get(f"/agent-training/history/{conversation_id}").json()
+    assert len(history["rounds"]) == 2
+    sentences = [first[1]["text"]] + [m["text"] for m in rest if m["type"] == "sentence"]
+    first_round = history["rounds"][0]
+    assert first_round["user"]["text"] == " ".join(sentences)
+    assert " ∧ " in first_round["user"]["logic_chain"]["logic_expression"]
+    assert first_round["timings"]["first_token_after_speech_ms"] is not None
+
+
+def test_live_session_reports_empty_turns_and_unknown_conversations():
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+
+    with client.websocket_connect(f"/agent-training/live/{conversation_id}") as websocket:
+        websocket.send_bytes(SILENCE)
+        websocket.send_json({"type": "end"})
+        assert websocket.receive_json()["type"] == "error"
+
+    with client.websocket_connect("/agent-training/live/invalid-id") as websocket:
+        with pytest.raises(WebSocketDisconnect) as disconnect:
+            websocket.receive_json()
+        assert disconnect.value.code == 4404
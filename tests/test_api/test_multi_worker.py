@@ -0,0 +1,86 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two separate server processes sharing one SQLite file, as two uvicorn workers would."""
+    env = {
+        **os.environ,
+        "STORAGE_BACKEND": "sqlite",
+        "STORAGE_SQLITE_PATH": str(tmp_path / "debate_ai.db"),
+        "AUDIO_STORAGE_PATH": str(tmp_path / "audio"),
+        "LOG_LEVEL": "WARNING",
+    }
+    ports = [free_port(), free_port()]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        for port in ports
+    ]
+    clients = [httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10) for port in ports]
+    try:
+        deadline = time.monotonic() + 30
+        for client in clients:
+            while True:
+                try:
+                    client.get("/")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.1)
+        yield clients
+    finally:
+        for client in clients:
+            client.close()
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def test_sessions_work_across_workers(workers):
+    a, b = workers
+
+    conversation_id = a.post("/agent-training/start", json={"topic_id": 1, "user_side": "supporting"}).json()["conversation_id"]
+    for i, worker in enumerate([b, a, b]):
+        response = worker.post(f"/agent-training/round/{conversation_id}", json={"user_utterance": f"Argument {i}"})
+        assert response.status_code == 200
+    history = a.get(f"/agent-training/history/{conversation_id}").json()
+    assert [r["user"]["text"] for r in history["rounds"]] == ["Argument 0", "Argument 1", "Argument 2"]
+
+    debate_id = b.post(
+        "/debate/start",
+        json={"topic": "Energy", "supporting_speaker_id": "alice", "opposing_speaker_id": "bob"}
+    ).json()["debate_id"]
+
+    # Concurrent rounds through both workers each get their own round_index
+    def submit(i):
+        worker = workers[i % 2]
+        return worker.post(f"/debate/round/{debate_id}", json={"debate_text": f"Point {i}.", "speaker_id": "alice"})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(response.status_code == 200 for response in pool.map(submit, range(20)))
+
+    rounds = a.get(f"/debate/history/{debate_id}").json()["rounds"]
+    assert sorted(r["round_index"] for r in rounds) == list(range(20))
+    assert sorted(r["text"] for r in rounds) == sorted(f"Point {i}." for i in range(20))
+
+    # Either worker's validators describe the same version
+    assert a.get(f"/debate/history/{debate_id}").headers["etag"] == b.get(f"/debate/history/{debate_id}").headers["etag"]
@@ -0,0 +1,130 @@
+import io
+import struct
+import time
+import tracemalloc
+import wave
+import numpy as np
+import pytest
+from app.services.audio import parse_wav, prepare_for_recognition, samples, trim_silence
+
+
+def wav_file(signal, rate, channels=1, width=2):
+    """Encode float samples in [-1, 1], shaped (frames, channels), as PCM."""
+    scaled = np.round(np.asarray(signal).reshape(-1, channels) * (2 ** (8 * width - 1) - 1)).astype(np.int32)
+    if width == 1:
+        frames = (scaled + 128).astype(np.uint8).tobytes()
+    else:
+        frames = b"".join(int(v).to_bytes(width, "little", signed=True) for v in scaled.ravel())
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+def tone(frequency, rate, seconds=0.5, amplitude=0.5):
+    t = np.arange(int(rate * seconds)) / rate
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+@pytest.mark.parametrize("width", [1, 2, 3, 4])
+def test_parse_wav_reads_the_format_and_samples(width):
+    signal = np.stack([tone(440, 8000), -tone(440, 8000)], axis=1)
+    info = parse_wav(wav_file(signal, 8000, channels=2, width=width))
+
+    assert (info.sample_rate, info.channels, info.bits_per_sample) == (8000, 2, 8 * width)
+    assert info.frames == len(signal)
+    assert info.duration_seconds == pytest.approx(0.5)
+    assert np.allclose(samples(info), signal, atol=2 / 2 ** (8 * width - 1))
+
+
+def test_parse_wav_rejects_malformed_headers():
+    assert parse_wav(b"\x01\x02" * 40) is None
+
+    with pytest.raises(ValueError):
+        parse_wav(b"RIFF\x00\x00\x00\x00WAVEdata\x00\x00\x00\x00")
+    with pytest.raises(ValueError):
+        parse_wav(b"RIFF\x00\x00\x00\x00WAVE")
+
+    # A-law and other compressed encodings are not converted
+    fmt = struct.pack("<4sIHHIIHH", b"fmt ", 16, 6, 1, 8000, 8000, 1, 8)
+    with pytest.raises(ValueError):
+        parse_wav(b"RIFF\x00\x00\x00\x00WAVE" + fmt + b"data\x04\x00\x00\x00\x00\x00\x00\x00")
+
+
+def test_uploads_are_downmixed_and_downsampled():
+    left = tone(440, 44100)
+    audio, rate = prepare_for_recognition(wav_file(np.stack([left, left], axis=1), 44100, channels=2), 16000)
+
+    assert rate == 16000
+    assert len(audio) == 2 * 8000
+    # The tone survives at the same pitch and loudness
+    converted = np.frombuffer(audio, dtype="<i2") / 32768.0
+    assert np.abs(converted[100:-100]).max() == pytest.approx(0.5, abs=0.01)
+    assert np.argmax(np.abs(np.fft.rfft(converted))) == pytest.approx(440 * 0.5, abs=1)
+
+
+def test_long_uploads_are_resampled_in_bounded_memory():
+    # Two minutes of 48 kHz stereo: a 23 MB upload
+    frames = 48000 * 120
+    values = np.tile((np.sin(np.arange(4800) * 2 * np.pi / 48) * 16000).astype("<i2"), 2 * frames // 4800)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(48000)
+        wav.writeframes(values.tobytes())
+    recording = buffer.getvalue()
+
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        audio, rate = prepare_for_recognition(recording, 16000)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert rate == 16000 and len(audio) == 2 * 16000 * 120
+    # Converting the whole recording at once would take several times the upload's 23 MB
+    assert peak < 2 * len(audio) + 16 * 2 ** 20
+    assert elapsed < 10
+
+
+def test_recordings_already_fit_for_recognition_are_kept():
+    recording = wav_file(tone(440, 16000), 16000)
+    audio, rate = prepare_for_recognition(recording, 16000)
+    assert rate == 16000
+    assert audio == parse_wav(recording).data.tobytes()
+
+    # Lower rates are not upsampled
+    audio, rate = prepare_for_recognition(wav_file(tone(440, 8000), 8000), 16000)
+    assert rate == 8000 and len(audio) == 2 * 4000
+
+    # Headerless audio is passed through for the configured rate
+    assert prepare_for_recognition(b"\x01\x02" * 40, 16000) == (b"\x01\x02" * 40, None)
+
+
+def linear16(*parts):
+    return (np.concatenate(parts) * 32767).astype("<i2").tobytes()
+
+
+def test_silence_is_trimmed_and_long_pauses_shortened():
+    rate = 16000
+    word = tone(300, rate, seconds=0.4)
+    silence = np.zeros(rate)
+    audio = linear16(silence, word, silence[:rate // 10], word, silence, silence, word, silence)
+
+    trimmed = trim_silence(audio, rate, threshold_db=-45, padding_ms=200, max_pause_ms=600)
+    # 200 ms either end, the short pause whole and the two-second one cut to 600 ms
+    assert len(trimmed) == 2 * int(rate * (0.2 + 0.4 + 0.1 + 0.4 + 0.6 + 0.4 + 0.2))
+
+    # Quiet but noisy frames, like an "s", count as speech
+    hiss = np.random.default_rng(0).uniform(-1, 1, rate // 5) * 0.005
+    assert len(trim_silence(linear16(silence, hiss, silence), rate, -45, 0, 600)) == 2 * len(hiss)
+
+    assert trim_silence(linear16(silence), rate, -45, 200, 600) == b""
+    speech = linear16(word)
+    assert trim_silence(speech, rate, -45, 200, 600) == speech
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.cache import ResultCache, make_cache_key
+from app.services.logic_chain import LogicChainService
+
+RAW_ANALYSIS = """Logical Expression:
+It rains → the lawn is wet
+
+Performances:
+Valid: True
+Valid Explanation:
+Sound: True
+Sound Explanation:
+"""
+
+
+def test_key_normalises_sentence_and_tracks_context_and_version():
+    key = make_cache_key("If it rains,  the lawn is WET.", [], "1:gpt-4o")
+    assert key == make_cache_key("if it rains, the lawn is wet.", None, "1:gpt-4o")
+    assert key != make_cache_key("if it rains, the lawn is wet.", ["A → B"], "1:gpt-4o")
+    assert key != make_cache_key("if it rains, the lawn is wet.", [], "2:gpt-4o")
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResultCache(max_entries=2, ttl_seconds=0)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    expiring = ResultCache(ttl_seconds=0.01)
+    expiring.set("a", {"v": 1})
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "logic_cache.sqlite3")
+    ResultCache(disk_path=path).set("a", {"v": 1})
+
+    restarted = ResultCache(disk_path=path)
+    assert restarted.get("a") == {"v": 1}
+    assert restarted.stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_logic_hits_cache_and_coalesces(monkeypatch):
+    service = LogicChainService()
+    service.cache = ResultCache()
+    service.fast_path = None
+    calls = []
+
+    async def fake_get_response(messages):
+        calls.append(messages)
+        await asyncio.sleep(0.05)
+        return RAW_ANALYSIS
+
+    monkeypatch.setattr(service, "get_response", fake_get_response)
+
+    first, second = await asyncio.gather(
+        service.analyze_logic("If it rains, the lawn is wet."),
+        service.analyze_logic("if it rains, the lawn is wet.")
+    )
+    third = await service.analyze_logic("If it rains,   the lawn is wet.")
+
+    assert len(calls) == 1
+    assert first == second
+    assert third.source == "cache"
+    assert third.model_copy(update={"source": "llm"}) == first
+    assert third.logic_expression == "It rains → the lawn is wet"
+    assert service.cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_logic_queries_the_disk_tier_off_the_event_loop(tmp_path, monkeypatch):
+    service = LogicChainService()
+    service.cache = ResultCache(disk_path=str(tmp_path / "logic_cache.sqlite3"))
+    service.fast_path = None
+    disk_io_on = []
+    for name in ("_get_from_disk", "_set_on_disk"):
+        method = getattr(service.cache, name)
+        setattr(service.cache, name, lambda *args, method=method: (disk_io_on.append(threading.current_thread().name), method(*args))[1])
+
+    async def fake_get_response(messages):
+        return RAW_ANALYSIS
+
+    monkeypatch.setattr(service, "get_response", fake_get_response)
+    await service.analyze_logic("If it rains, the lawn is wet.")
+    service.cache._entries.clear()
+    assert (await service.analyze_logic("If it rains, the lawn is wet.")).source == "cache"
+
+    # A miss and a write, then a disk hit, none of them on the loop's thread
+    assert len(disk_io_on) == 3 and threading.main_thread().name not in disk_io_on
+    assert service.cache.stats()["disk_hits"] == 1
@@ -0,0 +1,67 @@
+import io
+import statistics
+import wave
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.fakes import FakeOpenAIClient, FakeProviderError, FaultInjector
+from app.services.logic_chain import parse_llm_output
+
+client = TestClient(app)
+
+
+def wav_file(frames: bytes, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+def test_fault_injector_latency_and_errors():
+    faults = FaultInjector("LLM", mean_ms=100, jitter_ms=50, error_rate=0.25, distribution="lognormal", seed=1)
+    samples = [faults.sample_seconds() for _ in range(2000)]
+    assert 0.08 < statistics.median(samples) < 0.12
+    assert min(samples) > 0
+
+    failures = 0
+    for _ in range(1000):
+        try:
+            faults._maybe_fail()
+        except FakeProviderError:
+            failures += 1
+    assert 200 < failures < 300
+    assert faults.stats() == {"calls": 1000, "errors": failures}
+
+
+@pytest.mark.asyncio
+async def test_fake_logic_output_matches_parser_format():
+    fake = FakeOpenAIClient(FaultInjector("LOGIC", mean_ms=0))
+    response = await fake.chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": 'Logical Expression ...\nNow, analyze this sentence:\n"If it rains, then the lawn is wet."'}]
+    )
+    result = parse_llm_output(response.choices[0].message.content, "")
+    assert result["logic_expression"] == "it rains → the lawn is wet"
+    assert result["converted_logical_expression"] == ["it rains", "4", "the lawn is wet"]
+    assert result["performance"]["valid"] is True
+
+
+def test_audio_round_runs_offline():
+    conversation_id = client.post(
+        "/agent-training/start",
+        json={"topic_id": 1, "user_side": "supporting"}
+    ).json()["conversation_id"]
+
+    response = client.post(
+        f"/agent-training/audio/{conversation_id}",
+        files={"file": ("argument.wav", wav_file(bytes(range(1, 65))), "audio/wav")},
+        data={"speaker_id": "user-1"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["user_response"]["text"]
+    assert data["ai_response"]["text"].startswith("While")
+    assert data["user_response"]["logic_chain"]["logic_expression"]
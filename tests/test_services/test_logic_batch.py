@@ -0,0 +1,82 @@
+import pytest
+from app.services.cache import ResultCache
+from app.services.fakes import template_logic_analysis
+from app.services.logic_chain import LogicChainService, parse_batch_output
+
+
+def test_parse_batch_output_splits_sections():
+    raw = "\n".join([
+        "### Sentence 2",
+        template_logic_analysis("If it rains, then the lawn is wet."),
+        "### Sentence 1",
+        template_logic_analysis("Cats or dogs."),
+        "### Sentence 3",
+        "I could not analyze this one.",
+    ])
+    results = parse_batch_output(raw, 3)
+    assert sorted(results) == [0, 1]
+    assert results[0]["logic_expression"] == "Cats ∨ dogs"
+    assert results[1]["logic_expression"] == "it rains → the lawn is wet"
+
+
+@pytest.mark.asyncio
+async def test_analyze_batch_packs_requests_and_reports_partial_failures(monkeypatch):
+    service = LogicChainService()
+    service.cache = ResultCache()
+    service.fast_path = None
+    prompts = []
+
+    async def fake_get_response(messages, max_tokens=500):
+        prompt = messages[-1]["content"]
+        prompts.append(prompt)
+        if "Sentence 1: \"Broken request.\"" in prompt:
+            raise Exception("Error in getting LLM response: timeout")
+        numbered = [line for line in prompt.splitlines() if line.startswith("Sentence ")]
+        # Drop the last section to simulate a truncated response
+        return "\n".join(
+            f"### Sentence {i + 1}\n{template_logic_analysis(line.split(': ', 1)[1].strip(chr(34)))}"
+            for i, line in enumerate(numbered[:-1] if len(numbered) == 3 else numbered)
+        )
+
+    monkeypatch.setattr(service, "get_response", fake_get_response)
+
+    sentences = ["A and B.", "C or D.", "If E, then F.", "", "Broken request.", "G."]
+    items = await service.analyze_batch(sentences, max_sentences_per_request=3, max_concurrency=2)
+
+    assert len(prompts) == 2
+    assert [item.index for item in items] == list(range(6))
+    assert items[0].logic_chain.logic_expression == "A ∧ B"
+    assert items[1].logic_chain.logic_expression == "C ∨ D"
+    assert items[2].error == "No analysis returned for this sentence"
+    assert items[3].error == "Empty sentence"
+    assert "timeout" in items[4].error and "timeout" in items[5].error
+
+    # Successful sentences are cached and not sent again
+    prompts.clear()
+    items = await service.analyze_batch(["A and B.", "C or D."])
+    assert prompts == []
+    assert items[1].logic_chain.logic_expression == "C ∨ D"
+
+
+@pytest.mark.asyncio
+async def test_batch_and_single_analyses_are_cached_apart(monkeypatch):
+    service = LogicChainService()
+    service.cache = ResultCache()
+    service.fast_path = None
+    calls = []
+
+    async def fake_get_response(messages, max_tokens=500):
+        calls.append(messages)
+        if "Sentence 1:" in messages[-1]["content"]:
+            return f"### Sentence 1\n{template_logic_analysis('A and B.')}"
+        return template_logic_analysis("A and B.")
+
+    monkeypatch.setattr(service, "get_response", fake_get_response)
+
+    await service.analyze_batch(["A and B."])
+    # The single-sentence prompt is not answered from the batch prompt's result
+    assert (await service.analyze_logic("A and B.")).source != "cache"
+    assert len(calls) == 2
+    assert (await service.analyze_batch(["A and B."]))[0].logic_chain.source == "cache"
+    assert (await service.analyze_logic("A and B.")).source == "cache"
+    assert len(calls) == 2
@@ -0,0 +1,36 @@
+import pytest
+from app.services.logic_chain import (
+    OPERAND,
+    compile_logical_expression,
+    compile_logical_expressions,
+    convert_logical_expression
+)
+
+
+@pytest.mark.parametrize("expr, tokens", [
+    ("It rains → the lawn is wet", ["it rains", "4", "the lawn is wet"]),
+    ("(A ∧ B) ↔ ～C", ["6", "a", "1", "b", "6", "5", "3", "c"]),
+    ("x~y ∨ z", ["x", "3", "y", "2", "z"]),
+    ("  ( )  ", ["6", "6"]),
+    ("", []),
+])
+def test_convert_logical_expression(expr, tokens):
+    assert convert_logical_expression(expr) == tokens
+
+
+def test_compact_form_round_trips_to_tokens():
+    expr = "((P → Q) ∧ ~ Q) → ~ P"
+    compact = compile_logical_expression(expr)
+
+    assert compact.codes.tolist() == [6, 6, OPERAND, 4, OPERAND, 6, 1, 3, OPERAND, 6, 4, 3, OPERAND]
+    assert compact.operands == ("p", "q", "q", "p")
+    assert compact.to_tokens() == convert_logical_expression(expr)
+
+
+def test_bulk_compile_shares_operands():
+    history = ["It rains → the lawn is wet", "~ the lawn is wet", "It rains → the lawn is wet"]
+    compiled = compile_logical_expressions(history)
+
+    assert [c.to_tokens() for c in compiled] == [convert_logical_expression(e) for e in history]
+    assert compiled[0] is compiled[2]
+    assert compiled[0].operands[1] is compiled[1].operands[0]
@@ -0,0 +1,90 @@
+import pytest
+from app.services.logic_chain import LogicChainService
+from app.services.logic_fastpath import FastPathAnalyzer
+
+
+@pytest.mark.parametrize("sentence, form, valid", [
+    ("If it rains, then the lawn is wet.", "conditional", True),
+    ("The lawn is wet if and only if it rains.", "biconditional", True),
+    ("If it rains, the lawn is wet. It rains. Therefore, the lawn is wet.", "modus_ponens", True),
+    ("If it rains, the lawn is wet. The lawn is not wet. So it does not rain.", "modus_tollens", True),
+    ("If it rains, the lawn is wet. It does not rain. Therefore, the lawn is not wet.", "denying_the_antecedent", False),
+    ("If it rains, the lawn is wet. The lawn is wet. Therefore, it rains.", "affirming_the_consequent", False),
+    ("Either it rains or it snows. It does not rain. Therefore, it snows.", "disjunctive_syllogism", True),
+])
+def test_recognises_simple_argument_forms(sentence, form, valid):
+    analyzer = FastPathAnalyzer()
+    result = analyzer.analyze(sentence)
+
+    assert result is not None
+    assert result.form == form
+    assert result.valid is valid
+    # Only the shape is checked, never the premises
+    assert result.sound is False
+    assert result.sound_explanation
+
+
+@pytest.mark.parametrize("sentence, expression", [
+    ("Students don't learn.", "~ Students learn"),
+    ("The student doesn't learn.", "~ The student learn"),
+    ("Students didn't learn.", "~ Students learn"),
+    ("Students do not learn.", "~ Students learn"),
+    ("Students can't learn.", "~ Students can learn"),
+    ("Students won't learn.", "~ Students will learn"),
+    ("The lawn isn't wet.", "~ The lawn is wet"),
+])
+def test_negations_drop_the_whole_contraction(sentence, expression):
+    result = FastPathAnalyzer().analyze(sentence)
+
+    assert result.form == "negation"
+    assert result.logic_expression == expression
+
+
+@pytest.mark.parametrize("sentence", [
+    "Renewable energy is the future of our planet.",
+    "We should tax carbon because it reduces emissions and funds research.",
+    "What if it rains",
+    "Why if it rains, the lawn is wet.",
+    "Is the lawn wet if it rains",
+    "Rain if it rains.",
+    # Trailing "if" and embedded clauses are left to the LLM
+    "The lawn is wet if it rains.",
+    "I wonder if it rains.",
+    "He knows that if it rains, the lawn is wet.",
+    "Policies that fail if funded are bad.",
+    "It is unclear if the policy works.",
+    "Ask him if it rains.",
+    "If it rains, close the window.",
+    "",
+])
+def test_declines_sentences_outside_the_grammar(sentence):
+    analyzer = FastPathAnalyzer()
+
+    assert analyzer.analyze(sentence) is None
+    assert analyzer.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_analyze_logic_uses_fast_path_and_falls_back_to_llm(monkeypatch):
+    service = LogicChainService()
+    service.cache = None
+    service.fast_path = FastPathAnalyzer()
+    calls = []
+
+    async def fake_get_response(messages, max_tokens=500):
+        calls.append(messages)
+        return "Logical Expression:\nRenewable energy → future\n\nPerformances:\nValid: True\nSound: True\n"
+
+    monkeypatch.setattr(service, "get_response", fake_get_response)
+
+    fast = await service.analyze_logic("If it rains, then the lawn is wet.")
+    assert fast.source == "fast_path"
+    assert fast.converted_logical_expression == ["it rains", "4", "the lawn is wet"]
+    assert calls == []
+
+    # Previous context has to be integrated by the LLM
+    await service.analyze_logic("If it rains, then the lawn is wet.", ["it rains"])
+    slow = await service.analyze_logic("Renewable energy is the future of our planet.")
+    assert slow.source == "llm"
+    assert len(calls) == 2
+    assert service.fast_path.stats()["hits"] == 1
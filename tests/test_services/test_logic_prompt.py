@@ -0,0 +1,39 @@
+import pytest
+from app.services.fakes import FakeOpenAIClient, FaultInjector
+from app.services.logic_chain import (
+    LogicChainService,
+    SYSTEM_PROMPT,
+    build_analysis_messages,
+    build_batch_messages
+)
+
+
+def test_static_instructions_form_a_stable_prefix():
+    plain = build_analysis_messages("If it rains, then the lawn is wet.")
+    with_context = build_analysis_messages("The lawn is dry.", ["it rains → the lawn is wet"])
+    batch = build_batch_messages(["A or B.", "Not C."], ["it rains → the lawn is wet"])
+
+    for messages in (plain, with_context, batch):
+        assert messages[0] == {"role": "system", "content": SYSTEM_PROMPT}
+    # Variable content comes last
+    assert with_context[1]["content"].startswith("Previous Logical Expressions:\nit rains → the lawn is wet\n")
+    assert with_context[1]["content"].endswith('"The lawn is dry."\n')
+
+
+@pytest.mark.asyncio
+async def test_usage_reports_prompt_completion_and_cached_tokens():
+    service = LogicChainService()
+    service.cache = None
+    service.fast_path = None
+    service.fake_client = FakeOpenAIClient(FaultInjector("LOGIC", mean_ms=0))
+
+    await service.analyze_logic("If it rains, then the lawn is wet.")
+    first_prompt_tokens = service.usage.prompt_tokens
+    assert service.usage.cached_tokens == 0
+
+    await service.analyze_logic("Cats or dogs.")
+    stats = service.usage.stats()
+    assert stats["calls"] == 2
+    assert stats["completion_tokens"] > 0
+    # The second call reuses the cached system prefix
+    assert 0 < stats["cached_tokens"] <= service.usage.prompt_tokens - first_prompt_tokens
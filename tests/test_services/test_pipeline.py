@@ -0,0 +1,54 @@
+import asyncio
+import time
+import pytest
+from app.services.pipeline import StageGraph
+
+STAGE_DELAY = 0.1
+
+
+def delayed(value, delay=STAGE_DELAY):
+    async def stage(*args):
+        await asyncio.sleep(delay)
+        return (value, args)
+    return stage
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap():
+    # Mirrors the agent-training round: two roots, two stages fed by the rebuttal
+    graph = StageGraph()
+    graph.add_stage("analyze_user", delayed("user"))
+    graph.add_stage("generate_rebuttal", delayed("rebuttal"))
+    graph.add_stage("text_to_speech", delayed("audio"), depends_on=["generate_rebuttal"])
+    graph.add_stage("analyze_rebuttal", delayed("analysis"), depends_on=["generate_rebuttal"])
+
+    started = time.perf_counter()
+    results = await graph.run()
+    elapsed = time.perf_counter() - started
+
+    # Critical path is two stages long, the sequential sum is four
+    assert elapsed < STAGE_DELAY * 3
+    assert results["text_to_speech"] == ("audio", (("rebuttal", ()),))
+    assert set(graph.timings) == set(results)
+    assert graph.timings["text_to_speech"]["start_ms"] >= graph.timings["generate_rebuttal"]["duration_ms"]
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_remaining_stages():
+    async def fail():
+        raise RuntimeError("boom")
+
+    graph = StageGraph()
+    graph.add_stage("slow", delayed("slow", delay=5))
+    graph.add_stage("fail", fail)
+
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError):
+        await graph.run()
+    assert time.perf_counter() - started < 1
+
+
+def test_unknown_dependency_rejected():
+    graph = StageGraph()
+    with pytest.raises(ValueError):
+        graph.add_stage("tts", delayed("audio"), depends_on=["missing"])
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from app.services.sequencer import SessionSequencer
+
+
+async def submit(sequencer, session_id, delay, stored, fail=False):
+    turn = sequencer.take(session_id)
+    try:
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("analysis failed")
+        await turn.wait()
+        stored.append((session_id, delay))
+    finally:
+        turn.finish()
+
+
+@pytest.mark.asyncio
+async def test_turns_finish_in_arrival_order():
+    sequencer = SessionSequencer()
+    stored = []
+    # Each submission's work is shorter than the one before it
+    await asyncio.gather(*(submit(sequencer, "a", 0.05 - i * 0.01, stored) for i in range(5)))
+    assert [delay for _, delay in stored] == [0.05 - i * 0.01 for i in range(5)]
+    assert len(sequencer) == 0
+
+
+@pytest.mark.asyncio
+async def test_sessions_do_not_wait_for_each_other():
+    sequencer = SessionSequencer()
+    stored = []
+    await asyncio.gather(submit(sequencer, "slow", 0.1, stored), submit(sequencer, "fast", 0.0, stored))
+    assert [session_id for session_id, _ in stored] == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_failed_or_cancelled_turns_do_not_block_the_line():
+    sequencer = SessionSequencer()
+    stored = []
+    first = asyncio.create_task(submit(sequencer, "a", 0.05, stored))
+    failed = asyncio.create_task(submit(sequencer, "a", 0.0, stored, fail=True))
+    cancelled = asyncio.create_task(submit(sequencer, "a", 1.0, stored))
+    last = asyncio.create_task(submit(sequencer, "a", 0.0, stored))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    with pytest.raises(RuntimeError):
+        await failed
+    await asyncio.wait_for(asyncio.gather(first, last), timeout=1)
+    # The last submission still waited for the first one
+    assert stored == [("a", 0.05), ("a", 0.0)]
+    assert len(sequencer) == 0
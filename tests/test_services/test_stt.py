@@ -0,0 +1,149 @@
+import asyncio
+import io
+import os
+import wave
+import pytest
+from starlette.datastructures import UploadFile
+from app.config import settings
+from app.services.stt import stt_service
+
+# Headerless LINEAR16, taken to be at STT_SAMPLE_RATE
+AUDIO = bytes(range(1, 81))
+
+
+async def chunks(data, size=16):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+@pytest.mark.asyncio
+async def test_every_source_gives_the_same_transcript(tmp_path):
+    expected = await stt_service.transcribe(AUDIO)
+    assert await stt_service.transcribe(bytearray(AUDIO)) == expected
+    assert await stt_service.transcribe(memoryview(AUDIO)) == expected
+    assert await stt_service.transcribe(io.BytesIO(AUDIO)) == expected
+    assert await stt_service.transcribe(chunks(AUDIO)) == expected
+
+    path = tmp_path / "argument.wav"
+    path.write_bytes(AUDIO)
+    assert await stt_service.transcribe_audio(path) == expected
+
+    with pytest.raises(ValueError):
+        await stt_service.transcribe(b"")
+
+
+@pytest.mark.asyncio
+async def test_large_uploads_can_go_through_a_temp_file(tmp_path, monkeypatch):
+    expected = await stt_service.transcribe(AUDIO)
+    monkeypatch.setattr(settings, "TEMP_STORAGE_PATH", str(tmp_path))
+
+    # Below the threshold nothing touches the disk
+    monkeypatch.setattr(settings, "STT_TEMP_FILE_MIN_BYTES", len(AUDIO) + 1)
+    assert await stt_service.transcribe_upload(UploadFile(io.BytesIO(AUDIO), size=len(AUDIO))) == expected
+    assert not any(tmp_path.iterdir())
+
+    monkeypatch.setattr(settings, "STT_TEMP_FILE_MIN_BYTES", len(AUDIO))
+    transcribed_from = []
+    transcribe_audio = stt_service.transcribe_audio
+
+    async def recording_transcribe_audio(path):
+        transcribed_from.append(path)
+        return await transcribe_audio(path)
+
+    monkeypatch.setattr(stt_service, "transcribe_audio", recording_transcribe_audio)
+    assert await stt_service.transcribe_upload(UploadFile(io.BytesIO(AUDIO), size=len(AUDIO))) == expected
+    assert transcribed_from and transcribed_from[0].parent == tmp_path
+    # The temporary file is removed afterwards
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_streaming_recognition_overlaps_the_upload(monkeypatch):
+    monkeypatch.setattr(settings, "STT_STREAM_CHUNK_BYTES", 16)
+    rest_uploaded = asyncio.Event()
+
+    async def upload():
+        yield AUDIO[:32]
+        # The rest only arrives once the first interim result is out
+        await rest_uploaded.wait()
+        yield AUDIO[32:]
+
+    results = []
+    async for transcript in stt_service.stream_transcribe(upload()):
+        results.append(transcript)
+        rest_uploaded.set()
+
+    assert not results[0].is_final
+    assert [r.is_final for r in results].count(True) == 1
+    # Streaming and one-shot recognition agree on the final transcript
+    assert results[-1].is_final and results[-1].text == await stt_service.transcribe(AUDIO)
+
+    assert [r async for r in stt_service.stream_transcribe(chunks(b""))] == []
+
+
+@pytest.mark.asyncio
+async def test_long_recordings_use_long_running_recognition(monkeypatch):
+    expected = await stt_service.transcribe(AUDIO)
+    calls = []
+    long_running_recognize = stt_service.client.long_running_recognize
+
+    def recording_long_running_recognize(**kwargs):
+        calls.append(kwargs)
+        return long_running_recognize(**kwargs)
+
+    monkeypatch.setattr(stt_service.client, "long_running_recognize", recording_long_running_recognize)
+    monkeypatch.setattr(settings, "STT_LONG_RUNNING_MIN_SECONDS", 0.001)
+    assert await stt_service.transcribe(AUDIO) == expected
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_wav_uploads_are_sent_at_their_own_rate(monkeypatch):
+    configs = []
+    recognize = stt_service.client.recognize
+
+    def recording_recognize(config, audio):
+        configs.append(config)
+        return recognize(config=config, audio=audio)
+
+    monkeypatch.setattr(stt_service.client, "recognize", recording_recognize)
+    wav = io.BytesIO()
+    with wave.open(wav, "wb") as writer:
+        writer.setnchannels(2)
+        writer.setsampwidth(2)
+        writer.setframerate(48000)
+        writer.writeframes(AUDIO * 6)
+
+    await stt_service.transcribe(wav.getvalue())
+    assert (configs[-1].sample_rate_hertz, configs[-1].audio_channel_count) == (settings.STT_TARGET_SAMPLE_RATE, 1)
+
+    # Streamed WAV keeps its recorded format, read from the header in pieces
+    streamed = [r async for r in stt_service.stream_transcribe(chunks(wav.getvalue(), size=8))]
+    assert streamed[-1].is_final
+    with pytest.raises(ValueError):
+        [r async for r in stt_service.stream_transcribe(chunks(b"RIFF\x00\x00\x00\x00WAVE" + bytes(4096)))]
+
+
+@pytest.mark.asyncio
+async def test_silence_is_cut_before_recognition(monkeypatch):
+    sent = []
+    recognize = stt_service.client.recognize
+
+    def recording_recognize(config, audio):
+        sent.append(audio.content)
+        return recognize(config=config, audio=audio)
+
+    monkeypatch.setattr(stt_service.client, "recognize", recording_recognize)
+    silence = bytes(2 * int(os.getenv("STT_SAMPLE_RATE", "22050")))
+
+    assert await stt_service.transcribe(silence + AUDIO + silence) == await stt_service.transcribe(AUDIO)
+    assert len(sent[0]) < len(AUDIO) + len(silence)
+
+    # Silent clips never reach the recogniser
+    with pytest.raises(ValueError):
+        await stt_service.transcribe(silence)
+    assert len(sent) == 2
+
+    monkeypatch.setattr(settings, "STT_VAD_ENABLED", False)
+    await stt_service.transcribe(silence)
+    assert sent[-1] == silence
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from app.services.tts import IncrementalSpeech, SentenceSplitter, follow_partial_audio, partial_audio_path
+
+
+def test_sentence_splitter_releases_complete_sentences():
+    splitter = SentenceSplitter(min_chars=10)
+    assert splitter.feed("While renewables help the planet") == []
+    assert splitter.feed(", costs rise. Yes. Grids ") == ["While renewables help the planet, costs rise."]
+    # "Yes." is too short on its own and is merged into the next sentence
+    assert splitter.feed("need storage first! ") == ["Yes. Grids need storage first!"]
+    assert splitter.feed("Then") == []
+    assert splitter.flush() == ["Then"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_speech_streams_sentences_in_order(tmp_path):
+    synthesised = []
+
+    def synthesize(sentence):
+        synthesised.append(sentence)
+        return [sentence.encode(), b"|"]
+
+    speech = IncrementalSpeech(
+        stream_id="test",
+        synthesize=synthesize,
+        output_path=tmp_path / "test.mp3",
+        relative_path="audio_storage/test.mp3",
+        min_chars=5
+    )
+    listener = asyncio.create_task(_collect(speech))
+
+    speech.feed("First sentence here. Second")
+    # The first sentence is synthesised before the text stream ends
+    await asyncio.sleep(0.1)
+    assert synthesised == ["First sentence here."]
+
+    speech.feed(" one.")
+    speech.finish()
+    assert await speech.wait_closed() == "audio_storage/test.mp3"
+
+    expected = b"First sentence here.|Second one.|"
+    assert await listener == expected
+    assert (tmp_path / "test.mp3").read_bytes() == expected
+    # Late listeners replay the whole stream
+    assert await _collect(speech) == expected
+
+
+@pytest.mark.asyncio
+async def test_other_workers_follow_the_partial_file(tmp_path):
+    def synthesize(sentence):
+        return [sentence.encode(), b"|"]
+
+    output_path = tmp_path / "test.mp3"
+    speech = IncrementalSpeech(
+        stream_id="test",
+        synthesize=synthesize,
+        output_path=output_path,
+        relative_path="audio_storage/test.mp3",
+        min_chars=5
+    )
+    speech.feed("First sentence here. ")
+    await asyncio.sleep(0.05)
+    assert partial_audio_path(output_path).exists()
+    assert not output_path.exists()
+
+    # A follower that only sees the file system, as another worker would
+    follower = asyncio.create_task(_join(follow_partial_audio(output_path, poll_interval=0.01)))
+    await asyncio.sleep(0.05)
+    speech.feed("Second one.")
+    speech.finish()
+    await speech.wait_closed()
+
+    assert await follower == b"First sentence here.|Second one.|"
+    assert not partial_audio_path(output_path).exists()
+
+
+async def _join(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def _collect(speech):
+    return b"".join([chunk async for chunk in speech.iter_audio()])
@@ -0,0 +1,98 @@
+import json
+import pytest
+from app.storage import DebateJournal
+
+
+def make_round(index):
+    return {"round_index": index, "text": f"Argument {index}", "speaker_id": "alice"}
+
+
+def test_recovers_snapshot_plus_journal_tail(tmp_path):
+    snapshot = tmp_path / "debate_data.json"
+    # A snapshot in the original debate_data.json format
+    snapshot.write_text(json.dumps({"d1": {"topic": "Energy", "rounds": [make_round(0)], "participants": {}}}))
+
+    journal = DebateJournal(str(snapshot))
+    debates = journal.load()
+    journal.append({"op": "round", "debate_id": "d1", "round": make_round(1)})
+    journal.append({"op": "start", "debate_id": "d2", "debate": {"topic": "Tax", "rounds": [], "participants": {}}})
+    journal.close()
+
+    recovered = DebateJournal(str(snapshot)).load()
+    assert [r["round_index"] for r in recovered["d1"]["rounds"]] == [0, 1]
+    assert recovered["d2"]["topic"] == "Tax"
+    assert debates["d1"]["topic"] == "Energy"
+
+
+def test_compaction_is_idempotent_and_skips_torn_tail(tmp_path):
+    snapshot = tmp_path / "debate_data.json"
+    journal = DebateJournal(str(snapshot), compact_min_bytes=0)
+    debates = journal.load()
+    debates["d1"] = {"topic": "Energy", "rounds": [], "participants": {}}
+    journal.append({"op": "start", "debate_id": "d1", "debate": debates["d1"]})
+    debates["d1"]["rounds"].append(make_round(0))
+    journal.append({"op": "round", "debate_id": "d1", "round": make_round(0)})
+    assert journal.needs_compaction
+
+    # Simulate a crash after the snapshot was written but before the journal was truncated
+    journal_lines = (tmp_path / "debate_data.json.journal").read_bytes()
+    journal.compact()
+    (tmp_path / "debate_data.json.journal").write_bytes(journal_lines + b'{"op": "round", "deb')
+
+    reopened = DebateJournal(str(snapshot))
+    recovered = reopened.load()
+    assert len(recovered["d1"]["rounds"]) == 1
+    assert reopened.journal_bytes == len(journal_lines)
+    assert json.loads(snapshot.read_text()) == recovered
+
+
+def test_snapshot_is_indexed_and_read_lazily(tmp_path):
+    snapshot = tmp_path / "debate_data.json"
+    snapshot.write_text(json.dumps({
+        f"d{i}": {"topic": f"Topic {i}", "rounds": [make_round(0)], "participants": {}} for i in range(50)
+    }))
+
+    journal = DebateJournal(str(snapshot))
+    journal.open()
+    # The original single-line file was rewritten one debate per line, still as valid JSON
+    assert len(json.loads(snapshot.read_text())) == 50
+    assert journal.reads == 0
+    assert journal.read_debate("d42")["topic"] == "Topic 42"
+    assert journal.read_debate("missing") is None
+    assert journal.reads == 2
+
+    # A stale index (e.g. a crash between the two renames of a compaction) is rebuilt
+    (tmp_path / "debate_data.json.index").write_bytes(b"DEBATEIDX1 3 0 0\n")
+    reopened = DebateJournal(str(snapshot))
+    assert reopened.read_debate("d7")["topic"] == "Topic 7"
+    assert len(reopened.index) == 50
+
+
+def test_compaction_copies_untouched_debates(tmp_path):
+    snapshot = tmp_path / "debate_data.json"
+    snapshot.write_text(json.dumps({
+        "d1": {"topic": "Energy", "rounds": [], "participants": {}},
+        "d2": {"topic": "Tax", "rounds": [], "participants": {}}
+    }))
+    journal = DebateJournal(str(snapshot))
+    journal.append({"op": "round", "debate_id": "d2", "round": make_round(0)})
+    journal.compact()
+
+    assert journal.journal_bytes == 0
+    assert journal.read_debate("d1")["topic"] == "Energy"
+    assert len(journal.read_debate("d2")["rounds"]) == 1
+    assert set(journal.debate_ids()) == {"d1", "d2"}
+
+
+def test_only_one_writer_may_hold_the_journal(tmp_path):
+    path = str(tmp_path / "debate_data.json")
+    writer = DebateJournal(path)
+    writer.append({"op": "start", "debate_id": "d1", "debate": {"topic": "Energy", "rounds": [], "participants": {}}})
+
+    # Readers need no lock, a second writer is refused
+    assert DebateJournal(path).read_debate("d1")["topic"] == "Energy"
+    with pytest.raises(RuntimeError):
+        DebateJournal(path).lock()
+
+    writer.close()
+    DebateJournal(path).lock()
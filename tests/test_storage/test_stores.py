@@ -0,0 +1,270 @@
+import asyncio
+from datetime import datetime
+import threading
+import pytest
+from app.models.records import ConversationRound, LogicChainRecord
+from app.models.schemas import Side
+from app.storage import (
+    DebateJournal,
+    JournalDebateStore,
+    JournalWriter,
+    MemoryConversationStore,
+    SqliteConversationStore,
+    SqliteDatabase,
+    SqliteDebateStore
+)
+
+LOGIC_CHAIN = {
+    "logic_expression": "it rains → the lawn is wet",
+    "converted_logical_expression": ["it rains", "4", "the lawn is wet"],
+    "performance": {"valid": True, "valid_explanation": "", "sound": False, "sound_explanation": "Unverified."},
+    "source": "fast_path"
+}
+
+
+def conversation_round(i):
+    return ConversationRound(
+        user_text=f"user {i}",
+        user_chain=LogicChainRecord.from_dict(LOGIC_CHAIN),
+        ai_text=f"ai {i}",
+        audio_url=f"audio/{i}.mp3",
+        ai_chain=LogicChainRecord.from_dict(LOGIC_CHAIN),
+        timings={"total_ms": 1.0}
+    )
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def stores(request, tmp_path):
+    if request.param == "sqlite":
+        database = SqliteDatabase(str(tmp_path / "debate_ai.db"))
+        yield SqliteDebateStore(database), SqliteConversationStore(database)
+        database.close()
+    else:
+        yield JournalDebateStore(DebateJournal(str(tmp_path / "debate_data.json"))), MemoryConversationStore()
+
+
+@pytest.mark.asyncio
+async def test_debate_store_round_trip(stores):
+    debate_store, _ = stores
+    now = datetime.utcnow()
+    await debate_store.create_debate("d1", {
+        "topic": "Energy",
+        "start_time": now,
+        "participants": {
+            "alice": {"side": Side.SUPPORTING, "join_time": now},
+            "bob": {"side": Side.OPPOSING, "join_time": now}
+        }
+    })
+    for speaker_id in ("alice", "bob"):
+        index = await debate_store.add_round("d1", {
+            "text": f"{speaker_id} argues",
+            "speaker_id": speaker_id,
+            "side": Side.SUPPORTING if speaker_id == "alice" else Side.OPPOSING,
+            "logic_chain": LOGIC_CHAIN,
+            "timestamp": now
+        })
+
+    debate = await debate_store.get_debate("d1")
+    assert index == 1
+    assert debate["participants"]["bob"]["side"] == "opposing"
+    assert [r["round_index"] for r in debate["rounds"]] == [0, 1]
+    assert debate["rounds"][1]["logic_chain"] == LOGIC_CHAIN
+    assert "rounds" not in await debate_store.get_debate("d1", include_rounds=False)
+    assert await debate_store.get_debate("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_conversation_store_round_trip(stores):
+    _, conversation_store = stores
+    await conversation_store.create_conversation("c1", {
+        "topic": 1,
+        "topic_info": {"id": 1, "title": "Climate Policy"},
+        "user_side": "supporting",
+        "start_time": datetime.utcnow()
+    })
+    assert await conversation_store.get_last_round("c1") is None
+
+    for i in range(3):
+        await conversation_store.add_round("c1", conversation_round(i))
+
+    conversation = await conversation_store.get_conversation("c1")
+    last = await conversation_store.get_last_round("c1")
+    assert conversation["topic_info"]["title"] == "Climate Policy"
+    assert [r.ai_text for r in await conversation_store.get_rounds("c1")] == ["ai 0", "ai 1", "ai 2"]
+    assert last.round_index == 2
+    assert last.user_chain.to_dict() == LOGIC_CHAIN
+    assert last.to_dict()["ai"]["audio_url"] == "audio/2.mp3"
+
+
+@pytest.mark.asyncio
+async def test_stores_read_round_ranges(stores):
+    debate_store, conversation_store = stores
+    now = datetime.utcnow()
+    await debate_store.create_debate("d1", {"topic": "Energy", "start_time": now, "participants": {}})
+    await conversation_store.create_conversation("c1", {
+        "topic": 1,
+        "topic_info": {"id": 1},
+        "user_side": Side.SUPPORTING,
+        "start_time": now
+    })
+    for i in range(5):
+        await debate_store.add_round("d1", {
+            "text": f"round {i}", "speaker_id": "alice", "side": Side.SUPPORTING, "logic_chain": LOGIC_CHAIN, "timestamp": now
+        })
+        await conversation_store.add_round("c1", conversation_round(i))
+
+    assert [r["round_index"] for r in await debate_store.get_rounds("d1", since_round=1, limit=2)] == [2, 3]
+    assert [r["round_index"] for r in await debate_store.get_rounds("d1", since_round=3)] == [4]
+    assert [r.round_index for r in await conversation_store.get_rounds("c1", limit=2)] == [0, 1]
+    assert (await conversation_store.get_rounds("c1", since_round=3))[0].ai_chain.to_dict() == LOGIC_CHAIN
+    assert await conversation_store.get_rounds("c1", since_round=4) == []
+    assert (await conversation_store.get_last_round("c1")).round_index == 4
+
+
+@pytest.mark.asyncio
+async def test_sqlite_conversations_survive_reopen(tmp_path):
+    path = str(tmp_path / "debate_ai.db")
+    database = SqliteDatabase(path)
+    await SqliteConversationStore(database).create_conversation("c1", {
+        "topic": 2,
+        "topic_info": {"id": 2},
+        "user_side": "opposing",
+        "start_time": datetime.utcnow()
+    })
+    database.close()
+
+    reopened = SqliteConversationStore(SqliteDatabase(path))
+    conversation = await reopened.get_conversation("c1")
+    reopened.close()
+    assert conversation["user_side"] == "opposing"
+    assert conversation["rounds"] == []
+
+
+@pytest.mark.asyncio
+async def test_journal_store_evicts_cold_debates_and_reloads_them(tmp_path):
+    journal = DebateJournal(str(tmp_path / "debate_data.json"))
+    writer = JournalWriter(journal, durability="batch", flush_interval=60)
+    store = JournalDebateStore(journal, writer, cache_size=2)
+
+    for i in range(4):
+        await store.create_debate(f"d{i}", {"topic": f"Topic {i}", "start_time": datetime.utcnow(), "participants": {}})
+    # Nothing is on disk yet, so every debate stays pinned in memory
+    assert store.stats()["cached_debates"] == 4
+
+    assert await store.flush(timeout=5)
+    await store.create_debate("d4", {"topic": "Topic 4", "start_time": datetime.utcnow(), "participants": {}})
+    assert store.stats()["cached_debates"] == 2
+    assert store.stats()["evictions"] == 3
+
+    # An evicted debate is read back from disk on its next access
+    await store.add_round("d1", {"text": "It rains.", "speaker_id": "alice", "side": "supporting", "logic_chain": LOGIC_CHAIN, "timestamp": datetime.utcnow()})
+    assert store.stats()["loads"] == 1
+    assert await store.flush(timeout=5)
+    store.close()
+    assert DebateJournal(str(tmp_path / "debate_data.json")).read_debate("d1")["rounds"][0]["text"] == "It rains."
+
+
+@pytest.mark.asyncio
+async def test_journal_store_always_mode_writes_off_the_event_loop(tmp_path):
+    journal = DebateJournal(str(tmp_path / "debate_data.json"))
+    store = JournalDebateStore(journal, JournalWriter(journal, durability="always"))
+    written_on = []
+    append_many = journal.append_many
+    journal.append_many = lambda events, fsync=False: (written_on.append(threading.current_thread().name), append_many(events, fsync))
+
+    await store.create_debate("d1", {"topic": "Energy", "start_time": datetime.utcnow(), "participants": {}})
+    await store.add_round("d1", {"text": "It rains.", "speaker_id": "alice", "side": "supporting", "logic_chain": LOGIC_CHAIN, "timestamp": datetime.utcnow()})
+    # Both writes are on disk by the time the calls return
+    assert written_on == ["journal-writer", "journal-writer"]
+    assert DebateJournal(str(tmp_path / "debate_data.json")).read_debate("d1")["rounds"][0]["text"] == "It rains."
+    store.close()
+
+
+def test_journal_store_locks_the_journal_when_opened(tmp_path):
+    path = str(tmp_path / "debate_data.json")
+    store = JournalDebateStore(DebateJournal(path))
+    # Building the store, as importing app.storage does, takes no lock
+    DebateJournal(path).lock()
+
+    store = JournalDebateStore(DebateJournal(path))
+    store.open()
+    with pytest.raises(RuntimeError):
+        DebateJournal(path).lock()
+    store.close()
+    DebateJournal(path).lock()
+
+
+async def create_conversations(store, count):
+    for i in range(count):
+        await store.create_conversation(f"c{i}", {
+            "topic": 1,
+            "topic_info": {"id": 1, "title": "Climate Policy"},
+            "user_side": Side.SUPPORTING,
+            "start_time": datetime.utcnow()
+        })
+
+
+@pytest.mark.asyncio
+async def test_conversation_store_evicts_least_recently_used():
+    store = MemoryConversationStore(max_entries=2)
+    await create_conversations(store, 2)
+    await store.get_conversation("c0")
+    await create_conversations(store, 3)
+
+    # c1 was the least recently used when c2 arrived; without a spill directory it is gone
+    assert await store.get_conversation("c1") is None
+    assert await store.get_conversation("c2") is not None
+    assert store.stats()["evictions"] >= 1
+    assert store.stats()["conversations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_conversation_store_spills_over_budget_and_rehydrates(tmp_path):
+    store = MemoryConversationStore(max_bytes=4096, spill_dir=str(tmp_path / "spill"))
+    await create_conversations(store, 2)
+    for i in range(5):
+        await store.add_round("c0", conversation_round(i))
+    await store.add_round("c1", conversation_round(0))
+
+    assert store.stats()["spills"] == 1
+    assert store.bytes <= 4096
+    rounds = await store.get_rounds("c0")
+    assert [r.user_text for r in rounds] == [f"user {i}" for i in range(5)]
+    assert isinstance(rounds[0].timestamp, datetime)
+    conversation = await store.get_conversation("c0", include_rounds=False)
+    assert conversation["user_side"] is Side.SUPPORTING
+    assert isinstance(conversation["start_time"], datetime)
+    assert await store.add_round("c0", conversation_round(5)) == 5
+    assert store.stats()["rehydrations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_conversation_store_spills_off_the_event_loop(tmp_path):
+    store = MemoryConversationStore(max_entries=1, spill_dir=str(tmp_path / "spill"))
+    disk_io_on = []
+    for name in ("_write_spills", "_read_spill"):
+        method = getattr(store, name)
+        setattr(store, name, lambda *args, method=method: (disk_io_on.append(threading.current_thread().name), method(*args))[1])
+
+    await create_conversations(store, 2)
+    await store.add_round("c0", conversation_round(0))
+    # Concurrent reads of a spilled conversation share the one copy read back
+    c1, c1_again = await asyncio.gather(store.get_conversation("c1"), store.get_conversation("c1"))
+    assert c1 is c1_again is not None
+    assert (await store.get_rounds("c0"))[0].user_text == "user 0"
+    assert disk_io_on and threading.main_thread().name not in disk_io_on
+
+
+@pytest.mark.asyncio
+async def test_conversation_store_drops_idle_conversations(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.storage.memory.time.time", lambda: clock[0])
+    store = MemoryConversationStore(ttl_seconds=60, max_entries=1, spill_dir=str(tmp_path / "spill"))
+    await create_conversations(store, 2)
+    assert store.stats()["spills"] == 1
+
+    clock[0] += 61
+    assert await store.get_conversation("c1") is None
+    assert await store.get_conversation("c0") is None
+    assert store.stats()["expirations"] == 2
+    assert store.stats()["conversations"] == 0
@@ -0,0 +1,89 @@
+import threading
+import pytest
+from app.storage import DebateJournal, JournalWriter
+
+
+def start_event(debate_id):
+    return {"op": "start", "debate_id": debate_id, "debate": {"topic": debate_id, "rounds": [], "participants": {}}}
+
+
+@pytest.mark.parametrize("durability", ["batch", "fsync"])
+def test_events_are_coalesced_into_batches(tmp_path, durability):
+    journal = DebateJournal(str(tmp_path / "debate_data.json"))
+    journal.load()
+    writer = JournalWriter(journal, durability=durability, flush_interval=0.5, max_batch_events=1000)
+
+    for i in range(100):
+        writer.submit(start_event(f"d{i}"))
+    # Nothing is written on the caller's thread
+    assert journal.appends == 0
+    assert writer.flush(timeout=5)
+
+    assert journal.appends == 100
+    assert writer.batches < 10
+    assert len(DebateJournal(str(tmp_path / "debate_data.json")).load()) == 100
+    assert writer.close(timeout=5)
+
+
+def test_always_writes_each_event_at_once_on_the_writer_thread(tmp_path):
+    journal = DebateJournal(str(tmp_path / "debate_data.json"), compact_min_bytes=0)
+    journal.load()
+    # A flush interval long enough that only an immediate write passes
+    writer = JournalWriter(journal, durability="always", flush_interval=60)
+    written_on = []
+    append_many = journal.append_many
+    journal.append_many = lambda events, fsync=False: (written_on.append(threading.current_thread().name), append_many(events, fsync))
+    release = threading.Event()
+    compact = journal.compact
+    journal.compact = lambda: (release.wait(), compact())
+
+    sequence = writer.submit(start_event("d1"))
+    writer.request_compaction()
+    # The event is written without waiting for the compaction behind it
+    assert writer.wait_written(sequence, timeout=5)
+    assert written_on == ["journal-writer"]
+    assert writer.compaction_pending
+
+    release.set()
+    assert writer.close(timeout=5)
+    assert not writer.compaction_pending
+
+
+def test_compaction_runs_on_writer_thread_in_order(tmp_path):
+    journal = DebateJournal(str(tmp_path / "debate_data.json"), compact_min_bytes=0)
+    journal.load()
+    writer = JournalWriter(journal, durability="batch", flush_interval=0.01)
+    compacted_on = []
+    compact = journal.compact
+    journal.compact = lambda: (compacted_on.append(threading.current_thread().name), compact())
+
+    writer.submit(start_event("d1"))
+    writer.request_compaction()
+    writer.submit(start_event("d2"))
+    assert writer.flush(timeout=5)
+
+    assert compacted_on == ["journal-writer"]
+    assert not writer.compaction_pending
+    # d1 lives in the snapshot, d2 in the fresh journal
+    assert set(DebateJournal(str(tmp_path / "debate_data.json")).load()) == {"d1", "d2"}
+    assert journal.journal_bytes > 0
+
+
+def test_flush_times_out_when_writes_stall(tmp_path):
+    journal = DebateJournal(str(tmp_path / "debate_data.json"))
+    journal.load()
+    writer = JournalWriter(journal, durability="batch", flush_interval=0.01)
+    release = threading.Event()
+    append_many = journal.append_many
+    journal.append_many = lambda events, fsync=False: (release.wait(), append_many(events, fsync))
+
+    writer.submit(start_event("d1"))
+    assert writer.flush(timeout=0.05) is False
+
+    release.set()
+    assert writer.flush(timeout=5)
+
+
+def test_rejects_unknown_durability(tmp_path):
+    with pytest.raises(ValueError):
+        JournalWriter(DebateJournal(str(tmp_path / "debate_data.json")), durability="sometimes")